@@ -8,6 +8,7 @@ from typing import Optional
 from application.src.service.cafe24_oauth_service import (
   save_refresh_token, save_access_token
 )
+from application.src.utils.http_utils import build_session
 
 cafe24_oauth_controller = Blueprint("cafe24_oauth_controller", __name__, url_prefix="/oauth")
 
@@ -18,6 +19,30 @@ CLIENT_SECRET   = os.getenv("CAFE24_CLIENT_SECRET")
 REDIRECT_URI    = os.getenv("CAFE24_REDIRECT_URI")      # e.g. https://<your-domain>/oauth/callback
 SCOPE           = os.getenv("CAFE24_SCOPE", "").strip() # e.g. mall.read_order,mall.read_product
 
+# 토큰 교환용 상수 (env 불변 → import 시 1회 계산)
+_TOKEN_URL = f"{CAFE24_BASE_URL}/api/v2/oauth/token"
+_BASIC_AUTH_HEADER = (
+  "Basic " + base64.b64encode(f"{CLIENT_ID}:{CLIENT_SECRET}".encode("utf-8")).decode("utf-8")
+) if CLIENT_ID and CLIENT_SECRET else None
+
+# authorize URL (env 불변 → import 시 1회 생성)
+_MISSING_AUTH_ENV = [k for k, v in {
+  "CAFE24_BASE_URL": CAFE24_BASE_URL,
+  "CAFE24_CLIENT_ID": CLIENT_ID,
+  "CAFE24_REDIRECT_URI": REDIRECT_URI
+}.items() if not v]
+_AUTH_URL = (
+  f"{CAFE24_BASE_URL}/api/v2/oauth/authorize"
+  f"?response_type=code"
+  f"&client_id={CLIENT_ID}"
+  f"&redirect_uri={quote_plus(REDIRECT_URI)}"
+  f"&state=doogo-setup"
+  + (f"&scope={quote_plus(SCOPE)}" if SCOPE else "")
+) if not _MISSING_AUTH_ENV else None
+
+# 토큰 교환용 커넥션 풀 (매 콜백마다 새 커넥션/TLS 핸드셰이크 방지)
+_HTTP = build_session(pool_connections=2, pool_maxsize=8)
+
 def _extract_mall_id_from_base(url: str) -> Optional[str]:
   """
   https://abc123.cafe24api.com  ->  abc123
@@ -34,25 +59,10 @@ def install():
   카페24 OAuth '동의' 화면으로 리다이렉트.
   서버에서 정확한 authorize URL을 만들어 인코딩/줄바꿈 실수를 방지.
   """
-  missing = [k for k, v in {
-    "CAFE24_BASE_URL": CAFE24_BASE_URL,
-    "CAFE24_CLIENT_ID": CLIENT_ID,
-    "CAFE24_REDIRECT_URI": REDIRECT_URI
-  }.items() if not v]
-  if missing:
-    return jsonify({"ok": False, "error": f"missing env: {', '.join(missing)}"}), 400
-
-  auth_url = (
-    f"{CAFE24_BASE_URL}/api/v2/oauth/authorize"
-    f"?response_type=code"
-    f"&client_id={CLIENT_ID}"
-    f"&redirect_uri={quote_plus(REDIRECT_URI)}"
-    f"&state=doogo-setup"
-  )
-  if SCOPE:
-    auth_url += f"&scope={quote_plus(SCOPE)}"
-
-  return redirect(auth_url, code=302)
+  if _MISSING_AUTH_ENV:
+    return jsonify({"ok": False, "error": f"missing env: {', '.join(_MISSING_AUTH_ENV)}"}), 400
+
+  return redirect(_AUTH_URL, code=302)
 
 @cafe24_oauth_controller.route("/callback")
 def callback():
@@ -79,14 +89,14 @@ def callback():
     print(f"[Cafe24 OAuth] WARN: unexpected state received: {state}")
 
   # ---- 토큰 교환 (HTTP Basic Authorization 필요) ----
-  token_url = f"{CAFE24_BASE_URL}/api/v2/oauth/token"
-  basic = base64.b64encode(f"{CLIENT_ID}:{CLIENT_SECRET}".encode("utf-8")).decode("utf-8")
+  if not _BASIC_AUTH_HEADER:
+    return jsonify({"ok": False, "stage": "token", "error": "missing env: CAFE24_CLIENT_ID, CAFE24_CLIENT_SECRET"}), 500
 
   try:
-    resp = requests.post(
-      token_url,
+    resp = _HTTP.post(
+      _TOKEN_URL,
       headers={
-        "Authorization": f"Basic {basic}",
+        "Authorization": _BASIC_AUTH_HEADER,
         "Content-Type": "application/x-www-form-urlencoded",
       },
       data={
@@ -94,7 +104,7 @@ def callback():
         "code": code,
         "redirect_uri": REDIRECT_URI,
       },
-      timeout=10
+      timeout=(3.05, 10)
     )
     resp.raise_for_status()
   except requests.HTTPError:
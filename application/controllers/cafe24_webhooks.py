@@ -1,12 +1,31 @@
 # -*- coding: utf-8 -*-
+import os, threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from flask import Blueprint, request, jsonify
+from werkzeug.datastructures import Headers
 
 from application.src.service.cafe24_webhook_service import Cafe24WebhookService
+from application.jobs.background import submit_on
 
 cafe24_webhooks_bp = Blueprint("cafe24_webhooks", __name__)
 _service = Cafe24WebhookService()
 
+# 웹훅 전용 풀 — 공용 백그라운드 풀(슬랙 응답/지급 등)의 대기열을 웹훅 폭주가 차지하지 않도록 분리
+CAFE24_WEBHOOK_WORKERS = int(os.getenv("CAFE24_WEBHOOK_WORKERS", "4"))
+_webhook_pool = ThreadPoolExecutor(max_workers=CAFE24_WEBHOOK_WORKERS, thread_name_prefix="cafe24-webhook")
+
+# 동시 처리(대기 포함) 웹훅 상한 (기본: 워커 수의 4배) → 넘치면 503 으로 Cafe24 재시도 유도
+CAFE24_WEBHOOK_MAX_INFLIGHT = int(os.getenv("CAFE24_WEBHOOK_MAX_INFLIGHT", str(CAFE24_WEBHOOK_WORKERS * 4)))
+_inflight = threading.BoundedSemaphore(CAFE24_WEBHOOK_MAX_INFLIGHT)
+
+
+def _handle_event_bg(raw: bytes, headers: Headers, remote_ip: str):
+  try:
+    _service.handle_event(raw, headers, remote_ip)
+  finally:
+    _inflight.release()
+
 
 @cafe24_webhooks_bp.route("/health", methods=["GET"])
 def health():
@@ -16,9 +35,18 @@ def health():
 @cafe24_webhooks_bp.route("/webhooks/cafe24/events", methods=["POST"])
 def events():
   raw = request.get_data() or b""
-  headers = {k: v for k, v in request.headers.items()}  # Case-insensitive Dict 유사
   remote_ip = request.remote_addr or ""
 
-  result = _service.handle_event(raw, headers, remote_ip)
-  # 웹훅은 빠른 200 OK가 중요
-  return jsonify(result), 200
+  if not _inflight.acquire(blocking=False):
+    return jsonify(ok=False, error="busy"), 503
+
+  # 요청 종료 후에도 쓰이므로 헤더는 복사(대소문자 무시 조회 유지)
+  headers = Headers(request.headers)
+  try:
+    submit_on(_webhook_pool, _handle_event_bg, raw, headers, remote_ip)
+  except Exception:
+    _inflight.release()
+    raise
+
+  # 웹훅은 빠른 200 OK가 중요 → 처리(DB 저장/라우팅/슬랙)는 백그라운드
+  return jsonify(ok=True, queued=True), 200
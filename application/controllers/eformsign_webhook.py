@@ -2,8 +2,7 @@
 # -*- coding: utf-8 -*-
 
 import os
-import json
-from datetime import datetime
+import logging
 from flask import Blueprint, request, jsonify
 
 from application.src.models import db
@@ -11,9 +10,38 @@ from application.src.repositories.SupplierListRepository import SupplierListRepo
 
 from application.src.utils import template as TEMPLATE
 from application.src.service import slack_service as SU
+from application.jobs.background import submit
 
 eformsign_webhook = Blueprint("eformsign_webhook", __name__)
+_logger = logging.getLogger("eformsign.webhook")
 SLACK_BROADCAST_CHANNEL_ID = os.getenv("SLACK_BROADCAST_CHANNEL_ID", "").strip()
+EFORMSIGN_TEMPLATE_ID = (os.getenv("EFORMSIGN_TEMPLATE_ID") or "").strip()
+
+def _notify_contract_done(channel_id: str, supplier_name: str, email: str, status: str,
+                          supplier_id: str, supplier_pw: str):
+  """
+  계약 완료 Slack 알림 (백그라운드 실행)
+  - 공급사 채널: 계약 완료 + 최종 팁 안내를 한 메시지(blocks)로 전송
+  - 공통 방송 채널: 계약 완료만 전송
+  """
+  success_msg = TEMPLATE.render(
+    "eformsign_success",
+    supplier_name=supplier_name,
+    recipient_email=email,
+    status=status,
+  )
+  tip_msg = TEMPLATE.render(
+    "created_success_tip",
+    supplier_name=supplier_name,
+    supplier_id=supplier_id,
+    supplier_pw=supplier_pw,
+  )
+  SU.post_blocks(channel_id, [
+    {"type": "section", "text": {"type": "mrkdwn", "text": success_msg}},
+    {"type": "divider"},
+    {"type": "section", "text": {"type": "mrkdwn", "text": tip_msg}},
+  ], text=success_msg)
+  SU.post_text(SLACK_BROADCAST_CHANNEL_ID, success_msg)
 
 @eformsign_webhook.route("/webhooks/eformsign", methods=["POST"])
 def handle_eformsign_webhook():
@@ -36,10 +64,9 @@ def handle_eformsign_webhook():
   status = doc.get("status")
   updated_ms = doc.get("updated_date")
 
-  print(
-    f"[{datetime.now()}] [eformsign webhook] "
-    f"event_type={event_type} template_id={template_id} editor_id={editor_email} "
-    f"status={status} doc_id={document_id} updated={updated_ms}"
+  _logger.info(
+    "[eformsign webhook] event_type=%s template_id=%s editor_id=%s status=%s doc_id=%s updated=%s",
+    event_type, template_id, editor_email, status, document_id, updated_ms
   )
 
   # 1) 이벤트 타입 체크
@@ -47,79 +74,74 @@ def handle_eformsign_webhook():
     return jsonify({"ok": True, "skipped": "non-document event"}), 200
 
   # 2) 템플릿 ID 검증
-  env_tid = (os.getenv("EFORMSIGN_TEMPLATE_ID") or "").strip()
-  if env_tid and template_id != env_tid:
-    print(f"[{datetime.now()}] [SKIP] template_id mismatch: got={template_id} expected={env_tid}")
+  if EFORMSIGN_TEMPLATE_ID and template_id != EFORMSIGN_TEMPLATE_ID:
+    _logger.info("[SKIP] template_id mismatch: got=%s expected=%s", template_id, EFORMSIGN_TEMPLATE_ID)
     return jsonify({"ok": True, "skipped": "template mismatch"}), 200
 
   # 3) editor_id(이메일) 로 공급사 찾기
   if not editor_email:
-    print(f"[{datetime.now()}] [SKIP] editor_id missing in webhook body")
+    _logger.info("[SKIP] editor_id missing in webhook body")
     return jsonify({"ok": True, "skipped": "editor_id missing"}), 200
 
   try:
     supplier = SupplierListRepository.find_by_email(editor_email)
   except Exception as e:
-    print(f"[{datetime.now()}] [DB_ERROR] find supplier by email failed err={e}")
+    _logger.error("[DB_ERROR] find supplier by email failed err=%s", e)
     return jsonify({"ok": False, "error": "db lookup failed"}), 500
 
   if not supplier:
-    print(f"[{datetime.now()}] [NOT_FOUND] supplier by email={editor_email}")
+    _logger.info("[NOT_FOUND] supplier by email=%s", editor_email)
     return jsonify({"ok": True, "skipped": "supplier not found"}), 200
 
-  # 계약서 ID 보정 저장
+  # 커밋 후 ORM 객체가 만료되므로 필요한 값은 미리 확보
+  seq = supplier.seq
+  company_name = supplier.companyName
+  channel_id = supplier.channelId
+  supplier_id, supplier_pw = supplier.supplierID, supplier.supplierPW
+
+  # 4) 변경 필드 구성 (계약서 ID 보정 + 상태) → 단일 UPDATE
+  fields = {}
   if document_id:
     if supplier.contractId and supplier.contractId != document_id:
-      print(
-        f"[{datetime.now()}] [WARN] contractId mismatch seq={supplier.seq} "
-        f"old={supplier.contractId} new={document_id}"
+      _logger.warning(
+        "[WARN] contractId mismatch seq=%s old=%s new=%s",
+        seq, supplier.contractId, document_id
       )
-    supplier.contractId = document_id
+    fields["contractId"] = document_id
+
+  if status == "doc_complete":
+    fields["contractStatus"] = 'SS'  # 최종완료
+  elif status:
+    # 그 외 중간 상태는 DB만 저장(알림 X)
+    fields["contractStatus"] = status
 
   # 5) 상태 처리
   try:
-    if status == "doc_complete":
-      supplier.contractStatus = 'SS'  # 최종완료
-      db.session.commit()
-      print(
-        f"[{datetime.now()}] [CONTRACT_DONE] seq={supplier.seq} company={supplier.companyName} "
-        f"email={editor_email} doc_id={document_id}"
-      )
-
-      # Slack 알림 (doc_complete만)
-      if supplier.channelId:
-        template_msg = TEMPLATE.render(
-          "eformsign_success",
-          supplier_name=supplier.companyName,
-          recipient_email=editor_email,
-          status=status,
-        )
-        SU.post_text(supplier.channelId, template_msg)
-        SU.post_text(SLACK_BROADCAST_CHANNEL_ID, template_msg)
-
-        template_msg = TEMPLATE.render(
-          "created_success_tip",
-          supplier_name=supplier.companyName,
-          supplier_id=supplier.supplierID,
-          supplier_pw=supplier.supplierPW,
-        )
-        SU.post_text(supplier.channelId, template_msg)
-      else:
-        print(f"[{datetime.now()}] [INFO] no channelId for seq={supplier.seq}, skip Slack notify")
-
-    else:
-      # 그 외 중간 상태는 DB만 저장(알림 X)
-      if status:
-        supplier.contractStatus = status
-      db.session.commit()
-      print(
-        f"[{datetime.now()}] [CONTRACT_PROGRESS] seq={supplier.seq} "
-        f"company={supplier.companyName} status={status}"
-      )
-
+    SupplierListRepository.update_contract_fields(seq, fields)
   except Exception as e:
     db.session.rollback()
-    print(f"[{datetime.now()}] [DB_ERROR] status update failed seq={supplier.seq} err={e}")
+    _logger.error("[DB_ERROR] status update failed seq=%s err=%s", seq, e)
     return jsonify({"ok": False, "error": "db update failed"}), 500
 
+  if status == "doc_complete":
+    _logger.info(
+      "[CONTRACT_DONE] seq=%s company=%s email=%s doc_id=%s",
+      seq, company_name, editor_email, document_id
+    )
+
+    # Slack 알림 (doc_complete만, 커밋 성공 후) → 응답 지연/웹훅 재시도 방지를 위해 백그라운드로
+    if channel_id:
+      submit(
+        _notify_contract_done,
+        channel_id, company_name, editor_email, status,
+        supplier_id, supplier_pw,
+      )
+    else:
+      _logger.info("[INFO] no channelId for seq=%s, skip Slack notify", seq)
+  else:
+    _logger.info(
+      "[CONTRACT_PROGRESS] seq=%s company=%s status=%s",
+      seq, company_name, status
+    )
+
   return jsonify({"ok": True}), 200
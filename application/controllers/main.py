@@ -1,6 +1,5 @@
 from flask import Blueprint, render_template, request, redirect, url_for
 from flask_jwt_extended import jwt_required
-import os, gspread
 
 main = Blueprint("main", __name__, url_prefix="/")
 
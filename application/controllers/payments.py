@@ -3,36 +3,125 @@
 from flask import Blueprint, render_template, request, jsonify
 from flask_jwt_extended import jwt_required
 import datetime as dt
-import uuid
-from application.src.service.toss_service import get_balance, list_payouts, get_seller, list_sellers, create_payouts_encrypted, cancel_payout
+import uuid, time, threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from application.src.service.toss_service import entity_body, get_balance, list_payouts_cached, get_seller, get_seller_cached, list_sellers_cached, find_seller_cached, create_payouts_encrypted, cancel_payout
+from application.src.utils.date_utils import parse_ymd
 
 payments = Blueprint("payments", __name__, url_prefix="/payments")
 
-def _parse_ymd(s: str) -> dt.date:
-  return dt.datetime.strptime(s, "%Y-%m-%d").date()
+# 서로 독립적인 Toss API 호출을 동시에 보내기 위한 풀 (대기시간 = 합 → 최대값)
+_toss_pool = ThreadPoolExecutor(max_workers=6, thread_name_prefix="toss")
+# 지급 요청 전용 풀 (화면 조회용 _toss_pool 과 분리 → 지급 요청이 밀려도 목록/잔액 조회가 대기하지 않음)
+_payout_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="payout")
+
+# 캐시에 없는 셀러를 단건 조회로 보충할 때 한 번에 조회할 최대 건수
+MISSING_SELLER_FETCH_MAX = 20
+
+# 지급 요청 비동기 처리 결과 (job_id → {"done", "body", "http_status", "expires_at"})
+#   /ajax/add 는 작업만 등록하고 202 반환 → 프런트가 /ajax/add/<job_id> 폴링
+PAYOUT_JOB_TTL_SEC = 600
+_payout_jobs = {}
+_payout_jobs_lock = threading.Lock()
+
+# 지급 목록 한 행 (템플릿은 i.payoutId 처럼 속성으로 접근 → dict 대신 튜플로 충분)
+PayoutRow = namedtuple("PayoutRow", (
+  "payoutId payoutDate requestedAt status amount currency transactionDescription "
+  "sellerId refSellerId businessType companyName representativeName businessNumber "
+  "email phone status_seller accountNumber bankCode holderName"
+))
+
+# 누락된 중첩 필드용 공용 빈 dict (읽기 전용으로만 사용할 것)
+_EMPTY: dict = {}
+
+def _fast_ymd(raw):
+  """
+  ISO8601 문자열('2025-09-27T10:00:00+09:00')에서 'YYYY-MM-DD' 만 추출.
+  - Toss 응답은 항상 YYYY-MM-DD 로 시작하므로 파싱 없이 앞 10자리만 자른다
+  - 형식이 다르면 기존처럼 fromisoformat 으로 파싱
+  """
+  if isinstance(raw, str) and len(raw) >= 10 and raw[4] == "-" and raw[7] == "-":
+    return raw[:10]
+  if not raw:
+    return raw
+  return dt.datetime.fromisoformat(raw).date().isoformat()
+
+def _fill_missing_sellers(payout_items, seller_map):
+  """
+  지급 목록의 destination 중 캐시된 셀러 목록에 없는 것만 단건 조회로 보충.
+  - 캐시 갱신 이후 등록된 셀러 / 목록 limit 밖의 셀러 대비
+  - 캐시 dict 는 공유 객체이므로 누락분이 있을 때만 복사본을 만든다
+  """
+  missing = {sid for p in payout_items if (sid := p.get("destination")) and sid not in seller_map}
+  if not missing:
+    return seller_map
+
+  futures = [_toss_pool.submit(get_seller, sid) for sid in list(missing)[:MISSING_SELLER_FETCH_MAX]]
+  extra = {}
+  for f in futures:
+    try:
+      status, resp = f.result()
+    except Exception as e:
+      print(e)
+      continue
+    body = entity_body(resp) if status == 200 else _EMPTY
+    if body.get("id"):
+      extra[body["id"]] = body
+  return {**seller_map, **extra} if extra else seller_map
+
+def _payout_rows(payout_items, seller_map):
+  """
+  지급 목록 + 셀러 정보 매칭 (destination == seller.id)
+  - 템플릿이 한 번만 순회하므로 리스트 대신 제너레이터로 행을 만든다
+  """
+  for p in payout_items:
+    amount = p.get("amount") or _EMPTY
+
+    # 행마다 빈 dict 를 새로 만들지 않도록 중첩 필드를 한 번만 꺼내 둔다
+    seller_info = seller_map.get(p.get("destination")) or _EMPTY
+    company = seller_info.get("company") or _EMPTY
+    account = seller_info.get("account") or _EMPTY
+    yield PayoutRow(
+      payoutId=p.get("id"),
+      payoutDate=p.get("payoutDate"),
+      requestedAt=_fast_ymd(p.get("requestedAt")),  # 원하는 출력: '2025-09-27'
+      status=p.get("status"),
+      amount=amount.get("value"),
+      currency=amount.get("currency"),
+      transactionDescription=p.get("transactionDescription"),
+      # 매칭된 셀러 정보
+      sellerId=seller_info.get("id"),
+      refSellerId=seller_info.get("refSellerId"),
+      businessType=seller_info.get("businessType"),
+      companyName=company.get("name"),
+      representativeName=company.get("representativeName"),
+      businessNumber=company.get("businessRegistrationNumber"),
+      email=company.get("email"),
+      phone=company.get("phone"),
+      status_seller=seller_info.get("status"),
+      accountNumber=account.get("accountNumber"),
+      bankCode=account.get("bankCode"),
+      holderName=account.get("holderName"),
+    )
 
 @payments.route("/")
 @jwt_required()
 def index():
-  # 1) 잔액 조회
-  status, resp = get_balance()
-  available = resp.get("entityBody", {}).get("availableAmount", {}).get("value", 0)
-  pending   = resp.get("entityBody", {}).get("pendingAmount", {}).get("value", 0)
-
-  # 2) 기간 기본값: 오늘 ~ 6일 전
+  # 1) 기간 기본값: 오늘 ~ 6일 전
   today = dt.date.today()
   default_start = today - dt.timedelta(days=6)
   default_end = today + dt.timedelta(days=6)
 
-  # 3) 쿼리 파라미터 받기 (없으면 기본값)
+  # 2) 쿼리 파라미터 받기 (없으면 기본값)
   q_start = request.args.get("startDate")
   q_end   = request.args.get("endDate")
   try:
-    start_date = _parse_ymd(q_start) if q_start else default_start
+    start_date = parse_ymd(q_start) if q_start else default_start
   except Exception:
     start_date = default_start
   try:
-    end_date = _parse_ymd(q_end) if q_end else default_end
+    end_date = parse_ymd(q_end) if q_end else default_end
   except Exception:
     end_date = default_end
 
@@ -40,56 +129,32 @@ def index():
   if start_date > end_date:
     start_date, end_date = end_date, start_date
 
-  # 4) 지급 요청 목록 조회
-  status, resp2 = list_payouts(
+  # 3) 잔액 / 지급 요청 목록 / 셀러 목록 동시 조회
+  f_balance = _toss_pool.submit(get_balance)
+  f_payouts = _toss_pool.submit(
+    list_payouts_cached,
     limit=100,
-    payoutDateGte=start_date.strftime("%Y-%m-%d"),
-    payoutDateLte=end_date.strftime("%Y-%m-%d")
+    payoutDateGte=start_date.isoformat(),
+    payoutDateLte=end_date.isoformat()
   )
-  payout_items = resp2.get("entityBody", {}).get("items", [])
+  f_sellers = _toss_pool.submit(list_sellers_cached, limit=1000)
 
-  # 5) 셀러 목록 조회
-  status2, resp3 = list_sellers(limit=1000)
-  seller_items = resp3.get("entityBody", {}).get("items", [])
+  status, resp = f_balance.result()
+  balance = entity_body(resp)
+  available = (balance.get("availableAmount") or _EMPTY).get("value", 0)
+  pending   = (balance.get("pendingAmount") or _EMPTY).get("value", 0)
 
-  # 6) 매칭 (destination == seller.id)
-  merged = []
-  seller_map = {s["id"]: s for s in seller_items}
+  status, resp2 = f_payouts.result()
+  payout_items = entity_body(resp2).get("items") or []
 
-  requested_pay = 0
-  for p in payout_items:
-    status = p.get("status")
-    sid = p.get("destination")
-    raw = p.get("requestedAt")
-    dt_obj = dt.datetime.fromisoformat(raw)  # tz까지 포함된 ISO8601 문자열 파싱
-    formatted = dt_obj.strftime("%Y-%m-%d")  # 원하는 출력: '2025-09-27'
-      
-    if status == 'REQUESTED':
-      requested_pay += int(p.get("amount", {}).get("value"))
-
-    seller_info = seller_map.get(sid, {})
-    merged.append({
-      "payoutId": p.get("id"),
-      "payoutDate": p.get("payoutDate"),
-      "requestedAt": formatted,
-      "status": status,
-      "amount": p.get("amount", {}).get("value"),
-      "currency": p.get("amount", {}).get("currency"),
-      "transactionDescription": p.get("transactionDescription"),
-      # 매칭된 셀러 정보
-      "sellerId": seller_info.get("id"),
-      "refSellerId": seller_info.get("refSellerId"),
-      "businessType": seller_info.get("businessType"),
-      "companyName": seller_info.get("company", {}).get("name"),
-      "representativeName": seller_info.get("company", {}).get("representativeName"),
-      "businessNumber": seller_info.get("company", {}).get("businessRegistrationNumber"),
-      "email": seller_info.get("company", {}).get("email"),
-      "phone": seller_info.get("company", {}).get("phone"),
-      "status_seller": seller_info.get("status"),
-      "accountNumber": seller_info.get("account", {}).get("accountNumber"),
-      "bankCode": seller_info.get("account", {}).get("bankCode"),
-      "holderName": seller_info.get("account", {}).get("holderName"),
-    })
+  status2, resp3, seller_map = f_sellers.result()
+  seller_map = _fill_missing_sellers(payout_items, seller_map)
+
+  # 4) 대기 중(REQUESTED) 지급 합계 — 행 생성과 분리해 먼저 계산
+  requested_pay = sum(
+    int((p.get("amount") or _EMPTY).get("value"))
+    for p in payout_items if p.get("status") == 'REQUESTED'
+  )
 
   # 5) 템플릿 렌더
   return render_template(
@@ -99,9 +164,9 @@ def index():
     waitingPayment=requested_pay,
     availableExpected=available,
     pending=pending,
-    items=merged,
-    startDate=start_date.strftime("%Y-%m-%d"),
-    endDate=end_date.strftime("%Y-%m-%d"),
+    items=_payout_rows(payout_items, seller_map),  # 리스트로 만들지 않고 렌더 중에 생성
+    startDate=start_date.isoformat(),
+    endDate=end_date.isoformat(),
   )
 
 
@@ -113,30 +178,23 @@ def ajax_search_seller():
     return jsonify({"code": 40001, "message": "q가 필요합니다."}), 400
 
   try:
-    # 1) 실제 seller_id 형태라면 단건 조회
+    # 1) 실제 seller_id 형태라면 단건 조회 (캐시 우선, 없으면 신규 셀러일 수 있으니 실시간 조회)
     if q.startswith("seller_"):
+      cached = get_seller_cached(q, limit=1000)
+      if cached:
+        return jsonify({"code": 20000, "item": cached})
       status, resp = get_seller(q)
-      if status == 200 and resp.get("entityBody"):
-        return jsonify({"code": 20000, "item": resp["entityBody"]})
+      body = entity_body(resp)
+      if status == 200 and body:
+        return jsonify({"code": 20000, "item": body})
       # 실패 시 계속해서 목록 검색 fallback
 
     # 2) 목록에서 refSellerId 부분 일치로 검색
-    status, resp = list_sellers(limit=1000)
+    # 우선순위: id/refSellerId 정확일치 → refSellerId/company.name/id 부분일치 (캐시 인덱스 사용)
+    status, resp, found = find_seller_cached(q, limit=1000)
     if status != 200:
       return jsonify({"code": status, "message": "Toss API 오류", "detail": resp}), status
 
-    items = resp.get("entityBody", {}).get("items", [])
-    # 우선순위: refSellerId 부분일치 → company.name 부분일치 → id 부분일치
-    qlow = q.lower()
-    found = None
-    for it in items:
-      refid = (it.get("refSellerId") or "").lower()
-      cname = (it.get("company", {}).get("name") or "").lower()
-      sid   = (it.get("id") or "").lower()
-      if qlow in refid or qlow in cname or qlow in sid:
-        found = it
-        break
-
     return jsonify({"code": 20000, "item": found})
 
   except Exception as e:
@@ -149,7 +207,7 @@ def ajax_add_payment():
     data = request.get_json(force=True)
     
     today = dt.date.today()
-    period = today.strftime("%Y-%m-%d")
+    period = today.isoformat()
     
     ref_base = (data["refSellerId"] or "").strip()
     stamp    = dt.datetime.now(dt.timezone.utc).strftime("%Y%m%d%H%M%S")
@@ -173,17 +231,57 @@ def ajax_add_payment():
     if data["scheduleType"] == "SCHEDULED":
       item["payoutDate"] = data["payoutDate"]
 
+    job_id = uuid.uuid4().hex
+    now = time.time()
+    with _payout_jobs_lock:
+      # 만료된 작업 결과 정리
+      for k in [k for k, v in _payout_jobs.items() if v["expires_at"] <= now]:
+        del _payout_jobs[k]
+      _payout_jobs[job_id] = {"done": False, "expires_at": now + PAYOUT_JOB_TTL_SEC}
+
+    # JWE 암호화 + Toss 호출은 풀에서 처리하고 워커는 바로 반환
+    _payout_pool.submit(_run_payout_job, job_id, item)
+    return jsonify({"code": 20200, "jobId": job_id}), 202
+
+  except Exception as e:
+    print(e)
+    return jsonify({"code": 50000, "message": "예외 발생", "detail": str(e)}), 500
+
+def _run_payout_job(job_id: str, item: dict):
+  """지급 요청 실행 후 결과를 _payout_jobs 에 기록 (응답 형식은 기존 /ajax/add 와 동일)"""
+  try:
     status, resp = create_payouts_encrypted(item)
     print(status, resp)
 
     if status == 200:
-      return jsonify({"code": 20000, "resp": resp})
+      body, http_status = {"code": 20000, "resp": resp}, 200
     else:
-      return jsonify({"code":  (resp.get("error", {}) or {}).get("code"), "message": (resp.get("error", {}) or {}).get("message"), "detail": resp}), status
-
+      body, http_status = {"code":  (resp.get("error", {}) or {}).get("code"), "message": (resp.get("error", {}) or {}).get("message"), "detail": resp}, status
   except Exception as e:
     print(e)
-    return jsonify({"code": 50000, "message": "예외 발생", "detail": str(e)}), 500
+    body, http_status = {"code": 50000, "message": "예외 발생", "detail": str(e)}, 500
+
+  with _payout_jobs_lock:
+    _payout_jobs[job_id] = {
+      "done": True,
+      "body": body,
+      "http_status": http_status,
+      "expires_at": time.time() + PAYOUT_JOB_TTL_SEC,
+    }
+
+@payments.route("/ajax/add/<job_id>", methods=["GET"])
+@jwt_required()
+def ajax_add_payment_status(job_id):
+  """지급 요청 작업 상태 조회 (처리 중이면 202, 완료되면 기존 /ajax/add 응답 그대로)"""
+  with _payout_jobs_lock:
+    job = _payout_jobs.get(job_id)
+
+  if not job:
+    # 서버 재시작/다른 워커 등으로 작업 상태를 잃은 경우 — 지급은 이미 나갔을 수 있음
+    return jsonify({"code": 40400, "message": "지급 요청 작업 상태를 찾을 수 없습니다. 지급 목록에서 처리 여부를 확인해 주세요."}), 404
+  if not job["done"]:
+    return jsonify({"code": 20200, "jobId": job_id}), 202
+  return jsonify(job["body"]), job["http_status"]
 
 @payments.route("/ajax/cancel", methods=["POST"])
 @jwt_required()
@@ -3,6 +3,7 @@ from datetime import datetime, date
 from flask import Blueprint, request, jsonify
 
 from application.src.service.slack_service import upload_file_with_button
+from application.src.utils.date_utils import parse_ymd
 
 settlement_api = Blueprint("settlement_api", __name__, url_prefix="/api/settlement")
 
@@ -18,9 +19,8 @@ def _parse_date(value):
   if isinstance(value, datetime):
     return value.date()
   if isinstance(value, str):
-    # "2025-11-01T00:00:00" 같이 올 수도 있으니 앞 10자리만 자르고 파싱
-    s = value.strip()[:10]
-    return datetime.strptime(s, "%Y-%m-%d").date()
+    # "2025-11-01T00:00:00" 같이 올 수도 있으니 앞 10자리만 파싱
+    return parse_ymd(value)
   raise ValueError(f"invalid date: {value!r}")
 
 
@@ -1,14 +1,22 @@
 # application/src/service/settlements.py
-from flask import Blueprint, render_template, request, jsonify
+from flask import Blueprint, render_template, request
 from flask_jwt_extended import jwt_required
 import datetime as dt
-import json
-from application.src.service.toss_service import get_balance, list_settlements
+from application.src.service.toss_service import list_settlements
+from application.src.utils.date_utils import parse_ymd
 
 settlements = Blueprint("settlements", __name__, url_prefix="/settlements")
 
-def _parse_ymd(s: str) -> dt.date:
-  return dt.datetime.strptime(s, "%Y-%m-%d").date()
+def _num(v) -> float:
+  # 숫자면 바로 반환 (예외 처리 비용 없이), 그 외만 변환 시도
+  if isinstance(v, (int, float)):
+    return float(v)
+  if not v:
+    return 0.0
+  try:
+    return float(v)
+  except (TypeError, ValueError):
+    return 0.0
 
 @settlements.route("/")
 @jwt_required()
@@ -22,11 +30,11 @@ def index():
   q_start = request.args.get("startDate")
   q_end   = request.args.get("endDate")
   try:
-    start_date = _parse_ymd(q_start) if q_start else default_start
+    start_date = parse_ymd(q_start) if q_start else default_start
   except Exception:
     start_date = default_start
   try:
-    end_date = _parse_ymd(q_end) if q_end else default_end
+    end_date = parse_ymd(q_end) if q_end else default_end
   except Exception:
     end_date = default_end
 
@@ -35,26 +43,21 @@ def index():
   
   status, resp = list_settlements(start_date, end_date)
 
-  # 🔹 합계 계산
-  def _num(v):
-    try:
-      return float(v)
-    except Exception:
-      return 0.0
+  # 🔹 합계 계산 (한 번의 순회로 3개 합계 누적)
+  rows = resp if isinstance(resp, list) else []  # 오류 응답(dict)은 합계 0
 
   total_amount = 0.0
   total_fee = 0.0
   total_payout = 0.0
 
-  for i in (resp or []):
+  for i in rows:
     amount = _num(i.get("amount"))
     fee = _num(i.get("fee"))
     payout = i.get("payOutAmount")
-    payout = _num(payout) if payout is not None else amount - fee
 
     total_amount += amount
     total_fee += fee
-    total_payout += payout
+    total_payout += _num(payout) if payout is not None else amount - fee
 
   totals = {
     "amount": total_amount,
@@ -67,6 +70,6 @@ def index():
     pageName="settlements",
     items=resp,
     totals=totals,  # ⬅️ 합계 전달
-    startDate=start_date.strftime("%Y-%m-%d"),
-    endDate=end_date.strftime("%Y-%m-%d"),
+    startDate=start_date.isoformat(),
+    endDate=end_date.isoformat(),
   )
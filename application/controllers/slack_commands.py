@@ -1,52 +1,117 @@
 # application/controllers/slack_commands.py
 # -*- coding: utf-8 -*-
-from flask import Blueprint, request, jsonify, make_response, current_app
+from flask import Blueprint, request, jsonify, make_response
 from datetime import datetime
-import requests, threading, traceback, json, os
-from typing import Optional
+import logging, threading, time, json, os
+from typing import Optional, Any, Tuple
 
 from application.src.service.slack_verify import verify_slack_request
-from application.src.service.slack_sales_service import fetch_sales_summary, first_day_of_month
+from application.src.service.slack_sales_service import fetch_sales_summary_cached, first_day_of_month
 from application.src.service.slack_service import upload_file
+from application.src.utils.format_utils import fmt_currency
 
 from application.src.service.settlement_service import prev_month_range
+from application.src.utils.date_utils import parse_period
 
 from application.src.repositories.SupplierListRepository import SupplierListRepository
+from application.jobs.background import submit
+from application.src.utils.http_utils import build_session
 
 slack_commands = Blueprint("slack_commands", __name__, url_prefix="/slack/commands")
 
+_logger = logging.getLogger("slack.commands")
+
+# response_url(hooks.slack.com) 전송용 공용 세션 (TLS 커넥션 재사용)
+#  - 모든 응답이 replace_original 이라 재전송해도 결과가 같음 → 429/5xx 시 POST 도 재시도
+_HTTP = build_session(
+  pool_connections=1,
+  pool_maxsize=8,
+  backoff_factor=0.2,
+  status_forcelist=(429, 500, 502, 503, 504),
+  allowed_methods=("POST",),
+)
+
+
+# 동시에 처리 중인 슬래시 커맨드 작업 상한 (초과 시 '잠시 후 재시도' 안내)
+SLASH_MAX_INFLIGHT = int(os.getenv("SLASH_MAX_INFLIGHT", "32"))
+_inflight = threading.BoundedSemaphore(SLASH_MAX_INFLIGHT)
+_BUSY_TEXT = ":warning: 요청이 많아 지금은 처리할 수 없습니다. 잠시 후 다시 시도해 주세요."
+
+# (monotonic 시각, 오늘, 이번 달 1일) - 1초 단위로만 갱신
+_today_cache: Tuple[float, Any, Any] = (0.0, None, None)
 
 # -------------------- 공통 유틸 --------------------
-def _fmt_currency(value):
-  try:
-    if value in (None, "", "None"):
-      return "0원"
-    return f"{int(float(str(value).replace(',', '') )):,}원"
-  except Exception:
-    return f"{value}원"
+def _today_and_som():
+  """
+  (오늘, 이번 달 1일). 1초 이내 재호출은 직전 값 재사용
+  - 튜플 통째로 교체하므로 스레드 간 값이 섞이지 않음
+  """
+  global _today_cache
+  t = time.monotonic()
+  cached = _today_cache
+  if t - cached[0] > 1.0:
+    today = datetime.now().date()
+    cached = _today_cache = (t, today, first_day_of_month(today))
+  return cached[1], cached[2]
+
+def _submit_slash(fn, *args) -> bool:
+  """
+  백그라운드 풀에 작업 등록. 상한 초과/풀 종료 중이면 False (호출부에서 busy 응답)
+  """
+  if not _inflight.acquire(blocking=False):
+    return False
+
+  def _run():
+    try:
+      fn(*args)
+    finally:
+      _inflight.release()
+  _run.__name__ = getattr(fn, "__name__", "slash_task")
 
-def _post_to_response_url(response_url: str, payload: dict):
   try:
-    print(f"[slash] POST response_url payload_keys={list(payload.keys())}")
-    requests.post(response_url, json=payload, timeout=10)
-  except Exception:
-    traceback.print_exc()
+    submit(_run)
+  except RuntimeError:  # 인터프리터 종료로 풀이 닫힌 경우
+    _inflight.release()
+    return False
+  return True
 
-def _parse_period_text(text: str):
-  if not text:
-    return None
+def _post_to_response_url(response_url: str, payload: dict):
   try:
-    if "~" not in text:
-      return None
-    a, b = [x.strip() for x in text.split("~", 1)]
-    y1, m1, d1 = [int(x) for x in a.split("-")]
-    y2, m2, d2 = [int(x) for x in b.split("-")]
-    from datetime import date as _D
-    return _D(y1, m1, d1), _D(y2, m2, d2)
+    _logger.debug("[slash] POST response_url payload_keys=%s", list(payload))
+    _HTTP.post(response_url, json=payload, timeout=10)
   except Exception:
-    return None
+    _logger.exception("[slash] response_url post failed")
 
 # -------------------- /sales --------------------
+# 결과 블록 골격 (호출마다 바뀌는 건 텍스트뿐)
+_DIVIDER = { "type": "divider" }
+_COUNT_KEYS = ("orders", "orders_sold", "orders_canceled", "items", "items_sold", "items_canceled")
+_CURRENCY_KEYS = ("gross_amount", "cancel_amount", "sale_amount", "shipping_amount", "commission_amount", "net_amount")
+_SECTION_TEMPLATES = (
+  "*주문 요약*\n"
+  "• *총주문:* {orders}건\n"
+  "• *판매주문:* {orders_sold}건\n"
+  "• *취소주문:* {orders_canceled}건",
+
+  "*매출 요약*\n"
+  "• *총매출:* {gross_amount}\n"
+  "• *취소매출:* {cancel_amount}\n"
+  "• *판매매출:* {sale_amount}",
+
+  "*수수료/정산*\n"
+  "• *배송비:* {shipping_amount}\n"
+  "• *수수료(15%):* {commission_amount}\n"
+  "• *정산금액:* {net_amount}",
+
+  "*수량 요약*\n"
+  "• *총판매수량:* {items}개\n"
+  "• *판매수량:* {items_sold}개\n"
+  "• *취소수량:* {items_canceled}개",
+)
+
+def _section(text: str) -> dict:
+  return { "type": "section", "text": { "type": "mrkdwn", "text": text } }
+
 def _build_result_blocks(title: str, s: dict):
   """
   s: fetch_sales_summary 반환 dict
@@ -56,101 +121,52 @@ def _build_result_blocks(title: str, s: dict):
   - 수수료/정산
   - 수량 요약
   """
-  header = { "type": "section", "text": { "type": "mrkdwn", "text": f"*{title}*" } }
-  div = { "type": "divider" }
-
-  orders_lines = "\n".join([
-    f"• *총주문:* {s.get('orders',0)}건",
-    f"• *판매주문:* {s.get('orders_sold',0)}건",
-    f"• *취소주문:* {s.get('orders_canceled',0)}건",
-  ])
-
-  sales_lines = "\n".join([
-    f"• *총매출:* {_fmt_currency(s.get('gross_amount',0))}",
-    f"• *취소매출:* {_fmt_currency(s.get('cancel_amount',0))}",
-    f"• *판매매출:* {_fmt_currency(s.get('sale_amount',0))}",
-  ])
-
-  settle_lines = "\n".join([
-    f"• *배송비:* {_fmt_currency(s.get('shipping_amount',0))}",
-    f"• *수수료(15%):* {_fmt_currency(s.get('commission_amount',0))}",
-    f"• *정산금액:* {_fmt_currency(s.get('net_amount',0))}",
-  ])
-
-  qty_lines = "\n".join([
-    f"• *총판매수량:* {s.get('items',0)}개",
-    f"• *판매수량:* {s.get('items_sold',0)}개",
-    f"• *취소수량:* {s.get('items_canceled',0)}개",
-  ])
-
-  return [
-    header, div,
-    { "type": "section", "text": { "type": "mrkdwn", "text": "*주문 요약*\n" + orders_lines } },
-    div,
-    { "type": "section", "text": { "type": "mrkdwn", "text": "*매출 요약*\n" + sales_lines } },
-    div,
-    { "type": "section", "text": { "type": "mrkdwn", "text": "*수수료/정산*\n" + settle_lines } },
-    div,
-    { "type": "section", "text": { "type": "mrkdwn", "text": "*수량 요약*\n" + qty_lines } },
-  ]
+  values = {k: s.get(k, 0) for k in _COUNT_KEYS}
+  values.update((k, fmt_currency(s.get(k, 0))) for k in _CURRENCY_KEYS)
+
+  blocks = [_section(f"*{title}*"), _DIVIDER]
+  for i, tmpl in enumerate(_SECTION_TEMPLATES):
+    if i:
+      blocks.append(_DIVIDER)
+    blocks.append(_section(tmpl.format_map(values)))
+  return blocks
+
+def _supplier_by_channel(channel_id: str) -> Optional[Tuple[Optional[str], Optional[str]]]:
+  """채널에 연결된 공급사의 (supplierCode, companyName). 없으면 None (리포지토리 TTL 캐시 사용)"""
+  return SupplierListRepository.find_codes_by_channel_id_cached(channel_id)
 
 def _resolve_supplier_code_by_channel(channel_id: str) -> Optional[str]:
   try:
-    supplier = SupplierListRepository.find_by_channel_id(channel_id)
-    if supplier and getattr(supplier, "supplierCode", None):
-      return supplier.supplierCode
+    found = _supplier_by_channel(channel_id)
+    if found and found[0]:
+      return found[0]
   except Exception as e:
-    print(f"[slash:/sales] resolve supplierCode error: {e}")
+    _logger.warning("[slash:/sales] resolve supplierCode error: %s", e)
   return None
 
-def _worker_compute_and_respond_sales(app, form: dict):
-  with app.app_context():
-    response_url = form.get("response_url")
-    channel_id = form.get("channel_id")
-    channel_name = form.get("channel_name")
-    user_id = form.get("user_id")
-    text = (form.get("text") or "").strip()
-
-    print(f"[slash:/sales] user={user_id} channel={channel_name}({channel_id}) text={text!r}")
-
-    supplier_code = _resolve_supplier_code_by_channel(channel_id) if channel_id else None
-    if supplier_code:
-      print(f"[slash:/sales] supplierCode={supplier_code}")
-    else:
-      print(f"[slash:/sales] supplier mapping not found for channel={channel_id}")
-
-    parsed = _parse_period_text(text)
-    if parsed:
-      start, end = parsed
-      title_prefix = "매출 요약"
-    else:
-      today = datetime.now().date()
-      start = first_day_of_month(today); end = today
-      title_prefix = "이번 달 매출 요약"
-
-    print(f"[slash:/sales] period {start} ~ {end}")
-
-    try:
-      summary = fetch_sales_summary(start, end, supply_id=supplier_code)
-      print(f"[slash:/sales] summary={summary}")
-
-      title = f"{title_prefix} ({start.isoformat()} ~ {end.isoformat()})"
-      blocks = _build_result_blocks(title, summary)
-
-      if response_url:
-        _post_to_response_url(response_url, {
-          "response_type": "ephemeral",
-          "replace_original": True,
-          "blocks": blocks
-        })
-    except Exception:
-      traceback.print_exc()
-      if response_url:
-        _post_to_response_url(response_url, {
-          "response_type": "ephemeral",
-          "replace_original": True,
-          "text": ":warning: 데이터 조회 중 오류가 발생했습니다."
-        })
+def _worker_compute_and_respond_sales(response_url: str, start, end, title_prefix: str, supplier_code: Optional[str]):
+  """기간/공급사는 요청 스레드에서 확정해 넘겨받고, 여기서는 집계 + 응답만 처리"""
+  try:
+    summary = fetch_sales_summary_cached(start, end, supply_id=supplier_code)
+    _logger.debug("[slash:/sales] summary=%s", summary)
+
+    title = f"{title_prefix} ({start.isoformat()} ~ {end.isoformat()})"
+    blocks = _build_result_blocks(title, summary)
+
+    if response_url:
+      _post_to_response_url(response_url, {
+        "response_type": "ephemeral",
+        "replace_original": True,
+        "blocks": blocks
+      })
+  except Exception:
+    _logger.exception("[slash:/sales] summary failed")
+    if response_url:
+      _post_to_response_url(response_url, {
+        "response_type": "ephemeral",
+        "replace_original": True,
+        "text": ":warning: 데이터 조회 중 오류가 발생했습니다."
+      })
 
 @slack_commands.route("/sales", methods=["POST"])
 def slash_sales():
@@ -160,30 +176,61 @@ def slash_sales():
   form = request.form or {}
   response_url = form.get("response_url")
   text = (form.get("text") or "").strip()
-  print(f"[slash:/sales] form_keys={list(form.keys())} text={text!r}")
+  _logger.debug("[slash:/sales] form_keys=%s text=%r", list(form.keys()), text)
 
-  # ACK 메시지에 기간 표기
-  parsed = _parse_period_text(text)
+  # 기간은 여기서 한 번만 해석해 ACK 와 워커에서 같이 사용
+  parsed = parse_period(text)
   if parsed:
     start, end = parsed
+    title_prefix = "매출 요약"
     ack_text = f"매출을 조회하는 중입니다… ({start} ~ {end}) :hourglass_flowing_sand:"
   else:
-    today = datetime.now().date()
-    start = first_day_of_month(today); end = today
+    end, start = _today_and_som()
+    title_prefix = "이번 달 매출 요약"
     ack_text = f"매출을 조회하는 중입니다… (이번 달 {start} ~ {end}) :hourglass_flowing_sand:"
 
   ack = { "response_type": "ephemeral", "text": ack_text }
 
   if response_url:
-    app_obj = current_app._get_current_object()
-    t = threading.Thread(target=_worker_compute_and_respond_sales, args=(app_obj, form), daemon=True)
-    t.start()
+    channel_id = form.get("channel_id")
+    _logger.info("[slash:/sales] user=%s channel=%s(%s) period %s ~ %s", form.get("user_id"), form.get("channel_name"), channel_id, start, end)
+
+    # 채널 → 공급사 (캐시 조회)
+    supplier_code = _resolve_supplier_code_by_channel(channel_id) if channel_id else None
+    if supplier_code:
+      _logger.debug("[slash:/sales] supplierCode=%s", supplier_code)
+    else:
+      _logger.info("[slash:/sales] supplier mapping not found for channel=%s", channel_id)
+
+    # 공용 백그라운드 풀에서 실행 (앱 컨텍스트는 submit 이 열어 준다)
+    if not _submit_slash(_worker_compute_and_respond_sales, response_url, start, end, title_prefix, supplier_code):
+      _logger.warning("[slash:/sales] busy -> rejected")
+      ack = { "response_type": "ephemeral", "text": _BUSY_TEXT }
   else:
-    print("[slash:/sales] response_url missing -> cannot update message asynchronously")
+    _logger.warning("[slash:/sales] response_url missing -> cannot update message asynchronously")
 
   return jsonify(ack)
 
 # -------------------- /settlement --------------------
+def _worker_settlement(supply_id, channel_id, start, end, response_url):
+  try:
+    # 이미 풀 작업 안 → 엑셀 생성 + 업로드를 여기서 끝까지 처리 (실패 시 아래에서 response_url 로 안내)
+    upload_file(
+      supply_id=supply_id,
+      channel=channel_id,
+      start=start,
+      end=end,
+      background=False
+    )
+  except Exception:
+    _logger.exception("[slash:/settlement] upload failed")
+    if response_url:
+      _post_to_response_url(response_url, {
+        "response_type": "ephemeral",
+        "replace_original": True,
+        "text": ":warning: 정산 파일 생성 중 오류가 발생했습니다."
+      })
+
 @slack_commands.route("/settlement", methods=["POST"])
 def slash_settlement():
   if not verify_slack_request(request):
@@ -196,35 +243,17 @@ def slash_settlement():
   user_id = form.get("user_id")
   text = (form.get("text") or "").strip()
 
-  print(f"[slash:/settlement] user={user_id} channel={channel_name}({channel_id}) text={text!r}")
+  _logger.info("[slash:/settlement] user=%s channel=%s(%s) text=%r", user_id, channel_name, channel_id, text)
 
   # 채널 → 공급사 (supplierCode 우선)
-  supplier = SupplierListRepository.find_by_channel_id(channel_id) if channel_id else None
-  supply_id = None
-  if supplier:
-    supply_id = getattr(supplier, "supplierCode", None)
-        
-  print(f"[slash:/settlement] supplier={getattr(supplier,'companyName',None)} supply_id={supply_id}")
+  supply_id, company_name = _supplier_by_channel(channel_id) or (None, None)
+
+  _logger.debug("[slash:/settlement] supplier=%s supply_id=%s", company_name, supply_id)
 
   # 기간: 기본=지난달, 텍스트 "YYYY-MM-DD~YYYY-MM-DD" 허용
-  def _parse_period(s: str):
-    try:
-      a, b = [x.strip() for x in s.split("~")]
-      y1,m1,d1 = [int(x) for x in a.split("-")]
-      y2,m2,d2 = [int(x) for x in b.split("-")]
-      from datetime import date as _D
-      return _D(y1,m1,d1), _D(y2,m2,d2)
-    except Exception:
-      return None
-
-  today = datetime.now().date()
-  if text and "~" in text:
-    p = _parse_period(text)
-    start, end = p if p else prev_month_range(today)
-  else:
-    start, end = prev_month_range(today)
+  start, end = parse_period(text) or prev_month_range(_today_and_som()[0])
 
-  print(f"[slash:/settlement] period {start} ~ {end}")
+  _logger.debug("[slash:/settlement] period %s ~ %s", start, end)
 
   ack = {
     "response_type": "ephemeral",
@@ -232,13 +261,11 @@ def slash_settlement():
   }
 
   if response_url:
-    upload_file(
-      supply_id=supply_id,
-      channel=channel_id,
-      start=start,
-      end=end
-    )
+    # 엑셀 생성 + 업로드는 백그라운드에서 (슬랙 3초 ACK 제한)
+    if not _submit_slash(_worker_settlement, supply_id, channel_id, start, end, response_url):
+      _logger.warning("[slash:/settlement] busy -> rejected")
+      ack = { "response_type": "ephemeral", "text": _BUSY_TEXT }
   else:
-    print("[slash:/settlement] response_url missing -> cannot update message asynchronously")
+    _logger.warning("[slash:/settlement] response_url missing -> cannot update message asynchronously")
 
   return jsonify(ack)
\ No newline at end of file
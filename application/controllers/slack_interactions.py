@@ -1,22 +1,43 @@
 # -*- coding: utf-8 -*-
-import os, hmac, hashlib, time, json
-import datetime, time, uuid
+import json
+import datetime, uuid, time, threading
 from flask import Blueprint, request, current_app
 from slack_sdk.errors import SlackApiError
 from typing import Optional, List, Dict, Any
-from datetime import date, timedelta, datetime as dt
-from decimal import Decimal, ROUND_HALF_UP
+from datetime import date, timedelta
+from decimal import Decimal
+from concurrent.futures import ThreadPoolExecutor
 
 from application.src.service.slack_service import ensure_client, _sleep_if_rate_limited
+from application.src.service.slack_verify import verify_slack_request
 from application.src.repositories.SupplierListRepository import SupplierListRepository
 from application.src.repositories.SupplierDetailRepository import SupplierDetailRepository
 
-from application.src.service.toss_service import list_sellers, create_payouts_encrypted
+from application.src.service.toss_service import get_seller_by_ref, create_payouts_encrypted
 from application.src.service.barobill_service import BaroBillClient, BaroBillError
+from application.jobs.background import submit_on
 
 slack_actions = Blueprint("slack_actions", __name__, url_prefix="/slack")
 
-_SIGNING_SECRET = os.getenv("SLACK_SIGNING_SECRET", "")
+# 정산 확정 시 토스 셀러 조회를 DB 조회/슬랙 업데이트와 겹쳐 돌리기 위한 풀
+#  - 앱 컨텍스트가 필요 없는 HTTP 조회만 넘긴다 (DB 는 호출 스레드에서)
+_LOOKUP_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="payout-lookup")
+
+# 정산 확정(지급 요청) 전용 풀 — 공용 백그라운드 풀(웹훅/슬래시/업로드)에 밀려 대기하지 않도록 분리
+_PAYOUT_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="payout-confirm")
+
+# 처리한 버튼 메시지 (channel_id, ts) → expires_at
+#  - 같은 메시지의 재클릭/재전송이 지급 요청을 두 번 보내지 않도록 요청 스레드에서 선점
+CLAIMED_MESSAGE_TTL_SEC = 3600
+_claimed_messages: Dict[tuple, float] = {}
+_claimed_messages_lock = threading.Lock()
+
+# '처리 중' 메시지는 매번 같으므로 모듈 상수로 공유 (chat.update 에 그대로 전달, 수정하지 않음)
+_PROCESSING_TEXT = "⏳ 정산 확정을 처리 중입니다..."
+_PROCESSING_BLOCKS = [{
+  "type": "section",
+  "text": { "type": "mrkdwn", "text": "⏳ *정산 확정을 처리 중입니다...*" }
+}]
 
 # YYYY-MM-DD 문자열 세트를 date 객체 세트로 변환
 _HOLIDAYS_STR = {
@@ -40,17 +61,29 @@ _HOLIDAYS_STR = {
   "2026-10-09",
   "2026-12-25",
 }
-_HOLIDAYS = {dt.strptime(d, "%Y-%m-%d").date() for d in _HOLIDAYS_STR}
+_HOLIDAYS = {date.fromisoformat(d) for d in _HOLIDAYS_STR}
+
+# 공휴일 비트셋: (ordinal - _HOLIDAY_BASE) 번째 비트가 1 이면 공휴일
+_HOLIDAY_BASE = min(_HOLIDAYS).toordinal()
+_HOLIDAY_BITS = 0
+for _h in _HOLIDAYS:
+  _HOLIDAY_BITS |= 1 << (_h.toordinal() - _HOLIDAY_BASE)
+
+def _is_business_ordinal(o: int) -> bool:
+  # 월(0)~금(4) && 공휴일 아님 (date.weekday() == (ordinal + 6) % 7)
+  if (o + 6) % 7 >= 5:
+    return False
+  off = o - _HOLIDAY_BASE
+  return off < 0 or not (_HOLIDAY_BITS >> off) & 1
 
 def _is_business_day(d: date) -> bool:
-  # 월(0)~금(4) && 공휴일 아님
-  return d.weekday() < 5 and d not in _HOLIDAYS
+  return _is_business_ordinal(d.toordinal())
 
 def _next_business_day(d: date) -> date:
-  cur = d
-  while not _is_business_day(cur):
-    cur += timedelta(days=1)
-  return cur
+  o = d.toordinal()
+  while not _is_business_ordinal(o):
+    o += 1
+  return date.fromordinal(o)
 def compute_payout_date(base: date, *, prefer_one_day: bool = True) -> date:
   """
   prefer_one_day=True  → +1일이 영업일이면 그대로, 아니면 +1일부터 다음 영업일
@@ -68,28 +101,15 @@ def split_vat(total: int, vat_rate: Decimal = Decimal("0.1")) -> tuple[int, int]
   total: 부가세 포함 금액
   vat_rate: 0.1 = 10%
   return: (공급가액, 세액)
+  공급가액 = total / (1 + vat_rate) 를 원 단위 반올림(ROUND_HALF_UP, 0 에서 먼 쪽)
+  - vat_rate 를 p/q 정수비로 바꿔 정수 연산만 사용 (Decimal 나눗셈/quantize 없이 같은 결과)
   """
-  total_dec = Decimal(total)
-  supply = (total_dec / (Decimal(1) + vat_rate)).quantize(Decimal("1"), rounding=ROUND_HALF_UP)
-  tax = total_dec - supply
-  return int(supply), int(tax)
-
-def _verify_slack_signature(req) -> bool:
-  """
-  Slack 서명 검증 (5분 리플레이 보호)
-  """
-  try:
-    ts = req.headers.get("X-Slack-Request-Timestamp", "")
-    sig = req.headers.get("X-Slack-Signature", "")
-    if not ts or not sig:
-      return False
-    if abs(time.time() - int(ts)) > 60 * 5:
-      return False
-    base = f"v0:{ts}:{req.get_data(as_text=True)}"
-    my = "v0=" + hmac.new(_SIGNING_SECRET.encode(), base.encode(), hashlib.sha256).hexdigest()
-    return hmac.compare_digest(my, sig)
-  except Exception:
-    return False
+  p, q = Decimal(vat_rate).as_integer_ratio()
+  n, d = abs(total) * q, q + p
+  supply = (2 * n + d) // (2 * d)
+  if total < 0:
+    supply = -supply
+  return supply, total - supply
 
 def _chat_update(
   channel: str,
@@ -118,7 +138,7 @@ def _chat_update(
 @slack_actions.route("/interactions", methods=["POST"])
 def interactions():
   # 1) 서명 검증
-  if _SIGNING_SECRET and not _verify_slack_signature(request):
+  if not verify_slack_request(request):
     return "invalid signature", 403
 
   # 2) 페이로드 파싱
@@ -136,20 +156,40 @@ def interactions():
     return "", 200
 
   action = actions[0]
-  action_id = action.get("action_id")
-
-  if action_id == "payout_confirm":
-    _handle_payout_confirm(payload, action)
-    # Slack은 3초 내 응답 권장 → 바로 200 OK
-    return "", 200
+  handler = _ACTION_HANDLERS.get(action.get("action_id"))
+  if handler:
+    ch = (payload.get("channel") or {}).get("id")
+    ts = (payload.get("message") or {}).get("ts")
+    # 같은 메시지는 한 번만 처리 (처리 대기 중 재클릭 → 중복 지급 방지)
+    if not _claim_message(ch, ts):
+      return "", 200
+    # 버튼은 요청 스레드에서 바로 제거 (작업이 풀에서 대기하는 동안에도 다시 누를 수 없게)
+    _chat_update(ch, ts, text=_PROCESSING_TEXT, blocks=_PROCESSING_BLOCKS)
+    # Slack은 3초 내 응답 필요 → DB/토스/바로빌 호출은 전용 풀에서 처리하고 바로 200 OK
+    submit_on(_PAYOUT_POOL, handler, payload, action)
 
   return "", 200
 
+def _claim_message(channel_id: Optional[str], ts: Optional[str]) -> bool:
+  """(channel_id, ts) 를 처음 선점하면 True, 이미 처리 중/처리된 메시지면 False"""
+  if not channel_id or not ts:
+    return True
+  key = (channel_id, ts)
+  now = time.time()
+  with _claimed_messages_lock:
+    # 만료된 항목 정리
+    for k in [k for k, exp in _claimed_messages.items() if exp <= now]:
+      del _claimed_messages[k]
+    if key in _claimed_messages:
+      return False
+    _claimed_messages[key] = now + CLAIMED_MESSAGE_TTL_SEC
+  return True
+
 def _handle_payout_confirm(payload: dict, action: dict):
   """
   '정산 확정하기' 버튼 처리:
   - 버튼 value(JSON) → 토스 지급요청 바디 구성
-  - 처리 중 표시 → 요청 → 성공/실패로 메시지 업데이트
+  - (처리 중 표시는 interactions() 에서) 요청 → 성공/실패로 메시지 업데이트
   """
   ch = (payload.get("channel") or {}).get("id")
   msg = payload.get("message") or {}
@@ -172,7 +212,7 @@ def _handle_payout_confirm(payload: dict, action: dict):
   #  - True  : +1 우선(영업일이면 그 날, 아니면 그 다음 영업일)
   #  - False : 기존처럼 +2 기준으로 다음 영업일
   payout_dt = compute_payout_date(today, prefer_one_day=True)
-  payout_date = payout_dt.strftime("%Y-%m-%d")
+  payout_date = payout_dt.isoformat()
   
   s = SupplierListRepository.findBySupplierCode(supply_id)
 
@@ -191,51 +231,48 @@ def _handle_payout_confirm(payload: dict, action: dict):
     )
     return
 
-  # 처리 중 상태로 즉시 업데이트 (버튼 제거)
-  _chat_update(
-    ch, ts,
-    text="⏳ 정산 확정을 처리 중입니다...",
-    blocks=[{
-      "type": "section",
-      "text": { "type": "mrkdwn", "text": "⏳ *정산 확정을 처리 중입니다...*" }
-    }]
-  )
-  
-  status, resp2 = list_sellers(limit=1000)
-  seller_items = resp2.get("entityBody", {}).get("items", [])
-  
-  # 매칭 찾기
-  match_seller = next(
-    (item for item in seller_items if item.get("refSellerId") == s.supplierCode),
-    None
-  )
+  # 셀러 매칭은 별도 스레드에서 먼저 시작 (refSellerId 인덱스, 캐시 만료 시에만 토스 호출)
+  #  ('처리 중' 표시/버튼 제거는 interactions() 에서 이미 완료)
+  f_seller = _LOOKUP_POOL.submit(get_seller_by_ref, s.supplierCode)
+
+  # DB/토스 조회 오류도 아래 except 에서 슬랙 메시지로 알림 ('처리 중' 상태로 남지 않도록)
+  try:
+    # 세금계산서용 공급사 상세는 셀러 조회와 겹쳐서 미리 읽어 둠
+    sd = SupplierDetailRepository.findBySupplierSeq(s.seq)
+    match_seller = f_seller.result()
+    if match_seller is None:
+      current_app.logger.warning("[payout_confirm] toss seller not found supplier=%s", s.supplierCode)
+      _chat_update(
+        ch, ts,
+        text=f":x: 토스 셀러를 찾을 수 없습니다. (공급사 코드: `{s.supplierCode}`)"
+      )
+      return
   
-  # 고유 refPayoutId 생성 (중복 방지)
-  ref_base = (s.supplierCode or "").strip()
-  stamp    = datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%d%H%M%S")
-  suffix   = uuid.uuid4().hex[:6]
-  ref_payout_id = f"{ref_base}-{stamp}-{suffix}"
+    # 고유 refPayoutId 생성 (중복 방지)
+    ref_base = (s.supplierCode or "").strip()
+    stamp    = datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%d%H%M%S")
+    suffix   = uuid.uuid4().hex[:6]
+    ref_payout_id = f"{ref_base}-{stamp}-{suffix}"
 
-  # 지급요청 바디 구성
-  item = {
-    "refPayoutId": ref_payout_id,
-    "destination": match_seller["id"],
-    "scheduleType": "SCHEDULED",
-    "payoutDate": payout_date,
-    "amount": {
-      "currency": "KRW",
-      "value": final_amount
-    },
-    "transactionDescription": "정기정산",
-    "metadata": {
-      "period": f"{start}-{end}"
+    # 지급요청 바디 구성
+    item = {
+      "refPayoutId": ref_payout_id,
+      "destination": match_seller["id"],
+      "scheduleType": "SCHEDULED",
+      "payoutDate": payout_date,
+      "amount": {
+        "currency": "KRW",
+        "value": final_amount
+      },
+      "transactionDescription": "정기정산",
+      "metadata": {
+        "period": f"{start}-{end}"
+      }
     }
-  }
 
-  # 요청 실행
-  try:
+    # 요청 실행
     status, resp = create_payouts_encrypted(item)
-    print(status, resp)
+    current_app.logger.info("[payout_confirm] supplier=%s status=%s resp=%s", s.supplierCode, status, resp)
     
     # 성공 메시지
     _chat_update(
@@ -250,8 +287,6 @@ def _handle_payout_confirm(payload: dict, action: dict):
       }]
     )
     
-    sd = SupplierDetailRepository.findBySupplierSeq(s.seq)
-    
     baro = BaroBillClient()
 
     supply, tax = split_vat(final_amount)
@@ -272,11 +307,17 @@ def _handle_payout_confirm(payload: dict, action: dict):
       ],
     )
     if res == 1:
-      print('성공')
+      current_app.logger.info("[payout_confirm] taxinvoice issued supplier=%s", s.supplierCode)
     else:
-      print(f"⚠️ [에러] 발행 응답 코드: {res}")
+      current_app.logger.warning("[payout_confirm] taxinvoice result code=%s supplier=%s", res, s.supplierCode)
   except Exception as e:
+    current_app.logger.exception("[payout_confirm] failed supplier=%s", s.supplierCode)
     _chat_update(
       ch, ts,
       text=f":x: 예기치 못한 오류\n```{str(e)[:500]}```"
     )
+
+# action_id → 처리 함수 (_PAYOUT_POOL 에서 (payload, action) 으로 호출)
+_ACTION_HANDLERS = {
+  "payout_confirm": _handle_payout_confirm,
+}
@@ -1,9 +1,11 @@
 # application/src/service/supplier.py
 # -*- coding: utf-8 -*-
-from flask import Blueprint, render_template, request, jsonify
+from flask import Blueprint, stream_template, request, jsonify, g as flask_g
 from flask_jwt_extended import jwt_required
 from sqlalchemy.exc import SQLAlchemyError
-import os, requests, base64, json, re
+import os, requests, base64, json, re, uuid, time, threading, logging
+from decimal import Decimal
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, Optional
 
 from application.src.models.SupplierList import SupplierList
@@ -18,68 +20,125 @@ from application.src.service.eformsign_service import after_slack_success
 
 # Cafe24 OAuth 토큰 서비스 사용(※ 토큰은 여기서 동적으로 발급/갱신)
 from application.src.service.cafe24_oauth_service import get_access_token
+from application.src.utils.http_utils import build_session
+from application.jobs.background import submit
 
 supplier = Blueprint("supplier", __name__, url_prefix="/supplier")
 
+_logger = logging.getLogger("supplier.cafe24")
+
 # ====== 환경 ======
 CAFE24_BASE_URL     = os.getenv("CAFE24_BASE_URL")            # 예: https://onedayboxb2b.cafe24api.com
 
+# Cafe24 Admin API 공용 세션 (공급사/운영자/이미지/상품 생성이 같은 호스트로 연달아 나감 → TLS 커넥션 재사용)
+#  - 생성(POST) 요청이라 상태코드 재시도는 하지 않음 (중복 생성 방지, 연결 실패만 재시도)
+_CAFE24_HTTP = build_session(pool_connections=1, pool_maxsize=8)
+# 공급사/운영자 생성 타임아웃 (connect, read) — 연결 단계가 막히면 read 예산까지 기다리지 않고 빨리 실패
+_CAFE24_CREATE_TIMEOUT = (3.05, 12)
+# 상품 이미지 동시 업로드용 풀
+_cafe24_pool = ThreadPoolExecutor(max_workers=6, thread_name_prefix="cafe24")
+
+# 기본상품 등록 작업 결과 (프로세스 메모리, 단일 프로세스 운영 기준)
+#   /ajax/cafe24/createSupplier 는 공급사/운영자/Toss 셀러까지만 처리하고 jobId 반환
+#   → 상품 등록 결과는 /ajax/cafe24/createSupplier/<job_id> 로 조회
+PRODUCT_JOB_TTL_SEC = 600
+_product_jobs = {}
+_product_jobs_lock = threading.Lock()
+
+# 입력값 정리용 정규식
+_NON_DIGIT_RE = re.compile(r"\D")               # 사업자등록번호 숫자만
+_USER_ID_STRIP_RE = re.compile(r"[^a-z0-9_]")    # Cafe24 운영자 ID 허용 문자 외 제거
+_PHONE_STRIP_RE = re.compile(r"[^\d+]")         # 전화번호 숫자/+ 외 제거
+
+# 자주 쓰는 멤버십 판정용 상수
+_TRUE_STRS = frozenset({"1", "true"})           # 체크박스/플래그 참 값 (소문자 비교)
+_CONTRACT_TEMPLATES = frozenset({"A", "B"})     # A(단일%) | B(구간%)
+_CAFE24_OK_STATUS = frozenset({200, 201})
+
 def _cafe24_headers():
   """
   Cafe24 Admin API 헤더 구성
-  - Authorization 은 oauth_service.get_access_token() 으로 매 호출시 최신 토큰 확보
+  - Authorization 은 oauth_service.get_access_token() 으로 확보 (요청당 1회, flask.g 에 보관)
+  - 한 요청 안의 여러 Cafe24 호출(공급사/운영자/이미지/상품)이 같은 헤더 dict 를 재사용
+  - 요청 컨텍스트 밖(스레드풀 등)에서는 호출하지 말고 만든 헤더를 넘겨 받을 것
   """
+  headers = getattr(flask_g, "_cafe24_headers", None)
+  if headers is None:
+    headers = flask_g._cafe24_headers = _build_cafe24_headers()
+  return headers
+
+def _build_cafe24_headers():
+  """Cafe24 Admin API 헤더 새로 구성 (flask.g 캐시 없음 → 백그라운드 작업용)"""
   access_token = get_access_token()  # DB refresh_token 기반으로 access_token 재발급/캐시
   return {
     "Authorization": f"Bearer {access_token}",
     "Content-Type": "application/json"
   }
 
+# Cafe24 요청 본문 직렬화
+#  - Decimal 은 default 훅에서 문자열로 변환 (외부 API에는 문자열로 보내는 편이 안전, 정밀도 유지)
+#  - 튜플은 json 이 리스트로 처리 → 페이로드 전체를 미리 깊은 변환하지 않고 dumps 1회로 끝냄
+#  - requests 의 json= 과 동일하게 NaN/Infinity 는 거부
+def _json_default(obj):
+  if isinstance(obj, Decimal):
+    return str(obj)
+  raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def _cafe24_body(payload) -> bytes:
+  return json.dumps(payload, default=_json_default, allow_nan=False).encode("utf-8")
+
 # --- 공통: 상세 머지 유틸 ---
-def _merge_supplier_with_detail(s: SupplierList, d: Optional[SupplierDetail]) -> dict:
-  def _f(v):
-    try:
-      return float(v) if v is not None else None
-    except Exception:
-      return None
+def _to_float(v):
+  try:
+    return float(v) if v is not None else None
+  except Exception:
+    return None
+
+# 상세가 없는 공급사용 기본값 (직렬화/렌더링만 하므로 행마다 새로 만들지 않고 공유)
+_EMPTY_DETAIL = {
+  "businessType": None,
+  "companyName": None,
+  "representativeName": None,
+  "businessRegistrationNumber": None,
+  "companyEmail": None,
+  "companyPhone": None,
+  "bankCode": None,
+  "accountNumber": None,
+  "holderName": None,
+}
 
+def _merge_supplier_with_detail(s: SupplierList, d: Optional[SupplierDetail]) -> dict:
+  # 매핑된 컬럼은 모두 존재하므로 getattr 기본값 대신 직접 접근
+  updated_at = s.updatedAt
+  skip = s.contractSkip  # Boolean 컬럼 → 보통 bool, 그 외 값만 문자열 비교
   base = {
     "seq": s.seq,
     "companyName": s.companyName or "",
-    "supplierCode": getattr(s, "supplierCode", "") or "",
-    "stateCode": getattr(s, "stateCode", "") or "",
-    "channelId": getattr(s, "channelId", "") or "",
-    "contractStatus": getattr(s, "contractStatus", "") or "",
+    "supplierCode": s.supplierCode or "",
+    "stateCode": s.stateCode or "",
+    "channelId": s.channelId or "",
+    "contractStatus": s.contractStatus or "",
     "supplierID": s.supplierID or "",
-    "supplierPW": getattr(s, "supplierPW", "") or "",
+    "supplierPW": "",  # 목록에는 비밀번호를 내려보내지 않음 (화면도 수정 시 공란 유지, 컬럼 자체를 로드하지 않음)
     "supplierURL": s.supplierURL or "",
     "manager": s.manager or "",
     "managerRank": s.managerRank or "",
     "number": s.number or "",
     "email": s.email or "",
-    "updatedAt": s.updatedAt.isoformat() if getattr(s, "updatedAt", None) else None,
-    "contractTemplate": (getattr(s, "contractTemplate", None) or "").upper(),
-    "contractPercent": _f(getattr(s, "contractPercent", None)),
-    "contractThreshold": getattr(s, "contractThreshold", None),
-    "contractPercentUnder": _f(getattr(s, "contractPercentUnder", None)),
-    "contractPercentOver": _f(getattr(s, "contractPercentOver", None)),
-    "contractSkip": 1 if str(getattr(s, "contractSkip", 0)).lower() in ("1","true") else 0,
+    "updatedAt": updated_at.isoformat() if updated_at else None,
+    "contractTemplate": (s.contractTemplate or "").upper(),
+    "contractPercent": _to_float(s.contractPercent),
+    "contractThreshold": s.contractThreshold,
+    "contractPercentUnder": _to_float(s.contractPercentUnder),
+    "contractPercentOver": _to_float(s.contractPercentOver),
+    "contractSkip": 1 if (skip if isinstance(skip, bool) else str(skip).lower() in _TRUE_STRS) else 0,
   }
 
   if not d:
-    base["detail"] = {
-      "businessType": None,
-      "companyName": None,
-      "representativeName": None,
-      "businessRegistrationNumber": None,
-      "companyEmail": None,
-      "companyPhone": None,
-      "bankCode": None,
-      "accountNumber": None,
-      "holderName": None,
-    }
+    base["detail"] = _EMPTY_DETAIL
     return base
 
+  created_at, d_updated_at = d.createdAt, d.updatedAt
   base["detail"] = {
     "businessType": d.businessType,
     "companyName": d.companyName,
@@ -90,8 +149,8 @@ def _merge_supplier_with_detail(s: SupplierList, d: Optional[SupplierDetail]) ->
     "bankCode": d.bankCode,
     "accountNumber": d.accountNumber,
     "holderName": d.holderName,
-    "createdAt": d.createdAt.isoformat() if getattr(d, "createdAt", None) else None,
-    "updatedAt": d.updatedAt.isoformat() if getattr(d, "updatedAt", None) else None,
+    "createdAt": created_at.isoformat() if created_at else None,
+    "updatedAt": d_updated_at.isoformat() if d_updated_at else None,
   }
   return base
 
@@ -102,12 +161,10 @@ def _merge_supplier_with_detail(s: SupplierList, d: Optional[SupplierDetail]) ->
 @supplier.route("/", methods=["GET"])
 @jwt_required()
 def index():
-  items = SupplierListRepository.findApproved()  # 승인된 공급사
-  merged = []
-  for s in items:
-    d = SupplierDetailRepository.findBySupplierSeq(s.seq)
-    merged.append(_merge_supplier_with_detail(s, d))
-  return render_template("supplier.html", pageName="supplier", supplierList=merged)
+  rows = SupplierListRepository.list_with_detail(approved_only=True, limit=100)  # 승인된 공급사 + 상세
+  # 행 dict 는 템플릿이 순회할 때 만들고, 렌더된 HTML 은 완성 전부터 스트리밍으로 내려보냄
+  return stream_template("supplier.html", pageName="supplier",
+                         supplierList=(_merge_supplier_with_detail(s, d) for s, d in rows))
 
 # -----------------------------------
 # Ajax: 등록
@@ -135,7 +192,7 @@ def addSupplier():
 
     # 신규: 계약 필드
     contract_template = (g("contractTemplate") or "").upper()  # '', 'A', 'B'
-    contract_skip     = 1 if str(g("contractSkip") or "0") in ("1","true","True") else 0
+    contract_skip     = 1 if str(g("contractSkip") or "0").lower() in _TRUE_STRS else 0
     
     # 신규: 상세(정산) 필드
     bizno_raw   = g("businessRegistrationNumber") or None
@@ -168,7 +225,7 @@ def addSupplier():
       errors["supplierID"] = "ID는 6자 이상 입력해 주세요."
 
     # 계약 검증 (스킵이면 생략)
-    if not contract_skip and contract_template in ("A", "B"):
+    if not contract_skip and contract_template in _CONTRACT_TEMPLATES:
       if contract_template == "A":
         if contract_percent is None or contract_percent < 0 or contract_percent > 100:
           errors["contractPercent"] = "0~100 사이 수수료(%)를 입력해 주세요."
@@ -181,10 +238,9 @@ def addSupplier():
           errors["contractPercentOver"] = "0~100 사이 수수료(%)를 입력해 주세요."
 
     # 상세 검증(값이 있으면 형식 체크)
-    if bizno_raw:
-      biz_digits = re.sub(r"\D", "", str(bizno_raw))
-      if len(biz_digits) != 10:
-        errors["businessRegistrationNumber"] = "사업자등록번호는 숫자 10자리여야 합니다."
+    biz_digits = _NON_DIGIT_RE.sub("", str(bizno_raw)) if bizno_raw else None
+    if biz_digits is not None and len(biz_digits) != 10:
+      errors["businessRegistrationNumber"] = "사업자등록번호는 숫자 10자리여야 합니다."
     if account_no and len(account_no) > 30:
       errors["accountNumber"] = "계좌번호는 최대 30자까지 입력 가능합니다."
       
@@ -194,7 +250,7 @@ def addSupplier():
     # contract_status 결정
     if contract_skip:
       contract_status = "S"    # 이미 체결: 발송 스킵
-    elif contract_template in ("A","B"):
+    elif contract_template in _CONTRACT_TEMPLATES:
       contract_status = "P"    # 템플릿/입력값 확보 → 발송 큐 대상
     else:
       contract_status = ""            # 계약 미선택
@@ -225,7 +281,7 @@ def addSupplier():
       supplierSeq=s.seq,
       businessType='CORPORATE',
       companyName=company_name,
-      businessRegistrationNumber = bizno_raw,
+      businessRegistrationNumber = biz_digits,  # 검증된 숫자 10자리로 저장 (표시는 bizno_format 필터)
       bankCode = bank_code,
       accountNumber = account_no
     )
@@ -273,12 +329,16 @@ def updateSupplier():
     seq = int(g("seq") or 0)
     expected_updated_at = g("updatedAt")
 
-    s = SupplierListRepository.findBySeq(seq)
-    if not s:
+    # 공급사 + 상세를 한 번에 조회하고 커밋까지 행 잠금 유지
+    found = SupplierListRepository.find_with_detail_for_update(seq)
+    if not found:
+      SupplierListRepository.rollback_if_needed()
       return jsonify({"code": 40400, "message": "존재하지 않는 공급사입니다."}), 404
+    s, sd = found
 
-    # 낙관적 잠금(선택): 클라이언트가 보낸 updatedAt과 현재 DB값 비교
+    # 낙관적 잠금(선택): 클라이언트가 보낸 updatedAt과 현재 DB값 비교 (잠근 행 기준이라 비교~저장 사이 경합 없음)
     if expected_updated_at and s.updatedAt and s.updatedAt.isoformat() != expected_updated_at:
+      SupplierListRepository.rollback_if_needed()
       return jsonify({"code": 40900, "message": "다른 사용자가 먼저 수정했습니다. 새로고침 후 다시 시도해 주세요."}), 409
 
     company_name = g("companyName") or ""
@@ -291,13 +351,25 @@ def updateSupplier():
     number       = g("number") or None
     email        = g("email") or None
 
+    # 상세(정산) 필드
+    bizno_raw  = g("businessRegistrationNumber") or None
+    bank_code  = g("bankCode") or None
+    account_no = g("accountNumber") or None
+
     # 서버 검증
     errors = {}
     if not company_name:
       errors["companyName"] = "회사명은 필수입니다."
     if not supplier_id or len(supplier_id) < 6:
       errors["supplierID"] = "ID는 6자 이상 입력해 주세요."
+    # 사업자등록번호는 등록(addSupplier)과 같이 숫자 10자리로 정규화
+    biz_digits = _NON_DIGIT_RE.sub("", str(bizno_raw)) if bizno_raw else None
+    if biz_digits is not None and len(biz_digits) != 10:
+      errors["businessRegistrationNumber"] = "사업자등록번호는 숫자 10자리여야 합니다."
+    if account_no and len(account_no) > 30:
+      errors["accountNumber"] = "계좌번호는 최대 30자까지 입력 가능합니다."
     if errors:
+      SupplierListRepository.rollback_if_needed()
       return jsonify({"code": 40001, "errors": errors}), 400
 
     # 반영 (PW는 공란이면 유지)
@@ -312,23 +384,17 @@ def updateSupplier():
     s.number = number
     s.email = email
 
-    SupplierListRepository.save(s)
-    
-    # 상세(정산) 필드
-    sd = SupplierDetailRepository.findBySupplierSeq(s.seq)
-    
-    bizno_raw  = g("businessRegistrationNumber") or None
-    bank_code  = g("bankCode") or None
-    account_no = g("accountNumber") or None
-    
-    sd.businessRegistrationNumber = bizno_raw
+    # 상세가 없던 공급사는 새로 생성
+    if sd is None:
+      sd = SupplierDetail(supplierSeq=s.seq)
+
+    sd.businessRegistrationNumber = biz_digits  # 숫자 10자리 (표시는 bizno_format 필터)
     sd.bankCode = bank_code
     sd.accountNumber = account_no
-    
-    SupplierDetailRepository.save(sd)
-    
-    
-    
+
+    # 공급사/상세 UPDATE 를 한 트랜잭션으로 커밋
+    SupplierListRepository.save_with_detail(s, sd)
+
     return jsonify({"code": 20000, "seq": s.seq,
                     "updatedAt": s.updatedAt.isoformat() if getattr(s, "updatedAt", None) else None})
 
@@ -345,11 +411,8 @@ def updateSupplier():
 @supplier.route("/ajax/getSupplierList", methods=["POST"])
 @jwt_required()
 def listSuppliers():
-  items = SupplierListRepository.findAll()
-  merged = []
-  for s in items:
-    d = SupplierDetailRepository.findBySupplierSeq(s.seq)
-    merged.append(_merge_supplier_with_detail(s, d))
+  rows = SupplierListRepository.list_with_detail()
+  merged = [_merge_supplier_with_detail(s, d) for s, d in rows]
   return jsonify({"code": 20000, "supplierList": merged})
 
 # -----------------------------------
@@ -373,23 +436,26 @@ def approval_view():
       "updatedAt": x.updatedAt.isoformat() if getattr(x, "updatedAt", None) else None
     }
 
-  return render_template("supplier_approval.html",
+  # 템플릿은 한 번만 순회 → 제너레이터로 넘기고 스트리밍 렌더
+  return stream_template("supplier_approval.html",
                          pageName="supplier_approval",
-                         supplierList=[to_dict(s) for s in pending])
+                         supplierList=(to_dict(s) for s in pending))
 
 # -----------------------------------
 # Ajax: 승인/반려 목록 조회(필터+페이지네이션)
-# body: { states?: ["P","A","R"], limit?: 50, offset?: 0 }
+# body: { states?: ["P","A","R"], limit?: 50 (최대 200), offset?: 0 }
+# resp: { code, items, total, hasMore }
 # -----------------------------------
 @supplier.route("/ajax/approval/list", methods=["POST"])
 @jwt_required()
 def approval_list():
   data = request.get_json(silent=True) or {}
   states = data.get("states") or [STATE_PENDING]
-  limit = int(data.get("limit") or 50)
-  offset = int(data.get("offset") or 0)
+  limit = min(max(int(data.get("limit") or 50), 1), 200)
+  offset = max(int(data.get("offset") or 0), 0)
 
   items = SupplierListRepository.find_by_states(states, limit=limit, offset=offset)
+  total = SupplierListRepository.count_by_states(states)
 
   def to_dict(x: SupplierList) -> dict:
     return {
@@ -403,7 +469,12 @@ def approval_list():
       "updatedAt": x.updatedAt.isoformat() if getattr(x, "updatedAt", None) else None
     }
 
-  return jsonify({"code": 20000, "items": [to_dict(s) for s in items]})
+  return jsonify({
+    "code": 20000,
+    "items": [to_dict(s) for s in items],
+    "total": total,
+    "hasMore": total > offset + limit
+  })
 
 # -----------------------------------
 # Ajax: 단건 승인/반려
@@ -450,8 +521,6 @@ def approval_bulk_set():
 @supplier.route("/ajax/cafe24/createSupplier", methods=["POST"])
 @jwt_required()
 def cafe24_create_supplier():
-  import re, decimal
-  from decimal import Decimal
   data = request.get_json(silent=True) or {}
   seq = int(data.get("seq") or 0)
   
@@ -477,26 +546,15 @@ def cafe24_create_supplier():
     # 문자열은 strip, 그 외(None 제외)는 그대로 반환
     return (v or "").strip() if isinstance(v, str) else (v if v is not None else "")
 
-  # JSON 직렬화 안전 변환기 (dict/list 깊은 변환)
-  def _to_jsonable(obj):
-    if isinstance(obj, Decimal):
-      # 외부 API에는 문자열로 보내는 편이 안전 (정밀도 유지)
-      return str(obj)
-    if isinstance(obj, (list, tuple)):
-      return [ _to_jsonable(x) for x in obj ]
-    if isinstance(obj, dict):
-      return { k: _to_jsonable(v) for k, v in obj.items() }
-    return obj
-
   # email 로컬파트로 user_id 만들기
   def _user_id_from_email(email: str) -> str:
     local = (email or "").split("@")[0].lower()
     # 영문/숫자/언더스코어만 허용
-    local = re.sub(r"[^a-z0-9_]", "", local)
+    local = _USER_ID_STRIP_RE.sub("", local)
     # 길이 제한(카페24는 4~16자 권장)
     if len(local) < 4:
       # 회사명으로 보강
-      fallback = re.sub(r"[^a-z0-9_]", "", (_safe(s.companyName) or "").lower())
+      fallback = _USER_ID_STRIP_RE.sub("", (_safe(s.companyName) or "").lower())
       local = (local + fallback)[:16]
     if len(local) < 4:
       local = f"vendor{seq}"[:16]
@@ -528,18 +586,17 @@ def cafe24_create_supplier():
       **({"commission": commission} if commission is not None else {})
     }
   }
-  create_supplier_payload = _to_jsonable(create_supplier_payload)
 
   suppliers_url = f"{CAFE24_BASE_URL.rstrip('/')}/api/v2/admin/suppliers"
 
   try:
-    resp = requests.post(suppliers_url, headers=_cafe24_headers(), json=create_supplier_payload, timeout=20)
+    resp = _CAFE24_HTTP.post(suppliers_url, headers=_cafe24_headers(), data=_cafe24_body(create_supplier_payload), timeout=_CAFE24_CREATE_TIMEOUT)
     try:
       body = resp.json()
     except Exception:
       body = {"raw": resp.text}
 
-    if resp.status_code not in (200, 201):
+    if resp.status_code not in _CAFE24_OK_STATUS:
       return jsonify({
         "code": 50011,
         "message": f"Cafe24 API 오류(status={resp.status_code})",
@@ -572,7 +629,7 @@ def cafe24_create_supplier():
       src_user_id = _user_id_from_email(_safe(s.email))
 
     # 허용 문자/길이 보정
-    src_user_id = re.sub(r"[^a-z0-9_]", "", src_user_id)[:16]
+    src_user_id = _USER_ID_STRIP_RE.sub("", src_user_id)[:16]
     if len(src_user_id) < 4:
       src_user_id = _user_id_from_email(_safe(s.email))
 
@@ -596,19 +653,18 @@ def cafe24_create_supplier():
       create_user_payload["request"]["email"] = _safe(s.email)
     if _safe(getattr(s, "number", "")):
       # 형식 검증(숫자/+, - 제거 등) 필요시 여기서 정규화
-      phone = re.sub(r"[^\d+]", "", _safe(s.number))
+      phone = _PHONE_STRIP_RE.sub("", _safe(s.number))
       create_user_payload["request"]["phone"] = phone
 
-    create_user_payload = _to_jsonable(create_user_payload)
-
+  
     users_url = f"{CAFE24_BASE_URL.rstrip('/')}/api/v2/admin/suppliers/users"
-    resp2 = requests.post(users_url, headers=_cafe24_headers(), json=create_user_payload, timeout=20)
+    resp2 = _CAFE24_HTTP.post(users_url, headers=_cafe24_headers(), data=_cafe24_body(create_user_payload), timeout=_CAFE24_CREATE_TIMEOUT)
     try:
       body2 = resp2.json()
     except Exception:
       body2 = {"raw": resp2.text}
 
-    if resp2.status_code not in (200, 201):
+    if resp2.status_code not in _CAFE24_OK_STATUS:
       return jsonify({
         "code": 50021,
         "message": f"공급사 생성 성공, 운영자 생성 실패(status={resp2.status_code})",
@@ -617,501 +673,53 @@ def cafe24_create_supplier():
 
     s.supplierCode = supplier_code
     SupplierListRepository.save(s)
-    # 3-bulk) 기본상품 등록 (HARDCODED PAYLOAD → Cafe24 제품 생성)
-    
-    ## Main Code (메인진열코드) ##
-    # 2:product_listmain_1: 반가운 신제품 소식-오직 원데이박스 B2B
-    # 3:product_listmain_2: 국내 배송
-    # 4:product_listmain_3: 해외에서 출고 되는 상품입니다
-    # 5:product_listmain_4: 채움앤비움
-    # 6:product_listmain_5: 두고푸드
-    # 7:product_listmain_6: 뉴질랜드배송
-    # 8:product_listmain_7: 원데이박스 사업자 특혜
-    # 9:product_listmain_8: 신제품 NEW
-    # 10:product_listmain_9: SHORTS
-    # 11:product_listmain_10: 대현
-    # 12:product_listmain_11: 탭5
-    # 13:product_listmain_12: 메인진열1
-    # 14:product_listmain_13: 메인진열2
-    # 15:product_listmain_14: 메인진열3
-    # 16:product_listmain_15: 메인진열4
-    # 17:product_listmain_16: 메인진열5
-    # 18:product_listmain_17: 메인진열6
-    # 19:product_listmain_18: 메인진열7
-    # 20:product_listmain_19: 메인진열8
-    # 21:product_listmain_20: 메인진열9
-    
-    ## User Group Code ##
-    # 1: 일반 회원
-    # 4: 멤버쉽 회원
-    # 5: 관리자
-    # 6: 총판
-    # 7: OEM
-    
-    ## Icon Code ##
-    # custom_9:단종
-    # custom_11:품절
-    # custom_7:해외배송
-    # custom_8:국내배송
-    # custom_10:재입고
-    # custom_14:배송지연
-    # custom_16:모든채널
-    # custom_17:무료배송
-    # custom_18:위탁배송
-    # custom_19:특가할인
-    # custom_20:폐쇄몰
-    # custom_21:약국전용
-    # custom_22:특가할인
+    # 3) Toss 셀러 등록 (승인 처리의 전제라 요청 안에서 처리)
     try:
-      products_url = f"{CAFE24_BASE_URL.rstrip('/')}/api/v2/admin/products"
-      
-      ## product_1 ##
-      product_1_detail_image_list = cafe24_upload_images(["/web/application/static/img/thumb/product_1_detail_img.jpg"])
-      product_1_description = build_description_html(product_1_detail_image_list)
-      
-      product_1_image_list = cafe24_upload_images(["/web/application/static/img/thumb/product_1_img.png"])
-      product_1_image = "/web/upload/" + product_1_image_list[0].split("/web/upload/")[-1],
-      
-      product_1_add_image_paths = [
-        "/web/application/static/img/thumb/product_1_add_1_img.jpg",
-        "/web/application/static/img/thumb/product_1_add_2_img.jpg",
-        "/web/application/static/img/thumb/product_1_add_3_img.jpg",
-        "/web/application/static/img/thumb/product_1_add_4_img.jpg",
-        "/web/application/static/img/thumb/product_1_add_5_img.jpg",
-      ]
-      product_1_add_image_list = cafe24_upload_images(product_1_add_image_paths)
-
-      req1 = {
-        "shop_no": 1,
-        "request": {
-          ## 표시 설정 ##
-          "display": "F",                           # 진열상태
-          "selling": "F",                           # 판매상태
-          "add_category_no": [                      # 추가 분류 번호
-            {"category_no": 113, "recommend": "F", "new": "F"},
-            {"category_no": 132, "recommend": "F", "new": "F"},
-            {"category_no": 145, "recommend": "F", "new": "F"},
-            {"category_no": 340, "recommend": "F", "new": "F"}
-          ],
-          "main":                                   # 메인진열
-            [16],
-          "exposure_limit_type": "A",               # 표시제한 범위
-          
-          ## 기본 정보 ##
-          "product_name":                           # 상품명
-            "[테스트상품_가전제품] DS 무선 핸디 청소기 휴대식 청소기 차량 가정 겸용 X",
-          # "eng_product_name": "",                 # 영문 상품명
-          "internal_product_name":                  # 상품명(관리용)
-            "테스트상품_가전제품",
-          "supply_product_name":                    # 공급사 상품명
-            "[테스트상품_가전제품] DS 무선 핸디 청소기 휴대식 청소기 차량 가정 겸용",
-          "model_name":                             # 모델명
-            "[테스트상품_가전제품] DS 무선 핸디 청소기 휴대식 청소기 차량 가정 겸용",
-          # "custom_product_code": "",              # 자체상품 코드
-          "product_condition": "N",                 # 상품 상태
-          "summary_description":                    # 상품요약설명
-            "일반 소비자 가격이 있는 가전제품의 상품 등록 방법입니다.  [가전제품 공급사 확인]",
-          # "simple_description": "",               # 상품 간략 설명
-          "description":                            # 상품 상세설명
-            product_1_description,
-          # "mobile_description": "",               # 모바일 상품 상세설명
-          # "product_tag": "",                      # 검색어
-          "additional_information": [               # 추가항목
-            {"key": "custom_option1", "value": "국내배송"},     # 국내·해외배송
-            # {"key": "custom_option2", "value": ""},     # 유튜브 영상 ID
-            {"key": "custom_option5", "value": "온라인 l 오프라인"},     # 판매가능플랫폼
-            # {"key": "custom_option8", "value": ""},     # 유튜브 영상 삽입/링크
-            {"key": "custom_option9", "value": "1일"},     # 평균 배송 완료일
-            {"key": "custom_option10", "value": "https://1drv.ms/f/c/87241ec44506bab2/EqEh6mN2CZhOg5yABsJ3qeoB_yTfDIvJImj9RZJ6Qyxnmw?e=WUHkqE"},    # (new)상세 이미지 다운로드
-            # {"key": "custom_option12", "value": ""},    # (new)유튜브 영상 바로가기
-            # {"key": "custom_option13", "value": ""},    # (new)유튜브 영상 다운로드
-            # {"key": "custom_option14", "value": ""},    # (new)알집 다운로드
-            # {"key": "custom_option15", "value": ""},    # 10개 이상 구매 시
-            {"key": "custom_option16", "value": "제주 및 도서산간 배송 불가"},    # 배송비 추가문구
-            {"key": "custom_option17", "value": "공급사 배송"},    # 배송형태
-            {"key": "custom_option18", "value": "과세"},    # 과세구분
-            {"key": "custom_option19", "value": "오후 01시 00분"},    # 발주마감
-          ],
-          
-          ## 판매 정보 ##
-          "retail_price": "5000",             # 상품 소비자가
-          "supply_price": "500",              # 상품 공급가
-          "tax_type": "B",                    # 과세구분
-          "margin_rate": "20.00",             # 마진률
-          "price": "2000",                    # 상품 판매가
-          # "price_content": "",              # 판매가 대체문구
-          "buy_limit_by_product": "T",        # 구매제한 개별 설정여부
-          "buy_limit_type": "M",              # 구매제한
-          "buy_group_list":                   # 구매가능 회원 등급
-            [4, 5, 6, 7],
-          "single_purchase_restriction": "F", # 단독구매 제한
-          "single_purchase": "F",             # 단독구매 설정
-          "buy_unit_type": "O",               # 구매단위 타입
-          "buy_unit": 1,                      # 구매단위
-          "order_quantity_limit_type": "O",   # 주문수량 제한 기준
-          "minimum_quantity": 1,              # 최소 주문수량
-          "maximum_quantity": 0,              # 최대 주문수량
-          "points_by_product": "F",           # 적립금 개별설정 사용여부
-          # "points_setting_by_payment": "C",   # 결제방식별 적립금 설정 여부
-          # "points_amount": [                  # 적립금 설정 정보
-          #   {
-          #     "payment_method": "cash",
-          #     "points_rate": "100.00",
-          #     "points_unit_by_payment": "W"
-          #   },
-          #   {
-          #     "payment_method": "mileage",
-          #     "points_rate": "10.00",
-          #     "points_unit_by_payment": "P"
-          #   }
-          # ],
-                                              # 개별 결제수단 설정
-                                              # 할인혜택 설정
-          "except_member_points": "F",        # 회원등급 추가 적립 제외
-                                              # 공통이벤트 정보
-          "adult_certification": "F",         # 성인인증
-                                              # 다음 쇼핑하우 추가 홍보문구
-          
-          ## 옵션/재고 설정 ##
-          "has_option": "F",                  # 옵션 사용여부
-          
-          ## 이미지정보 ##
-          "image_upload_type": "A",           # 이미지 업로드 타입
-          "detail_image":                     # 상세이미지
-            product_1_image[0],
-          # "list_image": "",                 # 목록이미지
-          # "tiny_image": "",                 # 작은목록이미지
-          # "small_image": "",                # 축소이미지
-          "additional_image":                 # 추가이미지
-            product_1_add_image_list,
-          
-          ## 제작 정보 ##
-          "manufacturer_code": "M0000000",    # 제조사
-          "supplier_code": supplier_code,     # 공급사
-          "brand_code": "B0000000",           # 브랜드
-          "trend_code": "T0000000",           # 트렌드
-          "classification_code": "C000000A",  # 자체분류
-          # "made_date": "",                  # 제조일자
-          # "release_date": "",               # 출시일자
-          # "expiration_date": "",            # 유효기간
-          
-          "origin_classification": "F",       # 원산지
-          # "origin_place_no": "",            # 원산지 번호
-          # "origin_place_value": "",         # 원산지기타정보
-          "made_in_code": "KR",               # 원산지 국가코드
-          
-          # "size_guide": {                   # 사이즈 가이드
-          #     "use": "T",
-          #     "type": "default",
-          #     "default": "Male"
-          # },
-          # "product_volume": {               # 상품 부피 정보
-          #   "use_product_volume": "T",
-          #   "product_width": 3,
-          #   "product_height": 5.5,
-          #   "product_length": 7
-          # },
-          
-          "image_upload_type": "A",
-          
-          ## 상세 이용안내 ##
-          # "payment_info": "",               # 상품결제안내
-          # "shipping_info": "",              # 상품배송안내
-          # "exchange_info": "",              # 교환/반품안내
-          # "service_info": "",               # 서비스문의/안내
-          
-          ## 아이콘 설정 ##
-          "icon": [                           # 아이콘
-              "custom_16",
-              "custom_17",
-              "custom_18"
-          ],
-          
-          ## 배송 정보 ##
-          "shipping_scope": "A",              # 배송정보
-          # "shipping_fee_by_product": "F",     # 개별배송여부
-          # "shipping_method": "01",            # 배송방법
-          "product_weight": "1.00",           # 상품 전체중량
-          # "hscode": "4303101990",           # HS코드
-          # "country_hscode": {               # 국가별 HS 코드
-          #   "JPN": "430310011",
-          #   "CHN": "43031020"
-          # },
-          "product_shipping_type": "C",       # 상품 배송유형
-          
-          ## 추가구성상품 ##
-          
-          ## 관련상품 ##
-          
-          ## 검색엔진 최적화(SEO) ##
-          
-          ## 메모 ##
-        }
+      supplierDetail = SupplierDetailRepository.findBySupplierSeq(s.seq)
+      seller_body = {
+        "refSellerId": s.supplierCode,
+        "businessType": supplierDetail.businessType,
+        "company": {
+          "name": supplierDetail.companyName,
+          "representativeName": supplierDetail.representativeName,
+          "businessRegistrationNumber": supplierDetail.businessRegistrationNumber,
+          "email": supplierDetail.companyEmail,
+          "phone": supplierDetail.companyPhone,
+        },
+        "account": {
+          "bankCode": supplierDetail.bankCode,
+          "accountNumber": supplierDetail.accountNumber,
+          "holderName": supplierDetail.holderName,
+        },
       }
-      
-      respP1 = requests.post(
-        products_url,
-        headers=_cafe24_headers(),
-        json=_to_jsonable(req1),  # NaN/None/Decimal 안전 변환
-        timeout=30
-      )
-      try:
-        bodyP1 = respP1.json()
-      except Exception:
-        bodyP1 = {"raw": respP1.text}
-      
-      ## product_2 ##
-      product_2_detail_image_list = cafe24_upload_images(["/web/application/static/img/thumb/product_2_detail_img.jpg"])
-      product_2_description = build_description_html(product_2_detail_image_list)
-      
-      product_2_image_list = cafe24_upload_images(["/web/application/static/img/thumb/product_2_img.png"])
-      product_2_image = "/web/upload/" + product_2_image_list[0].split("/web/upload/")[-1],
-      
-      product_2_add_image_paths = [
-        "/web/application/static/img/thumb/product_2_add_1_img.jpg",
-        "/web/application/static/img/thumb/product_2_add_2_img.jpg",
-        "/web/application/static/img/thumb/product_2_add_3_img.jpg",
-        "/web/application/static/img/thumb/product_2_add_4_img.jpg",
-      ]
-      product_2_add_image_list = cafe24_upload_images(product_2_add_image_paths)
-
-      req2 = {
-        "shop_no": 1,
-        "request": {
-          ## 표시 설정 ##
-          "display": "F",                           # 진열상태
-          "selling": "F",                           # 판매상태
-          "add_category_no": [                      # 추가 분류 번호
-            {"category_no": 113, "recommend": "F", "new": "F"},
-            {"category_no": 132, "recommend": "F", "new": "F"},
-            {"category_no": 145, "recommend": "F", "new": "F"},
-            {"category_no": 340, "recommend": "F", "new": "F"}
-          ],
-          "main":                                   # 메인진열
-            [16],
-          "exposure_limit_type": "A",               # 표시제한 범위
-          
-          ## 기본 정보 ##
-          "product_name":                           # 상품명
-            "[테스트상품_여성의류] 페이퍼먼츠 셔츠형 허리 스모크 주름 베이직 롱 원피스 01924",
-          # "eng_product_name": "",                 # 영문 상품명
-          "internal_product_name":                  # 상품명(관리용)
-            "테스트상품_여성의류",
-          "supply_product_name":                    # 공급사 상품명
-            "[테스트상품_여성의류] 페이퍼먼츠 셔츠형 허리 스모크 주름 베이직 롱 원피스 01924",
-          "model_name":                             # 모델명
-            "[테스트상품_여성의류] 페이퍼먼츠 셔츠형 허리 스모크 주름 베이직 롱 원피스 01924",
-          # "custom_product_code": "",              # 자체상품 코드
-          "product_condition": "N",                 # 상품 상태
-          "summary_description":                    # 상품요약설명
-            "색상 옵션 2가지 있는 경우 상품 등록 방법입니다  [의류 판매 공급사 확인]",
-          # "simple_description": "",               # 상품 간략 설명
-          "description":                            # 상품 상세설명
-            product_2_description,
-          # "mobile_description": "",               # 모바일 상품 상세설명
-          # "product_tag": "",                      # 검색어
-          "additional_information": [               # 추가항목
-            {"key": "custom_option1", "value": "국내배송"},     # 국내·해외배송
-            # {"key": "custom_option2", "value": ""},     # 유튜브 영상 ID
-            {"key": "custom_option5", "value": "온라인 l 오프라인"},     # 판매가능플랫폼
-            # {"key": "custom_option8", "value": ""},     # 유튜브 영상 삽입/링크
-            {"key": "custom_option9", "value": "1일"},     # 평균 배송 완료일
-            {"key": "custom_option10", "value": "https://1drv.ms/f/c/87241ec44506bab2/EqEh6mN2CZhOg5yABsJ3qeoB_yTfDIvJImj9RZJ6Qyxnmw?e=WUHkqE"},    # (new)상세 이미지 다운로드
-            # {"key": "custom_option12", "value": ""},    # (new)유튜브 영상 바로가기
-            # {"key": "custom_option13", "value": ""},    # (new)유튜브 영상 다운로드
-            # {"key": "custom_option14", "value": ""},    # (new)알집 다운로드
-            # {"key": "custom_option15", "value": ""},    # 10개 이상 구매 시
-            {"key": "custom_option16", "value": "제주 및 도서산간 배송 불가"},    # 배송비 추가문구
-            {"key": "custom_option17", "value": "공급사 배송"},    # 배송형태
-            {"key": "custom_option18", "value": "과세"},    # 과세구분
-            {"key": "custom_option19", "value": "오후 01시 00분"},    # 발주마감
-          ],
-          
-          ## 판매 정보 ##
-          "retail_price": "5000",             # 상품 소비자가
-          "supply_price": "500",              # 상품 공급가
-          "tax_type": "B",                    # 과세구분
-          "margin_rate": "20.00",             # 마진률
-          "price": "2000",                    # 상품 판매가
-          # "price_content": "",              # 판매가 대체문구
-          "buy_limit_by_product": "T",        # 구매제한 개별 설정여부
-          "buy_limit_type": "M",              # 구매제한
-          "buy_group_list":                   # 구매가능 회원 등급
-            [4, 5, 6, 7],
-          "single_purchase_restriction": "F", # 단독구매 제한
-          "single_purchase": "F",             # 단독구매 설정
-          "buy_unit_type": "O",               # 구매단위 타입
-          "buy_unit": 1,                      # 구매단위
-          "order_quantity_limit_type": "O",   # 주문수량 제한 기준
-          "minimum_quantity": 1,              # 최소 주문수량
-          "maximum_quantity": 0,              # 최대 주문수량
-          "points_by_product": "F",           # 적립금 개별설정 사용여부
-          # "points_setting_by_payment": "C",   # 결제방식별 적립금 설정 여부
-          # "points_amount": [                  # 적립금 설정 정보
-          #   {
-          #     "payment_method": "cash",
-          #     "points_rate": "100.00",
-          #     "points_unit_by_payment": "W"
-          #   },
-          #   {
-          #     "payment_method": "mileage",
-          #     "points_rate": "10.00",
-          #     "points_unit_by_payment": "P"
-          #   }
-          # ],
-                                              # 개별 결제수단 설정
-                                              # 할인혜택 설정
-          "except_member_points": "F",        # 회원등급 추가 적립 제외
-                                              # 공통이벤트 정보
-          "adult_certification": "F",         # 성인인증
-                                              # 다음 쇼핑하우 추가 홍보문구
-          
-          ## 옵션/재고 설정 ##
-          "has_option": "T",                  # 옵션 사용여부
-          "option_type": "S",                 # 옵션 구성방식
-          "options": [
-              {
-                  "name": "Color",
-                  "value": [
-                      "네이비",
-                      "카라멜"
-                  ]
-              },
-              {
-                  "name": "Size",
-                  "value": [
-                      "S",
-                      "M",
-                      "L",
-                      "XL"
-                  ]
-              }
-          ],
-          
-          ## 이미지정보 ##
-          "image_upload_type": "A",           # 이미지 업로드 타입
-          "detail_image":                     # 상세이미지
-            product_2_image[0],
-          # "list_image": "",                 # 목록이미지
-          # "tiny_image": "",                 # 작은목록이미지
-          # "small_image": "",                # 축소이미지
-          "additional_image":                 # 추가이미지
-            product_2_add_image_list,
-          
-          ## 제작 정보 ##
-          "manufacturer_code": "M0000000",    # 제조사
-          "supplier_code": supplier_code,     # 공급사
-          "brand_code": "B0000000",           # 브랜드
-          "trend_code": "T0000000",           # 트렌드
-          "classification_code": "C000000A",  # 자체분류
-          # "made_date": "",                  # 제조일자
-          # "release_date": "",               # 출시일자
-          # "expiration_date": "",            # 유효기간
-          
-          "origin_classification": "F",       # 원산지
-          # "origin_place_no": "",            # 원산지 번호
-          # "origin_place_value": "",         # 원산지기타정보
-          "made_in_code": "KR",               # 원산지 국가코드
-          
-          # "size_guide": {                   # 사이즈 가이드
-          #     "use": "T",
-          #     "type": "default",
-          #     "default": "Male"
-          # },
-          # "product_volume": {               # 상품 부피 정보
-          #   "use_product_volume": "T",
-          #   "product_width": 3,
-          #   "product_height": 5.5,
-          #   "product_length": 7
-          # },
-          
-          "image_upload_type": "A",
-          
-          ## 상세 이용안내 ##
-          # "payment_info": "",               # 상품결제안내
-          # "shipping_info": "",              # 상품배송안내
-          # "exchange_info": "",              # 교환/반품안내
-          # "service_info": "",               # 서비스문의/안내
-          
-          ## 아이콘 설정 ##
-          "icon": [                           # 아이콘
-              "custom_16",
-              "custom_17",
-              "custom_18"
-          ],
-          
-          ## 배송 정보 ##
-          "shipping_scope": "A",              # 배송정보
-          # "shipping_fee_by_product": "F",     # 개별배송여부
-          # "shipping_method": "01",            # 배송방법
-          "product_weight": "1.00",           # 상품 전체중량
-          # "hscode": "4303101990",           # HS코드
-          # "country_hscode": {               # 국가별 HS 코드
-          #   "JPN": "430310011",
-          #   "CHN": "43031020"
-          # },
-          "product_shipping_type": "C",       # 상품 배송유형
-          
-          ## 추가구성상품 ##
-          
-          ## 관련상품 ##
-          
-          ## 검색엔진 최적화(SEO) ##
-          
-          ## 메모 ##
-        }
-      }
-      
-      respP2 = requests.post(
-        products_url,
-        headers=_cafe24_headers(),
-        json=_to_jsonable(req2),  # NaN/None/Decimal 안전 변환
-        timeout=30
-      )
-      try:
-        bodyP2 = respP2.json()
-      except Exception:
-        bodyP2 = {"raw": respP2.text}
-
-      # Toss 등록 시도
-      try:
-        supplierDetail = SupplierDetailRepository.findBySupplierSeq(s.seq)
-        seller_body = {
-          "refSellerId": s.supplierCode,
-          "businessType": supplierDetail.businessType,
-          "company": {
-            "name": supplierDetail.companyName,
-            "representativeName": supplierDetail.representativeName,
-            "businessRegistrationNumber": supplierDetail.businessRegistrationNumber,
-            "email": supplierDetail.companyEmail,
-            "phone": supplierDetail.companyPhone,
-          },
-          "account": {
-            "bankCode": supplierDetail.bankCode,
-            "accountNumber": supplierDetail.accountNumber,
-            "holderName": supplierDetail.holderName,
-          },
-        }
-        status, body = create_seller_encrypted(seller_body)
-        print(status, json.dumps(body, ensure_ascii=False, indent=2))
-      except Exception as e:
-        print(e)
-        # 필요시 seller_body 최소 필드만 로그(개인정보 과다 로그 방지)
-        return jsonify({
-          "code": 50210,
-          "message": "토스 셀러 생성 실패",
-          "error": str(e),
-        }), 502
+      seller_status, seller_resp = create_seller_encrypted(seller_body)
+      print(seller_status, json.dumps(seller_resp, ensure_ascii=False, indent=2))
     except Exception as e:
       print(e)
+      # 필요시 seller_body 최소 필드만 로그(개인정보 과다 로그 방지)
+      return jsonify({
+        "code": 50210,
+        "message": "토스 셀러 생성 실패",
+        "error": str(e),
+      }), 502
+
+    # 4) 기본상품 등록(이미지 업로드 + 상품 생성, 수 초 소요)은 백그라운드로 넘기고 바로 반환
+    #   → 결과는 /ajax/cafe24/createSupplier/<job_id> 로 조회
+    job_id = uuid.uuid4().hex
+    now = time.time()
+    with _product_jobs_lock:
+      # 만료된 작업 결과 정리
+      for k in [k for k, v in _product_jobs.items() if v["expires_at"] <= now]:
+        del _product_jobs[k]
+      _product_jobs[job_id] = {"done": False, "expires_at": now + PRODUCT_JOB_TTL_SEC}
+    submit(_run_default_products_job, job_id, supplier_code)
 
     return jsonify({
       "code": 20000,
+      "jobId": job_id,
       "result": {
         "supplier_create": body,
-        "user_create": body2,
-        "product_create_1": bodyP1,
-        "product_create_2": bodyP2
+        "user_create": body2
       }
     })
 
@@ -1119,10 +727,519 @@ def cafe24_create_supplier():
     print(e)
     return jsonify({"code": 50012, "message": "Cafe24 호출 실패", "detail": str(e)}), 200
 
-def cafe24_upload_images(image_paths: list[str]) -> list[str]:
+def _run_default_products_job(job_id: str, supplier_code: str):
+  """기본상품 등록 실행 후 결과를 _product_jobs 에 기록 (background.submit 으로 실행)"""
+  try:
+    # 요청 밖(백그라운드 작업)이므로 요청 단위 flask.g 캐시 대신 헤더를 직접 구성
+    bodyP1, bodyP2 = _create_default_products(supplier_code, _build_cafe24_headers())
+    body = {
+      "code": 20000,
+      "result": {
+        "product_create_1": bodyP1,
+        "product_create_2": bodyP2
+      }
+    }
+  except Exception as e:
+    _logger.exception("[cafe24] default products failed: supplier_code=%s job_id=%s", supplier_code, job_id)
+    body = {"code": 50030, "message": "기본상품 등록 실패", "detail": str(e)}
+
+  with _product_jobs_lock:
+    _product_jobs[job_id] = {
+      "done": True,
+      "body": body,
+      "expires_at": time.time() + PRODUCT_JOB_TTL_SEC,
+    }
+
+@supplier.route("/ajax/cafe24/createSupplier/<job_id>", methods=["GET"])
+@jwt_required()
+def cafe24_create_supplier_status(job_id):
+  """기본상품 등록 작업 상태 조회 (처리 중이면 202, 완료되면 결과 반환)"""
+  with _product_jobs_lock:
+    job = _product_jobs.get(job_id)
+
+  if not job:
+    return jsonify({"code": 40400, "message": "기본상품 등록 작업을 찾을 수 없습니다."}), 404
+  if not job["done"]:
+    return jsonify({"code": 20200, "jobId": job_id}), 202
+  return jsonify(job["body"])
+
+def _create_default_products(supplier_code: str, headers: dict):
+  """
+  신규 공급사 기본상품 2건 등록 (이미지 업로드 + Cafe24 상품 생성)
+  - 백그라운드 작업에서 호출되므로 flask.g 를 쓰는 _cafe24_headers() 대신 넘겨받은 헤더 사용
+  :return: (상품1 응답, 상품2 응답)
+  """
+  # 기본상품 등록 (HARDCODED PAYLOAD → Cafe24 제품 생성)
+
+  ## Main Code (메인진열코드) ##
+  # 2:product_listmain_1: 반가운 신제품 소식-오직 원데이박스 B2B
+  # 3:product_listmain_2: 국내 배송
+  # 4:product_listmain_3: 해외에서 출고 되는 상품입니다
+  # 5:product_listmain_4: 채움앤비움
+  # 6:product_listmain_5: 두고푸드
+  # 7:product_listmain_6: 뉴질랜드배송
+  # 8:product_listmain_7: 원데이박스 사업자 특혜
+  # 9:product_listmain_8: 신제품 NEW
+  # 10:product_listmain_9: SHORTS
+  # 11:product_listmain_10: 대현
+  # 12:product_listmain_11: 탭5
+  # 13:product_listmain_12: 메인진열1
+  # 14:product_listmain_13: 메인진열2
+  # 15:product_listmain_14: 메인진열3
+  # 16:product_listmain_15: 메인진열4
+  # 17:product_listmain_16: 메인진열5
+  # 18:product_listmain_17: 메인진열6
+  # 19:product_listmain_18: 메인진열7
+  # 20:product_listmain_19: 메인진열8
+  # 21:product_listmain_20: 메인진열9
+
+  ## User Group Code ##
+  # 1: 일반 회원
+  # 4: 멤버쉽 회원
+  # 5: 관리자
+  # 6: 총판
+  # 7: OEM
+
+  ## Icon Code ##
+  # custom_9:단종
+  # custom_11:품절
+  # custom_7:해외배송
+  # custom_8:국내배송
+  # custom_10:재입고
+  # custom_14:배송지연
+  # custom_16:모든채널
+  # custom_17:무료배송
+  # custom_18:위탁배송
+  # custom_19:특가할인
+  # custom_20:폐쇄몰
+  # custom_21:약국전용
+  # custom_22:특가할인
+  products_url = f"{CAFE24_BASE_URL.rstrip('/')}/api/v2/admin/products"
+
+  product_1_add_image_paths = [
+    "/web/application/static/img/thumb/product_1_add_1_img.jpg",
+    "/web/application/static/img/thumb/product_1_add_2_img.jpg",
+    "/web/application/static/img/thumb/product_1_add_3_img.jpg",
+    "/web/application/static/img/thumb/product_1_add_4_img.jpg",
+    "/web/application/static/img/thumb/product_1_add_5_img.jpg",
+  ]
+  product_2_add_image_paths = [
+    "/web/application/static/img/thumb/product_2_add_1_img.jpg",
+    "/web/application/static/img/thumb/product_2_add_2_img.jpg",
+    "/web/application/static/img/thumb/product_2_add_3_img.jpg",
+    "/web/application/static/img/thumb/product_2_add_4_img.jpg",
+  ]
+
+  # 이미지 업로드 6건은 서로 독립 → 동시에 업로드
+  f_p1_detail = _cafe24_pool.submit(cafe24_upload_images, ["/web/application/static/img/thumb/product_1_detail_img.jpg"], headers)
+  f_p1_main   = _cafe24_pool.submit(cafe24_upload_images, ["/web/application/static/img/thumb/product_1_img.png"], headers)
+  f_p1_add    = _cafe24_pool.submit(cafe24_upload_images, product_1_add_image_paths, headers)
+  f_p2_detail = _cafe24_pool.submit(cafe24_upload_images, ["/web/application/static/img/thumb/product_2_detail_img.jpg"], headers)
+  f_p2_main   = _cafe24_pool.submit(cafe24_upload_images, ["/web/application/static/img/thumb/product_2_img.png"], headers)
+  f_p2_add    = _cafe24_pool.submit(cafe24_upload_images, product_2_add_image_paths, headers)
+
+  ## product_1 ##
+  product_1_detail_image_list = f_p1_detail.result()
+  product_1_description = build_description_html(product_1_detail_image_list)
+
+  product_1_image_list = f_p1_main.result()
+  product_1_image = "/web/upload/" + product_1_image_list[0].split("/web/upload/")[-1],
+
+  product_1_add_image_list = f_p1_add.result()
+
+  req1 = {
+    "shop_no": 1,
+    "request": {
+      ## 표시 설정 ##
+      "display": "F",                           # 진열상태
+      "selling": "F",                           # 판매상태
+      "add_category_no": [                      # 추가 분류 번호
+        {"category_no": 113, "recommend": "F", "new": "F"},
+        {"category_no": 132, "recommend": "F", "new": "F"},
+        {"category_no": 145, "recommend": "F", "new": "F"},
+        {"category_no": 340, "recommend": "F", "new": "F"}
+      ],
+      "main":                                   # 메인진열
+        [16],
+      "exposure_limit_type": "A",               # 표시제한 범위
+
+      ## 기본 정보 ##
+      "product_name":                           # 상품명
+        "[테스트상품_가전제품] DS 무선 핸디 청소기 휴대식 청소기 차량 가정 겸용 X",
+      # "eng_product_name": "",                 # 영문 상품명
+      "internal_product_name":                  # 상품명(관리용)
+        "테스트상품_가전제품",
+      "supply_product_name":                    # 공급사 상품명
+        "[테스트상품_가전제품] DS 무선 핸디 청소기 휴대식 청소기 차량 가정 겸용",
+      "model_name":                             # 모델명
+        "[테스트상품_가전제품] DS 무선 핸디 청소기 휴대식 청소기 차량 가정 겸용",
+      # "custom_product_code": "",              # 자체상품 코드
+      "product_condition": "N",                 # 상품 상태
+      "summary_description":                    # 상품요약설명
+        "일반 소비자 가격이 있는 가전제품의 상품 등록 방법입니다.  [가전제품 공급사 확인]",
+      # "simple_description": "",               # 상품 간략 설명
+      "description":                            # 상품 상세설명
+        product_1_description,
+      # "mobile_description": "",               # 모바일 상품 상세설명
+      # "product_tag": "",                      # 검색어
+      "additional_information": [               # 추가항목
+        {"key": "custom_option1", "value": "국내배송"},     # 국내·해외배송
+        # {"key": "custom_option2", "value": ""},     # 유튜브 영상 ID
+        {"key": "custom_option5", "value": "온라인 l 오프라인"},     # 판매가능플랫폼
+        # {"key": "custom_option8", "value": ""},     # 유튜브 영상 삽입/링크
+        {"key": "custom_option9", "value": "1일"},     # 평균 배송 완료일
+        {"key": "custom_option10", "value": "https://1drv.ms/f/c/87241ec44506bab2/EqEh6mN2CZhOg5yABsJ3qeoB_yTfDIvJImj9RZJ6Qyxnmw?e=WUHkqE"},    # (new)상세 이미지 다운로드
+        # {"key": "custom_option12", "value": ""},    # (new)유튜브 영상 바로가기
+        # {"key": "custom_option13", "value": ""},    # (new)유튜브 영상 다운로드
+        # {"key": "custom_option14", "value": ""},    # (new)알집 다운로드
+        # {"key": "custom_option15", "value": ""},    # 10개 이상 구매 시
+        {"key": "custom_option16", "value": "제주 및 도서산간 배송 불가"},    # 배송비 추가문구
+        {"key": "custom_option17", "value": "공급사 배송"},    # 배송형태
+        {"key": "custom_option18", "value": "과세"},    # 과세구분
+        {"key": "custom_option19", "value": "오후 01시 00분"},    # 발주마감
+      ],
+
+      ## 판매 정보 ##
+      "retail_price": "5000",             # 상품 소비자가
+      "supply_price": "500",              # 상품 공급가
+      "tax_type": "B",                    # 과세구분
+      "margin_rate": "20.00",             # 마진률
+      "price": "2000",                    # 상품 판매가
+      # "price_content": "",              # 판매가 대체문구
+      "buy_limit_by_product": "T",        # 구매제한 개별 설정여부
+      "buy_limit_type": "M",              # 구매제한
+      "buy_group_list":                   # 구매가능 회원 등급
+        [4, 5, 6, 7],
+      "single_purchase_restriction": "F", # 단독구매 제한
+      "single_purchase": "F",             # 단독구매 설정
+      "buy_unit_type": "O",               # 구매단위 타입
+      "buy_unit": 1,                      # 구매단위
+      "order_quantity_limit_type": "O",   # 주문수량 제한 기준
+      "minimum_quantity": 1,              # 최소 주문수량
+      "maximum_quantity": 0,              # 최대 주문수량
+      "points_by_product": "F",           # 적립금 개별설정 사용여부
+      # "points_setting_by_payment": "C",   # 결제방식별 적립금 설정 여부
+      # "points_amount": [                  # 적립금 설정 정보
+      #   {
+      #     "payment_method": "cash",
+      #     "points_rate": "100.00",
+      #     "points_unit_by_payment": "W"
+      #   },
+      #   {
+      #     "payment_method": "mileage",
+      #     "points_rate": "10.00",
+      #     "points_unit_by_payment": "P"
+      #   }
+      # ],
+                                          # 개별 결제수단 설정
+                                          # 할인혜택 설정
+      "except_member_points": "F",        # 회원등급 추가 적립 제외
+                                          # 공통이벤트 정보
+      "adult_certification": "F",         # 성인인증
+                                          # 다음 쇼핑하우 추가 홍보문구
+
+      ## 옵션/재고 설정 ##
+      "has_option": "F",                  # 옵션 사용여부
+
+      ## 이미지정보 ##
+      "image_upload_type": "A",           # 이미지 업로드 타입
+      "detail_image":                     # 상세이미지
+        product_1_image[0],
+      # "list_image": "",                 # 목록이미지
+      # "tiny_image": "",                 # 작은목록이미지
+      # "small_image": "",                # 축소이미지
+      "additional_image":                 # 추가이미지
+        product_1_add_image_list,
+
+      ## 제작 정보 ##
+      "manufacturer_code": "M0000000",    # 제조사
+      "supplier_code": supplier_code,     # 공급사
+      "brand_code": "B0000000",           # 브랜드
+      "trend_code": "T0000000",           # 트렌드
+      "classification_code": "C000000A",  # 자체분류
+      # "made_date": "",                  # 제조일자
+      # "release_date": "",               # 출시일자
+      # "expiration_date": "",            # 유효기간
+
+      "origin_classification": "F",       # 원산지
+      # "origin_place_no": "",            # 원산지 번호
+      # "origin_place_value": "",         # 원산지기타정보
+      "made_in_code": "KR",               # 원산지 국가코드
+
+      # "size_guide": {                   # 사이즈 가이드
+      #     "use": "T",
+      #     "type": "default",
+      #     "default": "Male"
+      # },
+      # "product_volume": {               # 상품 부피 정보
+      #   "use_product_volume": "T",
+      #   "product_width": 3,
+      #   "product_height": 5.5,
+      #   "product_length": 7
+      # },
+
+      "image_upload_type": "A",
+
+      ## 상세 이용안내 ##
+      # "payment_info": "",               # 상품결제안내
+      # "shipping_info": "",              # 상품배송안내
+      # "exchange_info": "",              # 교환/반품안내
+      # "service_info": "",               # 서비스문의/안내
+
+      ## 아이콘 설정 ##
+      "icon": [                           # 아이콘
+          "custom_16",
+          "custom_17",
+          "custom_18"
+      ],
+
+      ## 배송 정보 ##
+      "shipping_scope": "A",              # 배송정보
+      # "shipping_fee_by_product": "F",     # 개별배송여부
+      # "shipping_method": "01",            # 배송방법
+      "product_weight": "1.00",           # 상품 전체중량
+      # "hscode": "4303101990",           # HS코드
+      # "country_hscode": {               # 국가별 HS 코드
+      #   "JPN": "430310011",
+      #   "CHN": "43031020"
+      # },
+      "product_shipping_type": "C",       # 상품 배송유형
+
+      ## 추가구성상품 ##
+
+      ## 관련상품 ##
+
+      ## 검색엔진 최적화(SEO) ##
+
+      ## 메모 ##
+    }
+  }
+
+  respP1 = _CAFE24_HTTP.post(
+    products_url,
+    headers=headers,
+    data=_cafe24_body(req1),  # Decimal 은 문자열로 직렬화
+    timeout=30
+  )
+  try:
+    bodyP1 = respP1.json()
+  except Exception:
+    bodyP1 = {"raw": respP1.text}
+
+  ## product_2 ##
+  product_2_detail_image_list = f_p2_detail.result()
+  product_2_description = build_description_html(product_2_detail_image_list)
+
+  product_2_image_list = f_p2_main.result()
+  product_2_image = "/web/upload/" + product_2_image_list[0].split("/web/upload/")[-1],
+
+  product_2_add_image_list = f_p2_add.result()
+
+  req2 = {
+    "shop_no": 1,
+    "request": {
+      ## 표시 설정 ##
+      "display": "F",                           # 진열상태
+      "selling": "F",                           # 판매상태
+      "add_category_no": [                      # 추가 분류 번호
+        {"category_no": 113, "recommend": "F", "new": "F"},
+        {"category_no": 132, "recommend": "F", "new": "F"},
+        {"category_no": 145, "recommend": "F", "new": "F"},
+        {"category_no": 340, "recommend": "F", "new": "F"}
+      ],
+      "main":                                   # 메인진열
+        [16],
+      "exposure_limit_type": "A",               # 표시제한 범위
+
+      ## 기본 정보 ##
+      "product_name":                           # 상품명
+        "[테스트상품_여성의류] 페이퍼먼츠 셔츠형 허리 스모크 주름 베이직 롱 원피스 01924",
+      # "eng_product_name": "",                 # 영문 상품명
+      "internal_product_name":                  # 상품명(관리용)
+        "테스트상품_여성의류",
+      "supply_product_name":                    # 공급사 상품명
+        "[테스트상품_여성의류] 페이퍼먼츠 셔츠형 허리 스모크 주름 베이직 롱 원피스 01924",
+      "model_name":                             # 모델명
+        "[테스트상품_여성의류] 페이퍼먼츠 셔츠형 허리 스모크 주름 베이직 롱 원피스 01924",
+      # "custom_product_code": "",              # 자체상품 코드
+      "product_condition": "N",                 # 상품 상태
+      "summary_description":                    # 상품요약설명
+        "색상 옵션 2가지 있는 경우 상품 등록 방법입니다  [의류 판매 공급사 확인]",
+      # "simple_description": "",               # 상품 간략 설명
+      "description":                            # 상품 상세설명
+        product_2_description,
+      # "mobile_description": "",               # 모바일 상품 상세설명
+      # "product_tag": "",                      # 검색어
+      "additional_information": [               # 추가항목
+        {"key": "custom_option1", "value": "국내배송"},     # 국내·해외배송
+        # {"key": "custom_option2", "value": ""},     # 유튜브 영상 ID
+        {"key": "custom_option5", "value": "온라인 l 오프라인"},     # 판매가능플랫폼
+        # {"key": "custom_option8", "value": ""},     # 유튜브 영상 삽입/링크
+        {"key": "custom_option9", "value": "1일"},     # 평균 배송 완료일
+        {"key": "custom_option10", "value": "https://1drv.ms/f/c/87241ec44506bab2/EqEh6mN2CZhOg5yABsJ3qeoB_yTfDIvJImj9RZJ6Qyxnmw?e=WUHkqE"},    # (new)상세 이미지 다운로드
+        # {"key": "custom_option12", "value": ""},    # (new)유튜브 영상 바로가기
+        # {"key": "custom_option13", "value": ""},    # (new)유튜브 영상 다운로드
+        # {"key": "custom_option14", "value": ""},    # (new)알집 다운로드
+        # {"key": "custom_option15", "value": ""},    # 10개 이상 구매 시
+        {"key": "custom_option16", "value": "제주 및 도서산간 배송 불가"},    # 배송비 추가문구
+        {"key": "custom_option17", "value": "공급사 배송"},    # 배송형태
+        {"key": "custom_option18", "value": "과세"},    # 과세구분
+        {"key": "custom_option19", "value": "오후 01시 00분"},    # 발주마감
+      ],
+
+      ## 판매 정보 ##
+      "retail_price": "5000",             # 상품 소비자가
+      "supply_price": "500",              # 상품 공급가
+      "tax_type": "B",                    # 과세구분
+      "margin_rate": "20.00",             # 마진률
+      "price": "2000",                    # 상품 판매가
+      # "price_content": "",              # 판매가 대체문구
+      "buy_limit_by_product": "T",        # 구매제한 개별 설정여부
+      "buy_limit_type": "M",              # 구매제한
+      "buy_group_list":                   # 구매가능 회원 등급
+        [4, 5, 6, 7],
+      "single_purchase_restriction": "F", # 단독구매 제한
+      "single_purchase": "F",             # 단독구매 설정
+      "buy_unit_type": "O",               # 구매단위 타입
+      "buy_unit": 1,                      # 구매단위
+      "order_quantity_limit_type": "O",   # 주문수량 제한 기준
+      "minimum_quantity": 1,              # 최소 주문수량
+      "maximum_quantity": 0,              # 최대 주문수량
+      "points_by_product": "F",           # 적립금 개별설정 사용여부
+      # "points_setting_by_payment": "C",   # 결제방식별 적립금 설정 여부
+      # "points_amount": [                  # 적립금 설정 정보
+      #   {
+      #     "payment_method": "cash",
+      #     "points_rate": "100.00",
+      #     "points_unit_by_payment": "W"
+      #   },
+      #   {
+      #     "payment_method": "mileage",
+      #     "points_rate": "10.00",
+      #     "points_unit_by_payment": "P"
+      #   }
+      # ],
+                                          # 개별 결제수단 설정
+                                          # 할인혜택 설정
+      "except_member_points": "F",        # 회원등급 추가 적립 제외
+                                          # 공통이벤트 정보
+      "adult_certification": "F",         # 성인인증
+                                          # 다음 쇼핑하우 추가 홍보문구
+
+      ## 옵션/재고 설정 ##
+      "has_option": "T",                  # 옵션 사용여부
+      "option_type": "S",                 # 옵션 구성방식
+      "options": [
+          {
+              "name": "Color",
+              "value": [
+                  "네이비",
+                  "카라멜"
+              ]
+          },
+          {
+              "name": "Size",
+              "value": [
+                  "S",
+                  "M",
+                  "L",
+                  "XL"
+              ]
+          }
+      ],
+
+      ## 이미지정보 ##
+      "image_upload_type": "A",           # 이미지 업로드 타입
+      "detail_image":                     # 상세이미지
+        product_2_image[0],
+      # "list_image": "",                 # 목록이미지
+      # "tiny_image": "",                 # 작은목록이미지
+      # "small_image": "",                # 축소이미지
+      "additional_image":                 # 추가이미지
+        product_2_add_image_list,
+
+      ## 제작 정보 ##
+      "manufacturer_code": "M0000000",    # 제조사
+      "supplier_code": supplier_code,     # 공급사
+      "brand_code": "B0000000",           # 브랜드
+      "trend_code": "T0000000",           # 트렌드
+      "classification_code": "C000000A",  # 자체분류
+      # "made_date": "",                  # 제조일자
+      # "release_date": "",               # 출시일자
+      # "expiration_date": "",            # 유효기간
+
+      "origin_classification": "F",       # 원산지
+      # "origin_place_no": "",            # 원산지 번호
+      # "origin_place_value": "",         # 원산지기타정보
+      "made_in_code": "KR",               # 원산지 국가코드
+
+      # "size_guide": {                   # 사이즈 가이드
+      #     "use": "T",
+      #     "type": "default",
+      #     "default": "Male"
+      # },
+      # "product_volume": {               # 상품 부피 정보
+      #   "use_product_volume": "T",
+      #   "product_width": 3,
+      #   "product_height": 5.5,
+      #   "product_length": 7
+      # },
+
+      "image_upload_type": "A",
+
+      ## 상세 이용안내 ##
+      # "payment_info": "",               # 상품결제안내
+      # "shipping_info": "",              # 상품배송안내
+      # "exchange_info": "",              # 교환/반품안내
+      # "service_info": "",               # 서비스문의/안내
+
+      ## 아이콘 설정 ##
+      "icon": [                           # 아이콘
+          "custom_16",
+          "custom_17",
+          "custom_18"
+      ],
+
+      ## 배송 정보 ##
+      "shipping_scope": "A",              # 배송정보
+      # "shipping_fee_by_product": "F",     # 개별배송여부
+      # "shipping_method": "01",            # 배송방법
+      "product_weight": "1.00",           # 상품 전체중량
+      # "hscode": "4303101990",           # HS코드
+      # "country_hscode": {               # 국가별 HS 코드
+      #   "JPN": "430310011",
+      #   "CHN": "43031020"
+      # },
+      "product_shipping_type": "C",       # 상품 배송유형
+
+      ## 추가구성상품 ##
+
+      ## 관련상품 ##
+
+      ## 검색엔진 최적화(SEO) ##
+
+      ## 메모 ##
+    }
+  }
+
+  respP2 = _CAFE24_HTTP.post(
+    products_url,
+    headers=headers,
+    data=_cafe24_body(req2),  # Decimal 은 문자열로 직렬화
+    timeout=30
+  )
+  try:
+    bodyP2 = respP2.json()
+  except Exception:
+    bodyP2 = {"raw": respP2.text}
+
+  return bodyP1, bodyP2
+
+def cafe24_upload_images(image_paths: list[str], headers: Optional[dict] = None) -> list[str]:
   """
   여러 이미지를 Cafe24에 업로드하고 업로드된 경로 리스트를 반환
   :param image_paths: 로컬 이미지 파일 경로 리스트
+  :param headers: 미리 만든 Cafe24 헤더 (스레드풀에서 호출 시 필수 — 토큰 조회에 앱 컨텍스트 필요)
   :return: 업로드된 이미지 상대경로 리스트
   """
   payload = {"request": []}
@@ -1132,7 +1249,7 @@ def cafe24_upload_images(image_paths: list[str]) -> list[str]:
     payload["request"].append({"image": b64})
 
   url = f"{CAFE24_BASE_URL.rstrip('/')}/api/v2/admin/products/images"
-  r = requests.post(url, headers=_cafe24_headers(), json=payload, timeout=30)
+  r = _CAFE24_HTTP.post(url, headers=headers or _cafe24_headers(), json=payload, timeout=30)
   r.raise_for_status()
   data = r.json()
   paths = [img["path"] for img in data.get("images", [])]
@@ -0,0 +1,75 @@
+# application/filters.py
+# -*- coding: utf-8 -*-
+"""
+Jinja 필터/코드 매핑
+- 템플릿 환경이 처음 만들어질 때(첫 render_template) register() 로 등록된다.
+"""
+from types import MappingProxyType
+
+# 상태 매핑 딕셔너리
+STATE_CODE_MAP = MappingProxyType({
+  "": "대기",
+  "P": "대기",
+  "I": "초대",
+  "A": "성공",
+  "E": "에러"
+})
+STATE_CONTRACT_CODE_MAP = MappingProxyType({
+  "": "슬랙대기",
+  "P": "발송대기",
+  "A": "발송완료",
+  "SS": "계약완료",
+  "S": "외부계약",
+  "E": "에러"
+})
+BANK_CODE_MAP = MappingProxyType({
+  "039": "경남은행",
+  "034": "광주은행",
+  "012": "단위농협(지역농축협)",
+  "032": "부산은행",
+  "045": "새마을금고",
+  "064": "산림조합",
+  "088": "신한은행",
+  "048": "신협",
+  "027": "씨티은행",
+  "020": "우리은행",
+  "071": "우체국예금보험",
+  "050": "저축은행중앙회",
+  "037": "전북은행",
+  "035": "제주은행",
+  "090": "카카오뱅크",
+  "089": "케이뱅크",
+  "092": "토스뱅크",
+  "081": "하나은행",
+  "054": "홍콩상하이은행",
+  "003": "IBK기업은행",
+  "004": "KB국민은행",
+  "031": "iM뱅크(대구)",
+  "002": "한국산업은행",
+  "011": "NH농협은행",
+  "023": "SC제일은행",
+  "007": "Sh수협은행",
+})
+
+# 숫자 외 Latin-1 문자 삭제 테이블 (str.translate 로 한 번에 제거)
+_NON_DIGITS = str.maketrans("", "", "".join(chr(c) for c in range(256) if not chr(c).isdigit()))
+
+def bizno_format(value):
+  """사업자등록번호 하이픈 포맷 (1234567890 -> 123-45-67890)"""
+  if not value:
+    return ""
+  s = str(value)
+  digits = s if s.isdigit() else s.translate(_NON_DIGITS)
+  if len(digits) == 10:
+    return f"{digits[0:3]}-{digits[3:5]}-{digits[5:10]}"
+  return value
+
+def register(jinja_env):
+  """
+  Jinja 필터 등록
+  - *_text 필터는 dict.get 을 그대로 바인딩 (템플릿에서 기본값 전달: {{ code|state_text("") }})
+  """
+  jinja_env.filters["state_text"] = STATE_CODE_MAP.get
+  jinja_env.filters["contractState_text"] = STATE_CONTRACT_CODE_MAP.get
+  jinja_env.filters["bankState_text"] = BANK_CODE_MAP.get
+  jinja_env.filters["bizno_format"] = bizno_format
@@ -0,0 +1,63 @@
+# background.py
+# -*- coding: utf-8 -*-
+"""
+요청 스레드 밖에서 실행할 짧은 작업(슬랙 알림 등)용 공용 스레드풀.
+- 웹훅/슬래시 커맨드는 빠르게 200 OK 를 돌려주고, 외부 API 호출은 여기로 넘긴다.
+- 작업마다 새 Flask 앱 컨텍스트 안에서 실행된다.
+  (flask.g 등 컨텍스트 상태가 작업 간에 섞이지 않도록 스레드 단위로 재사용하지 않음)
+  작업이 끝나면 DB 세션도 정리한다 (db.session.remove()).
+"""
+import os, logging, threading
+from typing import Optional
+from concurrent.futures import ThreadPoolExecutor, Future
+from flask import current_app
+
+from application.src.models import db
+
+_logger = logging.getLogger("jobs.background")
+
+BACKGROUND_WORKERS = int(os.getenv("BACKGROUND_WORKERS", "4"))
+
+_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_EXECUTOR_LOCK = threading.Lock()
+
+def _executor() -> ThreadPoolExecutor:
+  global _EXECUTOR
+  if _EXECUTOR is None:
+    with _EXECUTOR_LOCK:
+      if _EXECUTOR is None:
+        _EXECUTOR = ThreadPoolExecutor(max_workers=BACKGROUND_WORKERS, thread_name_prefix="bg")
+  return _EXECUTOR
+
+def _in_app_context(app, fn, args, kwargs):
+  # 작업마다 새 앱 컨텍스트에서 실행하고 DB 세션 정리
+  def _run():
+    with app.app_context():
+      try:
+        return fn(*args, **kwargs)
+      except Exception:
+        _logger.exception("[background] task failed: %s", getattr(fn, "__name__", fn))
+      finally:
+        try:
+          db.session.remove()
+        except Exception:
+          _logger.exception("[background] session cleanup failed")
+  return _run
+
+def submit(fn, *args, **kwargs) -> Future:
+  """
+  fn(*args, **kwargs) 를 백그라운드 스레드에서 앱 컨텍스트와 함께 실행.
+  - 반드시 요청/앱 컨텍스트 안에서 호출해야 한다 (current_app 사용)
+  - ORM 객체 대신 필요한 값만 넘길 것 (세션은 스레드별로 분리됨)
+  - 작업마다 db.session.remove() 로 세션/커넥션 반환 (identity map 누적 방지)
+  """
+  return submit_on(_executor(), fn, *args, **kwargs)
+
+def submit_on(executor: ThreadPoolExecutor, fn, *args, **kwargs) -> Future:
+  """
+  submit 과 같지만 지정한 전용 풀에서 실행.
+  - 공용 풀의 대기열에 밀리면 안 되는 작업(지급 처리 등)이나
+    공용 풀을 점유하면 안 되는 대량 작업(웹훅 등)용
+  """
+  app = current_app._get_current_object()
+  return executor.submit(_in_app_context(app, fn, args, kwargs))
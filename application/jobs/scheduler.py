@@ -117,8 +117,30 @@ def start_scheduler(app):
     replace_existing=True
   )
 
+  # ========= 신규: Cafe24 access_token 선갱신 (60초 간격) =========
+  from application.src.service.cafe24_oauth_service import refresh_access_token_if_expiring
+
+  def cafe24_token_refresh_job():
+    with app.app_context():
+      try:
+        if refresh_access_token_if_expiring():
+          app.logger.info("[cafe24_token_refresh_job] access_token refreshed")
+      except Exception as e:
+        app.logger.exception(e)
+
+  scheduler.add_job(
+    cafe24_token_refresh_job,
+    trigger='interval',
+    seconds=60,
+    id='cafe24_token_refresh_job',
+    max_instances=1,
+    coalesce=True,
+    misfire_grace_time=60,
+    replace_existing=True
+  )
+
   scheduler.start()
   atexit.register(lambda: scheduler.shutdown(wait=False))  # 프로세스 종료 시에만 정리
   _scheduler = scheduler
-  app.logger.info("APScheduler started (supplier/weekly/monthly)")
+  app.logger.info("APScheduler started (supplier/weekly/monthly/cafe24_token)")
   return scheduler
@@ -64,14 +64,16 @@ def run_monthly_settlement(out_dir: str = "/tmp"):
           supply_id=sid,
           channel=ch,
           start=start,
-          end=end
+          end=end,
+          background=False
         )
       else:
         fpath, summary = upload_file_with_button(
           supply_id=sid,
           channel=ch,
           start=start,
-          end=end
+          end=end,
+          background=False
         )
       
       # 2) 헤더 upsert (슬랙 전송 전: READY)
@@ -141,14 +143,16 @@ def run_weekly_settlement(out_dir: str = "/tmp"):
           supply_id=sid,
           channel=ch,
           start=start,
-          end=end
+          end=end,
+          background=False
         )
       else:
         fpath, summary = upload_file_with_button(
           supply_id=sid,
           channel=ch,
           start=start,
-          end=end
+          end=end,
+          background=False
         )
 
       # 2) 헤더 upsert (슬랙 전송 전: READY)
@@ -219,9 +223,9 @@ def run_monthly_settlement_for_seq(
   try:
     # 엑셀 생성 + 슬랙 업로드 (반환 형태 항상 (str, dict) 유지)
     if (s.seq in (10, 23)):
-      fpath, summary = upload_file(supply_id=sid, channel=ch, start=start, end=end)
+      fpath, summary = upload_file(supply_id=sid, channel=ch, start=start, end=end, background=False)
     else:
-      fpath, summary = upload_file_with_button(supply_id=sid, channel=ch, start=start, end=end)
+      fpath, summary = upload_file_with_button(supply_id=sid, channel=ch, start=start, end=end, background=False)
 
     # 헤더 upsert → READY
     header = SettlementRepository.upsert_header(
@@ -293,11 +297,11 @@ def run_biweekly_settlement(out_dir: str = "/tmp"):
       # 1) 엑셀 생성 & 슬랙 업로드
       if (s.seq in (10, 23)):
         fpath, summary = upload_file(
-          supply_id=sid, channel=ch, start=start, end=end
+          supply_id=sid, channel=ch, start=start, end=end, background=False
         )
       else:
         fpath, summary = upload_file_with_button(
-          supply_id=sid, channel=ch, start=start, end=end
+          supply_id=sid, channel=ch, start=start, end=end, background=False
         )
 
       # 2) 헤더 upsert (READY)
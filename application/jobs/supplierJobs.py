@@ -15,6 +15,7 @@ from sqlalchemy.exc import SQLAlchemyError
 
 from application.src.models import db
 from application.src.models.SupplierList import SupplierList
+from application.src.repositories.SupplierListRepository import SupplierListRepository
 from application.src.repositories.SupplierDetailRepository import SupplierDetailRepository
 from application.src.service.eformsign_service import after_slack_success
 from application.src.service.barobill_service import BaroBillClient, BaroBillError
@@ -136,6 +137,7 @@ def process_pending_suppliers(batch_size: int = 10, lock_key: str = "job_supplie
           s.channelId = channel_id
           s.stateCode = "A"
           db.session.commit()
+          SupplierListRepository.invalidate_channel_cache(channel_id)  # 재사용된 채널이면 이전 매핑 제거
           print(f"[{datetime.now()}] Slack 처리 성공 seq={s.seq} name={name} reused={reused} renamed={renamed} channel_id={channel_id}")
           need_contract = True
 
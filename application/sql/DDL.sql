@@ -30,6 +30,9 @@ ALTER TABLE SUPPLIER_LIST
   ADD COLUMN CONTRACT_SKIP TINYINT(1) DEFAULT 0 COMMENT '외부에서 이미 체결(발송 스킵)';
 ALTER TABLE SUPPLIER_LIST
   ADD COLUMN SETTLEMENT_PERIOD VARCHAR(10) NULL COMMENT '정산주기(D/W/M)';
+-- eformsign 웹훅: 이메일 기준 최신(SEQ DESC) 공급사 조회용 인덱스
+ALTER TABLE SUPPLIER_LIST
+  ADD INDEX IDX_SUPPLIER_EMAIL (`EMAIL`, `SEQ`);
 
 -- Cafe24 웹훅 이벤트 저장 테이블
 CREATE TABLE IF NOT EXISTS webhook_events (
@@ -18,6 +18,8 @@ class Config:
   # SQLAlchemy DB URI (DatabaseConfig에서 가져오기)
   SQLALCHEMY_DATABASE_URI = DatabaseConfig.getUri()
   SQLALCHEMY_TRACK_MODIFICATIONS = False
+  # 목록 조회에서 로드하지 않은 컬럼/관계 접근 시 지연 로딩 대신 예외 (개발/테스트에서 N+1 회귀 감지용)
+  SQL_RAISELOAD = os.getenv("SQL_RAISELOAD", "false").lower() == "true"
 
   # 기타 설정
   SCHEDULER_API_ENABLED = True  # Flask-APScheduler 사용 옵션
@@ -10,6 +10,10 @@ class SupplierList(db.Model):
   공급사 정보 테이블 (SUPPLIER_LIST) 모델
   """
   __tablename__ = "SUPPLIER_LIST"
+  __table_args__ = (
+    db.Index("IDX_SUPPLIER_EMAIL", "EMAIL", "seq"),  # eformsign 웹훅: 이메일 기준 최신 공급사 조회
+    db.Index("IDX_SUPPLIER_STATE", "STATE_CODE", "seq"),  # 승인 대기/반려 목록: 상태 필터 + seq 역순 페이지네이션/건수
+  )
 
   # 기본 키 (AUTO_INCREMENT)
   seq: Mapped[int] = mapped_column(db.Integer, primary_key=True, autoincrement=True, comment="SEQ")
@@ -11,6 +11,16 @@ class OAuthTokenRepository:
     stmt = select(OAuthToken).where(OAuthToken.provider == provider)
     return db.session.execute(stmt).scalar_one_or_none()
 
+  @staticmethod
+  def get_for_update(provider: str) -> Optional[OAuthToken]:
+    """
+    토큰 행을 SELECT ... FOR UPDATE 로 잠가서 조회.
+    - 여러 프로세스가 동시에 refresh_token 을 소모하지 않도록 갱신 구간을 직렬화
+    - 잠금은 commit/rollback 시 해제된다
+    """
+    stmt = select(OAuthToken).where(OAuthToken.provider == provider).with_for_update()
+    return db.session.execute(stmt).scalar_one_or_none()
+
   @staticmethod
   def upsert_refresh(provider: str, refresh_token: str, mall_id: Optional[str] = None, scope: Optional[str] = None) -> OAuthToken:
     tok = OAuthTokenRepository.get(provider)
@@ -51,6 +61,23 @@ class OAuthTokenRepository:
     db.session.commit()
     return tok
 
+  @staticmethod
+  def save_refreshed(provider: str, access_token: str, expires_at: Optional[datetime] = None,
+                     refresh_token: Optional[str] = None, scope: Optional[str] = None) -> OAuthToken:
+    """
+    갱신 결과(access/refresh)를 한 번의 commit 으로 저장.
+    - get_for_update 로 잡은 잠금이 두 토큰이 모두 저장된 뒤에 풀리도록 한다
+    """
+    tok = OAuthTokenRepository.get(provider)
+    tok.accessToken = access_token
+    tok.expiresAt = expires_at
+    if refresh_token:
+      tok.refreshToken = refresh_token
+    if scope is not None:
+      tok.scope = scope
+    db.session.commit()
+    return tok
+
   @staticmethod
   def load_refresh(provider: str) -> Optional[str]:
     tok = OAuthTokenRepository.get(provider)
@@ -1,8 +1,12 @@
 # application/src/repositories/SupplierListRepository.py
-from typing import Optional, List, Dict, Any
-from sqlalchemy import select, update, or_, and_
+import os, time, threading
+from typing import Optional, List, Dict, Any, Tuple
+from sqlalchemy import select, update, or_, and_, func, inspect
+from sqlalchemy.orm import load_only, raiseload
+from flask import current_app
 from application.src.models import db
 from application.src.models.SupplierList import SupplierList
+from application.src.models.SupplierDetail import SupplierDetail
 
 # ✅ 상태 코드 상수
 STATE_PENDING  = "R"   # 승인 대기
@@ -10,6 +14,50 @@ STATE_APPROVED = "RA"  # 승인 완료
 STATE_REJECTED = "RR"  # 반려
 STATE_DELETED = "D"    # 삭제
 
+# 채널 → (supplierCode, companyName) 캐시 (channel_id -> {"value": ..., "expires_at": ...})
+#  - 슬랙 커맨드마다 DB 조회하지 않도록 값(튜플)만 보관 (ORM 객체는 세션 밖으로 내보내지 않음)
+#  - 매핑이 없는 채널은 캐시하지 않음 (새로 연결된 채널이 바로 반영되도록)
+#  - save / update_channel_and_state 에서 무효화
+CHANNEL_SUPPLIER_CACHE_TTL_SEC = int(os.getenv("CHANNEL_SUPPLIER_CACHE_TTL_SEC", "300"))
+_channel_supplier_cache: Dict[str, Dict[str, Any]] = {}
+_channel_supplier_lock = threading.Lock()
+
+def _approved_cond():
+  # 승인 목록 조건: 상태 없음 또는 대기/반려가 아닌 공급사
+  return or_(
+    SupplierList.stateCode.is_(None),
+    (SupplierList.stateCode != STATE_PENDING) & (SupplierList.stateCode != STATE_REJECTED)
+  )
+
+# 목록 화면(_merge_supplier_with_detail)에서 쓰는 컬럼만 로드
+#  - 비밀번호/계약ID/정산주기/사업장 주소 등 목록에 안 쓰는 컬럼은 가져오지 않음
+_LIST_COLUMNS = (
+  SupplierList.companyName, SupplierList.supplierCode, SupplierList.stateCode,
+  SupplierList.channelId, SupplierList.contractStatus, SupplierList.supplierID,
+  SupplierList.supplierURL, SupplierList.manager, SupplierList.managerRank,
+  SupplierList.number, SupplierList.email, SupplierList.updatedAt,
+  SupplierList.contractTemplate, SupplierList.contractPercent, SupplierList.contractThreshold,
+  SupplierList.contractPercentUnder, SupplierList.contractPercentOver, SupplierList.contractSkip,
+)
+_LIST_DETAIL_COLUMNS = (
+  SupplierDetail.businessType, SupplierDetail.companyName, SupplierDetail.representativeName,
+  SupplierDetail.businessRegistrationNumber, SupplierDetail.companyEmail, SupplierDetail.companyPhone,
+  SupplierDetail.bankCode, SupplierDetail.accountNumber, SupplierDetail.holderName,
+  SupplierDetail.createdAt, SupplierDetail.updatedAt,
+)
+
+def _touched_channels(entity: SupplierList) -> set:
+  """
+  커밋 전에 호출: 현재 channelId 와, 이번에 바뀌었다면 이전 channelId 까지
+  (공급사가 다른 채널로 옮겨가면 이전 채널이 캐시에 남아 계속 이 공급사로 조회되지 않도록)
+  """
+  hist = inspect(entity).attrs.channelId.history
+  channels = {ch for ch in (*hist.added, *hist.unchanged, *hist.deleted) if ch}
+  current = getattr(entity, "channelId", None)  # 만료/미로드 상태면 history 가 비어 있음
+  if current:
+    channels.add(current)
+  return channels
+
 class SupplierListRepository:
   @staticmethod
   def rollback_if_needed():
@@ -32,7 +80,34 @@ class SupplierListRepository:
   def save(entity: SupplierList) -> SupplierList:
     if not getattr(entity, "seq", None):
       db.session.add(entity)
+    channels = _touched_channels(entity)
     db.session.commit()
+    SupplierListRepository._invalidate_channels(channels)
+    return entity
+
+  # ▶ 공급사 + 상세를 행 잠금과 함께 1회 조회 (수정 화면 저장용) → (SupplierList, SupplierDetail|None) | None
+  #   SELECT ... LEFT JOIN ... FOR UPDATE: 조회~커밋 사이 다른 요청의 동시 수정을 막음
+  @staticmethod
+  def find_with_detail_for_update(seq: int) -> Optional[Tuple[SupplierList, Optional[SupplierDetail]]]:
+    stmt = (
+      select(SupplierList, SupplierDetail)
+      .outerjoin(SupplierDetail, SupplierDetail.supplierSeq == SupplierList.seq)
+      .where(SupplierList.seq == seq)
+      .with_for_update()
+    )
+    row = db.session.execute(stmt).first()
+    return (row[0], row[1]) if row else None
+
+  # ▶ 공급사 + 상세 함께 저장 (커밋 1회)
+  @staticmethod
+  def save_with_detail(entity: SupplierList, detail: SupplierDetail) -> SupplierList:
+    if not getattr(entity, "seq", None):
+      db.session.add(entity)
+    if not getattr(detail, "id", None):
+      db.session.add(detail)
+    channels = _touched_channels(entity)
+    db.session.commit()
+    SupplierListRepository._invalidate_channels(channels)
     return entity
 
   @staticmethod
@@ -46,6 +121,8 @@ class SupplierListRepository:
       .values(**values)
     )
     db.session.commit()
+    # 채널이 다른 공급사에서 옮겨 왔을 수도 있으므로 전체 무효화
+    SupplierListRepository.invalidate_channel_cache()
 
   @staticmethod
   def update_state(seq: int, state_code: str) -> None:
@@ -73,10 +150,26 @@ class SupplierListRepository:
   def find_by_states(states: List[str], limit: int = 100, offset: int = 0):
     if not states:
       states = [STATE_PENDING]
-    stmt = select(SupplierList).where(SupplierList.stateCode.in_(states)).offset(offset).limit(limit)
+    # 정렬 기준이 없으면 페이지 경계가 DB 실행계획에 따라 흔들림 → PK 역순 고정
+    stmt = (
+      select(SupplierList)
+      .where(SupplierList.stateCode.in_(states))
+      .order_by(SupplierList.seq.desc())
+      .offset(offset)
+      .limit(limit)
+    )
     return db.session.execute(stmt).scalars().all()
 
-  # ▶ 일괄 상태 변경
+  # ▶ 상태코드 in 건수(페이지네이션 총계용)
+  @staticmethod
+  def count_by_states(states: List[str]) -> int:
+    if not states:
+      states = [STATE_PENDING]
+    stmt = select(func.count()).select_from(SupplierList).where(SupplierList.stateCode.in_(states))
+    return int(db.session.execute(stmt).scalar() or 0)
+
+  # ▶ 일괄 상태 변경 (UPDATE 1회, 변경 건수 반환)
+  #   - 세션에 로드된 객체와 동기화하지 않음 (직후 commit 으로 만료되므로 불필요한 identity map 순회 생략)
   @staticmethod
   def bulk_update_state(seqs: List[int], state_code: str) -> int:
     if not seqs:
@@ -84,7 +177,8 @@ class SupplierListRepository:
     res = db.session.execute(
       update(SupplierList)
       .where(SupplierList.seq.in_(seqs))
-      .values(stateCode=state_code)
+      .values(stateCode=state_code, updatedAt=func.now()),
+      execution_options={"synchronize_session": False},
     )
     db.session.commit()
     return res.rowcount
@@ -105,16 +199,71 @@ class SupplierListRepository:
     stmt = select(SupplierList).where(SupplierList.channelId == channel_id)
     return db.session.execute(stmt).scalar_one_or_none()
 
+  # ▶ 채널에 연결된 공급사의 (supplierCode, companyName) — TTL 캐시, 없으면 None
+  @staticmethod
+  def find_codes_by_channel_id_cached(channel_id: str) -> Optional[Tuple[Optional[str], Optional[str]]]:
+    if not channel_id:
+      return None
+
+    now = time.time()
+    with _channel_supplier_lock:
+      hit = _channel_supplier_cache.get(channel_id)
+      if hit and hit["expires_at"] > now:
+        return hit["value"]
+
+    supplier = SupplierListRepository.find_by_channel_id(channel_id)
+    if not supplier:
+      return None
+
+    value = (supplier.supplierCode, supplier.companyName)
+    with _channel_supplier_lock:
+      _channel_supplier_cache[channel_id] = {"value": value, "expires_at": now + CHANNEL_SUPPLIER_CACHE_TTL_SEC}
+    return value
+
+  @staticmethod
+  def _invalidate_channels(channels) -> None:
+    for ch in channels:
+      SupplierListRepository.invalidate_channel_cache(ch)
+
+  # ▶ 채널-공급사 캐시 무효화 (channel_id 미지정 시 전체)
+  @staticmethod
+  def invalidate_channel_cache(channel_id: Optional[str] = None) -> None:
+    with _channel_supplier_lock:
+      if channel_id is None:
+        _channel_supplier_cache.clear()
+      else:
+        _channel_supplier_cache.pop(channel_id, None)
+
   @staticmethod
   def findApproved(limit: int = 100):
-    stmt = select(SupplierList).where(
-      or_(
-        SupplierList.stateCode.is_(None),
-        (SupplierList.stateCode != STATE_PENDING) & (SupplierList.stateCode != STATE_REJECTED)
-      )
-    ).limit(limit)
+    stmt = select(SupplierList).where(_approved_cond()).limit(limit)
     return db.session.execute(stmt).scalars().all()
 
+  # ▶ 공급사 + 상세(LEFT JOIN 1회) → [(SupplierList, SupplierDetail|None)]
+  #   목록 화면에서 행마다 상세를 따로 조회하지 않도록 사용 (목록에 필요한 컬럼만 로드)
+  #   SQL_RAISELOAD=true 면 로드 안 한 컬럼/관계 접근 시 행마다 추가 SELECT 대신 예외
+  @staticmethod
+  def list_with_detail(approved_only: bool = False, limit: Optional[int] = None, offset: Optional[int] = None) -> List[Tuple[SupplierList, Optional[SupplierDetail]]]:
+    strict = bool(current_app.config.get("SQL_RAISELOAD"))
+    options = [
+      load_only(*_LIST_COLUMNS, raiseload=strict),
+      load_only(*_LIST_DETAIL_COLUMNS, raiseload=strict),
+    ]
+    if strict:
+      options.append(raiseload("*"))
+    stmt = (
+      select(SupplierList, SupplierDetail)
+      .outerjoin(SupplierDetail, SupplierDetail.supplierSeq == SupplierList.seq)
+      .options(*options)
+    )
+    if approved_only:
+      stmt = stmt.where(_approved_cond())
+    if offset:
+      stmt = stmt.offset(offset)
+    if limit is not None:
+      stmt = stmt.limit(limit)
+    return [(s, d) for s, d in db.session.execute(stmt).all()]
+
   # ✅ 신규: 계약 필드만 부분 업데이트(발송 큐/전자서명 훅에서 사용)
   @staticmethod
   def update_contract_fields(seq: int, fields: Dict[str, Any]) -> None:
@@ -153,8 +302,13 @@ class SupplierListRepository:
     :param editor_email: 공급사 담당자 이메일
     :return: SupplierList 또는 None
     """
-    stmt = select(SupplierList).where(SupplierList.email == editor_email)
-    return db.session.execute(stmt).scalar_one_or_none()
+    stmt = (
+      select(SupplierList)
+      .where(SupplierList.email == editor_email)
+      .order_by(SupplierList.seq.desc())
+      .limit(1)
+    )
+    return db.session.execute(stmt).scalars().first()
   
   @staticmethod  
   def find_by_settlement_period(period_code: str, limit: int = 100):
@@ -1,10 +1,11 @@
 # application/src/service/cafe24_oauth_service.py
 # -*- coding: utf-8 -*-
 
-import os, time, requests, base64
+import os, time, base64, threading
 from datetime import datetime, timedelta
 from typing import Optional
 from application.src.repositories.OAuthTokenRepository import OAuthTokenRepository
+from application.src.utils.http_utils import build_session
 
 PROVIDER = "cafe24"
 
@@ -14,6 +15,12 @@ CLIENT_SECRET   = os.getenv("CAFE24_CLIENT_SECRET")
 
 # 메모리 캐시 (access_token)
 _token_cache = {"access_token": None, "expires_at": 0.0}
+# 스케줄러/요청 스레드의 동시 갱신 방지 (refresh_token 로테이션 시 중복 갱신 방지)
+_refresh_lock = threading.Lock()
+# 만료까지 이 시간(초) 이내로 남으면 스케줄러가 미리 갱신
+REFRESH_MARGIN_SEC = 300
+
+_HTTP = build_session(pool_connections=2, pool_maxsize=8)
 
 def save_refresh_token(refresh_token: str, mall_id: Optional[str] = None, scope: Optional[str] = None):
   OAuthTokenRepository.upsert_refresh(PROVIDER, refresh_token, mall_id=mall_id, scope=scope)
@@ -34,7 +41,7 @@ def _refresh_access_token_with(rt: str) -> str:
   url = f"{CAFE24_BASE_URL}/api/v2/oauth/token"
   basic = base64.b64encode(f"{CLIENT_ID}:{CLIENT_SECRET}".encode("utf-8")).decode("utf-8")
 
-  resp = requests.post(
+  resp = _HTTP.post(
     url,
     headers={
       "Authorization": f"Basic {basic}",
@@ -44,7 +51,7 @@ def _refresh_access_token_with(rt: str) -> str:
       "grant_type": "refresh_token",
       "refresh_token": rt,
     },
-    timeout=10
+    timeout=(3.05, 10)
   )
   resp.raise_for_status()
   data = resp.json()
@@ -58,28 +65,76 @@ def _refresh_access_token_with(rt: str) -> str:
     scope = str(raw_scope) if raw_scope is not None else None
   expires_in  = int(data.get("expires_in", 7200))
 
-  # DB 저장/갱신
-  save_access_token(access, expires_in=expires_in, scope=scope)
-  if new_refresh:
-    save_refresh_token(new_refresh)
+  # DB 저장/갱신 (한 번의 commit → get_for_update 잠금 해제)
+  expires_at = datetime.utcnow() + timedelta(seconds=expires_in)
+  OAuthTokenRepository.save_refreshed(PROVIDER, access, expires_at=expires_at, refresh_token=new_refresh, scope=scope)
 
   # 캐시 (60초 여유)
   _token_cache["access_token"] = access
   _token_cache["expires_at"]   = time.time() + expires_in - 60
   return access
 
+def _refresh_under_row_lock(margin_sec: int) -> Optional[tuple]:
+  """
+  DB 토큰 행을 잠근 상태에서 만료 여부를 다시 확인하고 필요할 때만 갱신.
+  - _refresh_lock 은 프로세스 안에서만 유효하므로, 여러 프로세스(워커/스케줄러)가
+    같은 refresh_token 으로 동시에 갱신해 이미 소모된 토큰을 저장하는 것을 막는다
+  - 다른 프로세스가 먼저 갱신했으면 DB 의 access_token 을 캐시에 올리고 재사용
+  - 반환: (access_token, 갱신 여부) / refresh_token 이 없으면 None
+  """
+  try:
+    tok = OAuthTokenRepository.get_for_update(PROVIDER)
+    if tok is None or not tok.refreshToken:
+      OAuthTokenRepository.rollback_if_needed()
+      return None
+
+    if tok.accessToken and tok.expiresAt:
+      remaining = (tok.expiresAt - datetime.utcnow()).total_seconds()
+      if remaining > margin_sec:
+        access = tok.accessToken
+        OAuthTokenRepository.rollback_if_needed()  # 잠금 해제
+        _token_cache["access_token"] = access
+        _token_cache["expires_at"]   = time.time() + remaining - 60
+        return access, False
+
+    return _refresh_access_token_with(tok.refreshToken), True
+  except Exception:
+    OAuthTokenRepository.rollback_if_needed()
+    raise
+
 def get_access_token() -> str:
   """
   호출 시점에 유효한 access_token 반환.
   - 캐시에 유효한 토큰이 있으면 그대로 사용
   - 없으면 DB의 refresh_token으로 갱신
   """
-  now = time.time()
-  if _token_cache["access_token"] and _token_cache["expires_at"] > now:
+  if _token_cache["access_token"] and _token_cache["expires_at"] > time.time():
     return _token_cache["access_token"]
 
-  rt = load_refresh_token()
-  if not rt:
-    raise RuntimeError("Cafe24 refresh_token not found in DB. Run OAuth install/authorize first.")
+  # 평소엔 스케줄러가 미리 갱신 → 여기는 시계 오차 등으로 놓친 경우의 폴백
+  with _refresh_lock:
+    if _token_cache["access_token"] and _token_cache["expires_at"] > time.time():
+      return _token_cache["access_token"]
+
+    result = _refresh_under_row_lock(margin_sec=60)
+    if result is None:
+      raise RuntimeError("Cafe24 refresh_token not found in DB. Run OAuth install/authorize first.")
+
+    return result[0]
+
+def refresh_access_token_if_expiring(margin_sec: int = REFRESH_MARGIN_SEC) -> bool:
+  """
+  (스케줄러용) access_token 만료가 margin_sec 이내면 미리 갱신.
+  - 웹훅/요청 경로에서 토큰 갱신 왕복이 발생하지 않도록 한다
+  - 갱신했으면 True, 아직 여유가 있거나(다른 프로세스가 이미 갱신한 경우 포함)
+    refresh_token 이 없으면 False
+  """
+  with _refresh_lock:
+    if _token_cache["access_token"] and _token_cache["expires_at"] - time.time() > margin_sec:
+      return False
+
+    result = _refresh_under_row_lock(margin_sec)
+    if result is None:
+      return False
 
-  return _refresh_access_token_with(rt)
+    return result[1]
@@ -1,8 +1,8 @@
 # application/src/service/cafe24_webhook_service.py
 # -*- coding: utf-8 -*-
 from __future__ import annotations
-import os, json, hashlib, hmac
-from typing import Dict, Any, Optional
+import os, json, hashlib, hmac, base64
+from typing import Dict, Any, Optional, Mapping
 from datetime import datetime
 from flask import current_app
 
@@ -22,6 +22,7 @@ class Cafe24WebhookService:
   """
   def __init__(self):
     self.secret = os.getenv("CAFE24_CLIENT_SECRET", "")  # 없으면 검증 생략
+    self._secret_key = self.secret.encode("utf-8")  # HMAC 키 (매 요청 인코딩 방지)
     self.orders = Cafe24OrdersService()
     self.products = Cafe24ProductsService()
     self.suppliers = Cafe24SuppliersService()
@@ -49,7 +50,7 @@ class Cafe24WebhookService:
     except Exception:
       return None
 
-  def _topic_from(self, headers: Dict[str, str], payload: Dict[str, Any]) -> str:
+  def _topic_from(self, headers: Mapping[str, str], payload: Dict[str, Any]) -> str:
     # 헤더 우선, 없으면 resource.event_code → payload.topic → unknown
     x = headers.get("X-Cafe24-Topic")
     if x: return x
@@ -57,21 +58,20 @@ class Cafe24WebhookService:
     return r.get("event_code") or payload.get("topic") or "unknown"
 
   # ---------- 시그니처 ----------
-  def _sig_ok(self, raw: bytes, headers: Dict[str, str]) -> bool:
+  def _sig_ok(self, raw: bytes, headers: Mapping[str, str]) -> bool:
     if not self.secret:
       return True  # 초기엔 검증 생략
     header_sig = headers.get("X-Cafe24-Hmac-Sha256") or headers.get("X-Cafe24-Signature")
     if not header_sig:
       return False
     # cafe24 쪽 서명 포맷(HEX/B64)은 환경에 따라 다를 수 있음 → 우선 hex 비교
-    mac_hex = hmac.new(self.secret.encode("utf-8"), raw, hashlib.sha256).hexdigest()
+    mac = hmac.new(self._secret_key, raw, hashlib.sha256).digest()
     try:
       # 우선 hex 비교
-      if hmac.compare_digest(mac_hex, header_sig):
+      if hmac.compare_digest(mac.hex(), header_sig):
         return True
       # 혹시 base64 로 오는 경우 대비(간단 비교)
-      import base64
-      mac_b64 = base64.b64encode(bytes.fromhex(mac_hex)).decode("utf-8")
+      mac_b64 = base64.b64encode(mac).decode("utf-8")
       return hmac.compare_digest(mac_b64, header_sig)
     except Exception:
       return False
@@ -82,7 +82,7 @@ class Cafe24WebhookService:
     return hashlib.sha256(base.encode("utf-8")).hexdigest()[:64]
 
   # ---------- DB 저장(옵션) ----------
-  def _maybe_persist(self, raw: bytes, headers: Dict[str, str], payload: Dict[str, Any], event_no: Optional[int], topic: str):
+  def _maybe_persist(self, raw: bytes, headers: Mapping[str, str], payload: Dict[str, Any], event_no: Optional[int], topic: str):
     if not WebhookEventRepository:
       return {"persisted": False, "dup": False}
 
@@ -120,7 +120,10 @@ class Cafe24WebhookService:
       return {"persisted": False, "dup": False}
 
   # ---------- 메인 엔트리 ----------
-  def handle_event(self, raw: bytes, headers: Dict[str, str], remote_ip: str) -> Dict[str, Any]:
+  def handle_event(self, raw: bytes, headers: Mapping[str, str], remote_ip: str) -> Dict[str, Any]:
+    """
+    headers: 대소문자 무시 조회가 되는 매핑 (werkzeug EnvironHeaders 그대로 전달 가능)
+    """
     try:
       payload = json.loads(raw.decode("utf-8") or "{}")
     except Exception:
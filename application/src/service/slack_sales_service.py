@@ -1,4 +1,4 @@
-# application/src/service/sales_service.py
+# application/src/service/slack_sales_service.py
 # -*- coding: utf-8 -*-
 """
 /sales 집계 로직
@@ -14,16 +14,32 @@
 """
 import os
 import time
+import logging
+import threading
 from typing import Dict, Any, List, Tuple, Optional, Iterable
 from decimal import Decimal
 from datetime import date
 import requests
 
 from application.src.service.cafe24_oauth_service import get_access_token
+from application.src.utils.http_utils import build_session
 
 CAFE24_BASE_URL = os.getenv("CAFE24_BASE_URL", "").rstrip("/")
 COMMISSION_RATE = float(os.getenv("SETTLEMENT_COMMISSION_RATE", "0.15"))
+_logger = logging.getLogger("slack.sales")
+
 DATE_TYPE = os.getenv("CAFE24_DATE_TYPE", "order_date")  # "pay_date" 가능
+SALES_SUMMARY_CACHE_TTL_SEC = int(os.getenv("SALES_SUMMARY_CACHE_TTL_SEC", "60"))
+
+# 카페24 조회용 공용 세션 (/sales 한 번에 수십 페이지 GET → TLS 커넥션 재사용)
+#  - 재시도는 _safe_get 루프가 담당하므로 어댑터 재시도는 끔
+_HTTP = build_session(pool_connections=1, pool_maxsize=8, retries=0, status_forcelist=())
+
+# /sales 집계 메모리 캐시 (같은 채널/기간 연속 조회 시 카페24 전체 재스캔 생략)
+#   (supply_id, start, end) → {summary, expires_at}
+_SUMMARY_CACHE_MAX = 256
+_summary_cache: Dict[Tuple[Optional[str], date, date], Dict[str, Any]] = {}
+_summary_lock = threading.Lock()
 
 
 # -------------------- 유틸 --------------------
@@ -40,16 +56,16 @@ def _to_int(v) -> int:
 def _safe_get(url: str, params: Dict[str, Any], token: str, tries: int = 6, tag: str = "-") -> requests.Response:
   for i in range(1, tries + 1):
     try:
-      print(f"[sales:{tag}] GET {url} try={i}/{tries} params={params}")
-      r = requests.get(url, headers={"Authorization": f"Bearer {token}"}, params=params, timeout=25)
+      _logger.debug("[sales:%s] GET %s try=%d/%d params=%s", tag, url, i, tries, params)
+      r = _HTTP.get(url, headers={"Authorization": f"Bearer {token}"}, params=params, timeout=25)
       if r.status_code == 429:
         ra = int(r.headers.get("Retry-After", "1"))
         time.sleep(max(1, ra)); continue
       r.raise_for_status()
-      print(f"[sales:{tag}] OK {url} status={r.status_code} bytes={len(r.content)}")
+      _logger.debug("[sales:%s] OK %s status=%s bytes=%d", tag, url, r.status_code, len(r.content))
       return r
     except Exception as e:
-      print(f"[sales:{tag}] ERROR {url} ({e})")
+      _logger.warning("[sales:%s] ERROR %s (%s)", tag, url, e)
       if i == tries: raise
       time.sleep(1.2 * i)
   raise RuntimeError(f"[sales:{tag}] GET exhausted: {url}")
@@ -85,13 +101,13 @@ def fetch_sales_summary(start_date: date, end_date: date, supply_id: Optional[st
   """
   tag = hex(abs(hash(f"{start_date}-{end_date}-{supply_id}-{time.time()}")))[2:10]
   s = start_date.isoformat(); e = end_date.isoformat()
-  print(f"[sales:{tag}] fetch_sales_summary {s}~{e} supplier_id={supply_id}")
+  _logger.info("[sales:%s] fetch_sales_summary %s~%s supplier_id=%s", tag, s, e, supply_id)
 
   token = get_access_token()
 
   # 1) 총 주문 수(페이지 계획용)
   orders_count = _fetch_orders_count(s, e, supply_id, tag)
-  print(f"[sales:{tag}] COUNT result={orders_count}")
+  _logger.debug("[sales:%s] COUNT result=%s", tag, orders_count)
   if orders_count == 0:
     summary = {
       "orders": 0, "orders_sold": 0, "orders_canceled": 0,
@@ -99,7 +115,7 @@ def fetch_sales_summary(start_date: date, end_date: date, supply_id: Optional[st
       "shipping_amount": 0, "commission_amount": 0, "net_amount": 0,
       "items": 0, "items_sold": 0, "items_canceled": 0
     }
-    print(f"[sales:{tag}] SUMMARY {summary}")
+    _logger.debug("[sales:%s] SUMMARY %s", tag, summary)
     return summary
 
   # 2) 주문/아이템 스캔(한 번에 총/취소/판매/수량/주문수까지 계산)
@@ -109,7 +125,11 @@ def fetch_sales_summary(start_date: date, end_date: date, supply_id: Optional[st
   sale_amount = max(gross - cancel_amount, 0)
 
   # 3) 배송비(비취소 주문만, 주문당 1회)
-  shipping_amount = _sum_shipping_amount(s, e, supply_id, tag)
+  #    주문 스캔에서 canceled 필드로 함께 합산 → 없을 때만 별도 조회
+  if scan["shipping_known"]:
+    shipping_amount = scan["shipping"]
+  else:
+    shipping_amount = _sum_shipping_amount(s, e, supply_id, tag)
 
   # 4) 수수료/정산금액
   commission_amount = int(round(sale_amount * COMMISSION_RATE))
@@ -132,7 +152,35 @@ def fetch_sales_summary(start_date: date, end_date: date, supply_id: Optional[st
     "items_sold": scan["qty_sold"],
     "items_canceled": scan["qty_canceled"],
   }
-  print(f"[sales:{tag}] SUMMARY {summary}")
+  _logger.debug("[sales:%s] SUMMARY %s", tag, summary)
+  return summary
+
+
+def fetch_sales_summary_cached(start_date: date, end_date: date, supply_id: Optional[str] = None) -> Dict[str, Any]:
+  """
+  fetch_sales_summary 의 TTL 캐시 버전 (프로세스 로컬)
+  - TTL: SALES_SUMMARY_CACHE_TTL_SEC (0 이면 캐시 안 함)
+  - 호출부가 수정해도 캐시가 오염되지 않도록 사본 반환
+  """
+  if SALES_SUMMARY_CACHE_TTL_SEC <= 0:
+    return fetch_sales_summary(start_date, end_date, supply_id=supply_id)
+
+  key = (supply_id, start_date, end_date)
+  now = time.time()
+  with _summary_lock:
+    hit = _summary_cache.get(key)
+    if hit and hit["expires_at"] > now:
+      return dict(hit["summary"])
+
+  summary = fetch_sales_summary(start_date, end_date, supply_id=supply_id)
+  with _summary_lock:
+    if len(_summary_cache) >= _SUMMARY_CACHE_MAX:
+      # 만료 항목 정리 후에도 가득 차 있으면 가장 오래된 항목 제거
+      for k in [k for k, v in _summary_cache.items() if v["expires_at"] <= now]:
+        del _summary_cache[k]
+      if len(_summary_cache) >= _SUMMARY_CACHE_MAX:
+        _summary_cache.pop(next(iter(_summary_cache)))
+    _summary_cache[key] = {"summary": dict(summary), "expires_at": now + SALES_SUMMARY_CACHE_TTL_SEC}
   return summary
 
 
@@ -156,6 +204,7 @@ def _collect_items_from_orders(
   - items.payment_amount 합산: gross / cancel_gross (주문 분류에 따라)
   - 수량 합산: qty_total / qty_sold / qty_canceled
   - 주문수: orders_sold / orders_canceled (해당 공급사 품목이 1개라도 포함된 주문만 카운트)
+  - 배송비: canceled=F 주문의 주문당 배송비 합 (모든 주문에 canceled 필드가 있을 때만 shipping_known=True)
   * fields 사용, 누락/빈아이템이면 fields 제거 폴백
   """
   token = get_access_token()
@@ -172,6 +221,9 @@ def _collect_items_from_orders(
   seen_sold = set()
   seen_canceled = set()
 
+  shipping = 0
+  shipping_known = True
+
   item_fields = ",".join([
     "order_item_code","quantity","payment_amount",
     "product_price","option_price","additional_discount_price",
@@ -181,7 +233,7 @@ def _collect_items_from_orders(
   base_params = {
     "start_date": s, "end_date": e, "date_type": DATE_TYPE,
     "embed": "items",
-    "fields": f"order_id,shipping_fee,shipping_fee_detail,items({item_fields})"
+    "fields": f"order_id,canceled,shipping_fee,shipping_fee_detail,items({item_fields})"
   }
   if supplier_id: base_params["supplier_id"] = supplier_id
 
@@ -193,7 +245,7 @@ def _collect_items_from_orders(
     r = _safe_get(url, params, token, tag=tag)
     data = r.json() or {}
     orders = data.get("orders") or []
-    print(f"[sales:{tag}] LIST got={len(orders)} offset={offset}")
+    _logger.debug("[sales:%s] LIST got=%d offset=%d", tag, len(orders), offset)
 
     # 폴백 조건: 주문 없음 or 배치 아이템 합 0 or 배송비/결제액 필드 부족
     batch_items_count = sum(len(o.get("items") or []) for o in orders)
@@ -205,7 +257,7 @@ def _collect_items_from_orders(
         need_fallback = True
 
     if need_fallback:
-      print(f"[sales:{tag}] items/shipfee missing or empty({batch_items_count}) → fallback WITHOUT fields")
+      _logger.info("[sales:%s] items/shipfee missing or empty(%s) → fallback WITHOUT fields", tag, batch_items_count)
       fb = {
         "start_date": s, "end_date": e, "date_type": DATE_TYPE,
         "embed": "items", "limit": to_fetch, "offset": offset
@@ -222,6 +274,13 @@ def _collect_items_from_orders(
       shipfee = _order_shipping_fee(o)
       is_canceled_order = (_to_int(shipfee) == 0)
 
+      # 비취소(canceled=F) 주문 배송비 (_sum_shipping_amount 와 같은 기준)
+      canceled_flag = o.get("canceled")
+      if canceled_flag is None:
+        shipping_known = False
+      elif canceled_flag == "F":
+        shipping += shipfee
+
       order_has_supplier_item = False
 
       for it in (o.get("items") or []):
@@ -260,7 +319,7 @@ def _collect_items_from_orders(
     if len(orders_src) < to_fetch: break
     offset += len(orders_src)
     if offset > max_offset:
-      print(f"[sales:{tag}] WARNING offset>15000, remaining orders will be skipped")
+      _logger.warning("[sales:%s] offset>15000, remaining orders will be skipped", tag)
       break
 
   result = {
@@ -274,8 +333,11 @@ def _collect_items_from_orders(
 
     "gross": int(gross),
     "cancel_gross": int(cancel_gross),
+
+    "shipping": int(shipping),
+    "shipping_known": shipping_known and fetched >= count,
   }
-  print(f"[sales:{tag}] COLLECT {result}")
+  _logger.debug("[sales:%s] COLLECT %s", tag, result)
   return result
 
 
@@ -290,7 +352,7 @@ def _sum_shipping_amount(s: str, e: str, supplier_id: Optional[str], tag: str) -
   total = _to_int((r_cnt.json() or {}).get("count"))
 
   if total == 0:
-    print(f"[sales:{tag}] SHIP no orders")
+    _logger.debug("[sales:%s] SHIP no orders", tag)
     return 0
 
   url = f"{CAFE24_BASE_URL}/api/v2/admin/orders"
@@ -314,5 +376,5 @@ def _sum_shipping_amount(s: str, e: str, supplier_id: Optional[str], tag: str) -
     offset += len(orders)
     if len(orders) < to_fetch: break
 
-  print(f"[sales:{tag}] SHIP_AMOUNT total={acc}")
+  _logger.debug("[sales:%s] SHIP_AMOUNT total=%s", tag, acc)
   return int(acc)
@@ -18,24 +18,37 @@ Slack 공통 유틸 모듈 (WebClient 싱글톤 보유)
 from __future__ import annotations
 
 import os
+import json
 import time
-import logging, threading, traceback
+import logging, threading
 from typing import Optional, Iterable, Union, Dict, Any, Tuple
-from flask import current_app
 from datetime import date, datetime
 
 from slack_sdk import WebClient as _SlackClient
 from slack_sdk.errors import SlackApiError
 
 from application.src.service.settlement_service import make_settlement_excel, prev_month_range
+from application.jobs.background import submit
+from application.src.utils.http_utils import build_session
+from application.src.utils.format_utils import fmt_currency
 
 _logger = logging.getLogger("slack.utils")
 
 # 이 모듈이 '주도적으로' 보유하는 WebClient 싱글톤
 _CLIENT: Optional[_SlackClient] = None
+_CLIENT_LOCK = threading.Lock()  # 백그라운드 스레드 동시 생성 방지
 
 # ========= 환경변수 =========
 SLACK_BOT_TOKEN = os.getenv("SLACK_BOT_TOKEN")
+CHANNEL_ID_CACHE_TTL_SEC = int(os.getenv("SLACK_CHANNEL_ID_CACHE_TTL_SEC", "600"))
+
+# 채널명 → ID 캐시 (name -> {"id": ..., "expires_at": ...})
+_channel_id_cache: Dict[str, Dict[str, Any]] = {}
+_channel_id_lock = threading.Lock()
+
+# 파일 업로드용 공용 세션 (files.slack.com 업로드 URL 로 keep-alive 재사용)
+_UPLOAD_HTTP = build_session(pool_connections=1, pool_maxsize=4)
+_UPLOAD_TIMEOUT = (3.05, 60)
 
 # =============================================================================
 # 클라이언트 생성/반환
@@ -58,7 +71,9 @@ def ensure_client() -> _SlackClient:
   """
   global _CLIENT
   if _CLIENT is None:
-    _CLIENT = _build_client_from_env()
+    with _CLIENT_LOCK:
+      if _CLIENT is None:
+        _CLIENT = _build_client_from_env()
   return _CLIENT
 
 
@@ -76,7 +91,8 @@ def reset_client() -> None:
   - 환경 변수 변경 후 재생성하고 싶을 때 사용.
   """
   global _CLIENT
-  _CLIENT = None
+  with _CLIENT_LOCK:
+    _CLIENT = None
 
 
 # =============================================================================
@@ -97,13 +113,6 @@ def _sleep_if_rate_limited(e: SlackApiError) -> bool:
   except Exception:
     pass
   return False
-def _fmt_currency(value):
-  try:
-    if value in (None, "", "None"):
-      return "0원"
-    return f"{int(float(str(value).replace(',', '') )):,}원"
-  except Exception:
-    return f"{value}원"
 
 
 # =============================================================================
@@ -118,6 +127,13 @@ def resolve_channel_id_by_name(name: str) -> Optional[str]:
   if not name:
     return None
 
+  # 캐시 조회 (매 메시지마다 conversations.list 페이지를 훑지 않도록)
+  now = time.time()
+  with _channel_id_lock:
+    cached = _channel_id_cache.get(name)
+    if cached and cached["expires_at"] > now:
+      return cached["id"]
+
   cli = ensure_client()
   cursor = None
   types = "public_channel,private_channel"
@@ -133,7 +149,11 @@ def resolve_channel_id_by_name(name: str) -> Optional[str]:
 
     for ch in resp.get("channels", []):
       if ch.get("name") == name:
-        return ch.get("id")
+        ch_id = ch.get("id")
+        if ch_id:
+          with _channel_id_lock:
+            _channel_id_cache[name] = {"id": ch_id, "expires_at": now + CHANNEL_ID_CACHE_TTL_SEC}
+        return ch_id
 
     cursor = resp.get("response_metadata", {}).get("next_cursor")
     if not cursor:
@@ -172,6 +192,35 @@ def post_text(channel: str, text: str, thread_ts: Optional[str] = None) -> bool:
   return False
 
 
+def post_blocks(channel: str, blocks: list, text: str, thread_ts: Optional[str] = None) -> bool:
+  """
+  Block Kit 메시지 전송. 여러 문단을 한 번의 chat.postMessage 로 보낼 때 사용.
+  - text 는 알림/접근성용 대체 텍스트
+  """
+  if not channel or not blocks:
+    return False
+
+  cli = ensure_client()
+  if channel.startswith("#"):
+    ch_id = resolve_channel_id_by_name(channel.lstrip("#"))
+    channel = ch_id or channel.lstrip("#")
+
+  for _ in range(2):
+    try:
+      payload = {"channel": channel, "text": text, "blocks": blocks}
+      if thread_ts:
+        payload["thread_ts"] = thread_ts
+      cli.chat_postMessage(**payload)
+      return True
+    except SlackApiError as e:
+      if _sleep_if_rate_limited(e):
+        continue
+      _logger.error(f"[post-blocks-fail] ch={channel} err={getattr(e, 'response', {}).get('data', {})}")
+      return False
+
+  return False
+
+
 # =============================================================================
 # 채널 관리 (생성/아카이브/언아카이브/이름 변경)
 # =============================================================================
@@ -267,6 +316,10 @@ def rename_channel(channel: str, new_name: str) -> bool:
   for _ in range(2):
     try:
       cli.conversations_rename(channel=channel, name=new_name)
+      # 이전 이름으로 캐시된 항목 제거
+      with _channel_id_lock:
+        for k in [k for k, v in _channel_id_cache.items() if v["id"] == channel]:
+          _channel_id_cache.pop(k, None)
       return True
     except SlackApiError as e:
       if _sleep_if_rate_limited(e):
@@ -289,7 +342,6 @@ def _build_settlement_button_blocks(payload: Dict[str, Any]) -> list:
   '정산 확정하기' 버튼 블록.
   - value에는 문자열만 가능하므로 compact JSON 문자열로 인코딩해서 담는다.
   """
-  import json
   btn_text = payload.get("button_text") or "정산 확정하기"
 
   value_json = json.dumps({
@@ -315,176 +367,196 @@ def _build_settlement_button_blocks(payload: Dict[str, Any]) -> list:
     }
   ]
 
+def _upload_file_external(cli, channel_id: str, fpath: str, title: str, initial_comment: str):
+  """
+  files.getUploadURLExternal → 업로드 URL 로 파일 스트리밍 → files.completeUploadExternal.
+  - files_upload_v2 와 같은 흐름이지만 파일을 메모리에 통째로 읽지 않고 핸들째 전송
+  - 업로드 HTTP 는 공용 세션(_UPLOAD_HTTP) 재사용
+  - 응답은 completeUploadExternal 결과 (files[0].id 로 file_id 확인)
+  """
+  url_resp = cli.files_getUploadURLExternal(
+    filename=os.path.basename(fpath),
+    length=os.path.getsize(fpath),
+  )
+  with open(fpath, "rb") as fh:
+    r = _UPLOAD_HTTP.post(url_resp["upload_url"], data=fh, timeout=_UPLOAD_TIMEOUT)
+  r.raise_for_status()
+  return cli.files_completeUploadExternal(
+    files=[{"id": url_resp["file_id"], "title": title}],
+    channel_id=channel_id,
+    initial_comment=initial_comment,
+  )
+
 def upload_file(
   supply_id: Optional[str] = None,
   channel: Optional[str] = None,
   start: Optional[str] = None,
   end: Optional[str] = None,
+  background: bool = True,
 ) -> Tuple[str, Dict[str, Any]]:
   """
-  단일 채널 파일 업로드(files.uploadV2).
+  단일 채널 파일 업로드(getUploadURLExternal → completeUploadExternal).
+  - background=True : 업로드는 공용 풀에 넘기고 바로 반환 (요청 스레드용)
+  - background=False: 호출 스레드에서 업로드까지 마치고 반환, 실패 시 예외 (풀 작업/배치용)
   """
   fpath, summary = make_settlement_excel(start, end, supply_id=supply_id, out_dir="/tmp")
-  print(f"[slash:/settlement] excel_ready path={fpath} summary={summary} supply_code={supply_id}")
+  _logger.debug("[slash:/settlement] excel_ready path=%s summary=%s supply_code=%s", fpath, summary, supply_id)
   
-  def _bg(app):
-    with app.app_context():
-      try:
-        cli = ensure_client()
-        
-        initial_comment = (
-          f"*정산서 업로드 완료*\n기간: {start} ~ {end}\n"
-          f"배송완료 {summary['delivered_rows']}건 · 취소처리 {summary['canceled_rows']}건\n"
-          f"- *총 상품 결제 금액: {_fmt_currency(summary.get('gross_amount',0))}*\n"
-          f"- *배송비: {_fmt_currency(summary.get('shipping_amount',0))}*\n"
-          f"- *수수료: {_fmt_currency(summary.get('commission_amount',0))}*\n"
-          f"- *총 합계 금액: {_fmt_currency(summary.get('final_amount',0))}*"
-        )
-        cli.files_upload_v2(
-          channel=channel,  # 단수
-          file=fpath,
-          filename=os.path.basename(fpath),
-          title=f"{start:%Y-%m} 정산서",
-          initial_comment=initial_comment
-        )
-      except Exception as e:
-        traceback.print_exc()
-          
-  app_obj = current_app._get_current_object()
-  t = threading.Thread(target=_bg, args=(app_obj,), daemon=True)
-  t.start()
+  def _send():
+    cli = ensure_client()
+    
+    initial_comment = (
+      f"*정산서 업로드 완료*\n기간: {start} ~ {end}\n"
+      f"배송완료 {summary['delivered_rows']}건 · 취소처리 {summary['canceled_rows']}건\n"
+      f"- *총 상품 결제 금액: {fmt_currency(summary.get('gross_amount',0))}*\n"
+      f"- *배송비: {fmt_currency(summary.get('shipping_amount',0))}*\n"
+      f"- *수수료: {fmt_currency(summary.get('commission_amount',0))}*\n"
+      f"- *총 합계 금액: {fmt_currency(summary.get('final_amount',0))}*"
+    )
+    _upload_file_external(
+      cli, channel, fpath,
+      title=f"{start:%Y-%m} 정산서",
+      initial_comment=initial_comment,
+    )
+
+  if not background:
+    # 이미 풀/배치 스레드에서 호출된 경우: 여기서 바로 업로드하고 오류는 호출자에게 전달
+    _send()
+    return fpath, summary
+
+  def _bg():
+    try:
+      _send()
+    except Exception:
+      _logger.exception("[upload_file] upload failed ch=%s", channel)
+
+  submit(_bg)
   
   return fpath, summary
 
+def _wait_file_message_ts(cli, channel_id: str, file_id: str, *, timeout_sec: int = 20, interval: float = 0.8) -> Optional[str]:
+  """
+  채널 히스토리에서 file_id를 포함한 메시지를 찾고 ts를 반환.
+  """
+  deadline = time.time() + timeout_sec
+  while time.time() < deadline:
+    try:
+      hist = cli.conversations_history(channel=channel_id, limit=50)
+      for msg in hist.get("messages", []):
+        files = msg.get("files") or []
+        for f in files:
+          if f.get("id") == file_id:
+            return msg.get("ts")
+    except Exception:
+      pass
+    time.sleep(interval)
+  return None
+
+def _ensure_channel_id(ch: str) -> str:
+  # 이미 ID면 그대로, '#name'이나 'name'이면 lookup (캐시된 resolve_channel_id_by_name 사용)
+  if ch and ch.startswith(("C", "G")) and len(ch) >= 9:
+    return ch
+  return resolve_channel_id_by_name(ch.lstrip("#")) or ch  # 실패 시 원본 반환
+
 # slack_service.py 내 교체
 def upload_file_with_button(
   supply_id: Optional[str] = None,
   channel: Optional[str] = None,
   start: Optional[str] = None,
   end: Optional[str] = None,
+  background: bool = True,
 ) -> bool:
   """
-  files.uploadV2 → (파일 메시지 등장 대기) → 버튼 메시지(스레드) 전송
+  파일 업로드(getUploadURLExternal → completeUploadExternal) → (파일 메시지 등장 대기) → 버튼 메시지(스레드) 전송
   - conversations.history를 폴링해 업로드된 파일이 포함된 메시지의 ts를 찾는다.
   - 찾으면 thread_ts로 버튼 메시지를 달아 '파일 먼저 → 버튼' 순서를 보장.
+  - background 의미는 upload_file 과 동일 (풀/배치 스레드에서는 False 로 호출할 것)
   """
-  import os, time, traceback
-  from typing import Optional
-  from slack_sdk.errors import SlackApiError
   fpath, summary = make_settlement_excel(start, end, supply_id=supply_id, out_dir="/tmp")
-  print(f"[slash:/settlement] excel_ready path={fpath} summary={summary} supply_code={supply_id}")
-
-  def _wait_file_message_ts(cli, channel_id: str, file_id: str, *, timeout_sec: int = 20, interval: float = 0.8) -> Optional[str]:
-    """
-    채널 히스토리에서 file_id를 포함한 메시지를 찾고 ts를 반환.
-    """
-    deadline = time.time() + timeout_sec
-    while time.time() < deadline:
-      try:
-        hist = cli.conversations_history(channel=channel_id, limit=50)
-        for msg in hist.get("messages", []):
-          files = msg.get("files") or []
-          for f in files:
-            if f.get("id") == file_id:
-              return msg.get("ts")
-      except Exception:
-        pass
-      time.sleep(interval)
-    return None
+  _logger.debug("[slash:/settlement] excel_ready path=%s summary=%s supply_code=%s", fpath, summary, supply_id)
+
+  def _send():
+    cli = ensure_client()
+
+    channel_id = _ensure_channel_id(channel or "")
+    initial_comment = (
+      f"*정산서 업로드 완료*\n기간: {start} ~ {end}\n"
+      f"배송완료 {summary.get('delivered_rows',0)}건 · 취소처리 {summary.get('canceled_rows',0)}건\n"
+      f"- *총 상품 결제 금액: {fmt_currency(summary.get('gross_amount',0))}*\n"
+      f"- *배송비: {fmt_currency(summary.get('shipping_amount',0))}*\n"
+      f"- *수수료: {fmt_currency(summary.get('commission_amount',0))}*\n"
+      f"- *총 합계 금액: {fmt_currency(summary.get('final_amount',0))}*"
+    )
+
+    # 1) 파일 업로드
+    up = _upload_file_external(
+      cli, channel_id, fpath,
+      title=f"{start} ~ {end} 정산서",
+      initial_comment=initial_comment,
+    )
+
+    # file_id 추출(v2 응답 포맷 가변 대응)
+    file_id = None
+    body = getattr(up, "data", up)  # SlackResponse → dict
+    if isinstance(body, dict):
+      file_id = (body.get("file") or {}).get("id")
+      if not file_id:
+        files = body.get("files") or []
+        if files and isinstance(files, list):
+          file_id = files[0].get("id")
+
+    # 2) 채널 타임라인에 파일 메시지가 '실제로' 올라왔는지 확인 → ts 획득
+    thread_ts = None
+    if file_id:
+      thread_ts = _wait_file_message_ts(cli, channel_id, file_id, timeout_sec=20, interval=0.7)
+
+    # 2-보강) 그래도 못 찾으면 살짝 대기 후 진행(가시적 순서 보장용)
+    if not thread_ts:
+      time.sleep(4)
+
+    # 3) 버튼 블록 구성
+    btn_payload = {
+      "button_text": "정산확정하기",
+      "supply_id": supply_id,
+      "channel": channel,
+      "start": start,
+      "end": end,
+      "final_amount": summary.get('final_amount',0)
+    }
+    blocks = _build_settlement_button_blocks(btn_payload)
 
-  def _ensure_channel_id(cli, ch: str) -> str:
-    # 이미 ID면 그대로, '#name'이나 'name'이면 lookup
-    if ch and ch.startswith(("C", "G")) and len(ch) >= 9:
-      return ch
-    name = ch.lstrip("#")
-    try:
-      resp = cli.conversations_list(limit=1000, types="public_channel,private_channel")
-      for c in resp.get("channels", []):
-        if c.get("name") == name:
-          return c.get("id")
-    except Exception:
-      pass
-    return ch  # 실패 시 원본 반환
+    # 4) 파일 메시지 이후에 버튼 메시지 전송(가능하면 스레드로)
+    payload = {
+      "channel": channel_id,
+      "text": "정산 파일 업로드 완료",
+      "blocks": blocks
+    }
+    if thread_ts:
+      payload["thread_ts"] = thread_ts
 
-  def _bg(app):
-    with app.app_context():
+    # rate limit 대비 2회 재시도
+    for _ in range(2):
       try:
-        cli = ensure_client()
-
-        channel_id = _ensure_channel_id(cli, channel or "")
-        initial_comment = (
-          f"*정산서 업로드 완료*\n기간: {start} ~ {end}\n"
-          f"배송완료 {summary.get('delivered_rows',0)}건 · 취소처리 {summary.get('canceled_rows',0)}건\n"
-          f"- *총 상품 결제 금액: {_fmt_currency(summary.get('gross_amount',0))}*\n"
-          f"- *배송비: {_fmt_currency(summary.get('shipping_amount',0))}*\n"
-          f"- *수수료: {_fmt_currency(summary.get('commission_amount',0))}*\n"
-          f"- *총 합계 금액: {_fmt_currency(summary.get('final_amount',0))}*"
-        )
-
-        # 1) 파일 업로드
-        up = cli.files_upload_v2(
-          channel=channel_id,
-          file=fpath,
-          filename=os.path.basename(fpath),
-          title=f"{start} ~ {end} 정산서",
-          initial_comment=initial_comment
-        )
-
-        # file_id 추출(v2 응답 포맷 가변 대응)
-        file_id = None
-        if isinstance(up, dict):
-          file_id = (up.get("file") or {}).get("id")
-          if not file_id:
-            files = up.get("files") or []
-            if files and isinstance(files, list):
-              file_id = files[0].get("id")
-
-        # 2) 채널 타임라인에 파일 메시지가 '실제로' 올라왔는지 확인 → ts 획득
-        thread_ts = None
-        if file_id:
-          thread_ts = _wait_file_message_ts(cli, channel_id, file_id, timeout_sec=20, interval=0.7)
-
-        # 2-보강) 그래도 못 찾으면 살짝 대기 후 진행(가시적 순서 보장용)
-        if not thread_ts:
-          time.sleep(4)
-
-        # 3) 버튼 블록 구성
-        btn_payload = {
-          "button_text": "정산확정하기",
-          "supply_id": supply_id,
-          "channel": channel,
-          "start": start,
-          "end": end,
-          "final_amount": summary.get('final_amount',0)
-        }
-        blocks = _build_settlement_button_blocks(btn_payload)
+        cli.chat_postMessage(**payload)
+        break
+      except SlackApiError as e:
+        if _sleep_if_rate_limited(e):
+          continue
+        _logger.error(f"[button.msg.fail] ch={channel_id} err={getattr(e, 'response', {}).get('data', {})}")
+        break
+
+  if not background:
+    # 이미 풀/배치 스레드에서 호출된 경우: 여기서 바로 업로드하고 오류는 호출자에게 전달
+    _send()
+    return fpath, summary
+
+  def _bg():
+    try:
+      _send()
+    except Exception:
+      _logger.exception("[upload_file_with_button] failed ch=%s", channel)
 
-        # 4) 파일 메시지 이후에 버튼 메시지 전송(가능하면 스레드로)
-        payload = {
-          "channel": channel_id,
-          "text": "정산 파일 업로드 완료",
-          "blocks": blocks
-        }
-        if thread_ts:
-          payload["thread_ts"] = thread_ts
-
-        # rate limit 대비 2회 재시도
-        for _ in range(2):
-          try:
-            cli.chat_postMessage(**payload)
-            break
-          except SlackApiError as e:
-            if _sleep_if_rate_limited(e):
-              continue
-            _logger.error(f"[button.msg.fail] ch={channel_id} err={getattr(e, 'response', {}).get('data', {})}")
-            break
-
-      except Exception:
-        traceback.print_exc()
-
-  app_obj = current_app._get_current_object()
-  t = threading.Thread(target=_bg, args=(app_obj,), daemon=True)
-  t.start()
+  submit(_bg)
   
   return fpath, summary
 
@@ -1,30 +1,47 @@
 # application/src/service/slack_verify.py
 import os, hmac, hashlib, time
+from typing import Optional
 from flask import Request
 
 SLACK_SIGNING_SECRET = os.getenv("SLACK_SIGNING_SECRET", "")
+_SECRET_BYTES = SLACK_SIGNING_SECRET.encode("utf-8")
+# 키 패딩까지 끝난 HMAC 원형 — 요청마다 copy() 만 해서 사용
+_HMAC_PROTOTYPE = hmac.new(_SECRET_BYTES, digestmod=hashlib.sha256)
 
-def verify_slack_request(req: Request, tolerance_sec: int = 60 * 5) -> bool:
-  # Slack-Signature style: v0=hexdigest
-  if not SLACK_SIGNING_SECRET:
-    return True  # 개발 단계에서만 패스 (운영은 반드시 검증)
-  ts = req.headers.get("X-Slack-Request-Timestamp")
-  sig = req.headers.get("X-Slack-Signature")
+def verify_slack_signature(raw: bytes, ts: Optional[str], sig: Optional[str], tolerance_sec: int = 60 * 5) -> bool:
+  """
+  Slack 서명 검증 (v0=hexdigest) — 원본 바디 bytes 기준.
+  - 바디를 문자열로 디코딩/재인코딩하지 않고 그대로 HMAC 계산
+  """
   if not ts or not sig:
     return False
   try:
-    ts = int(ts)
+    ts_int = int(ts)
   except Exception:
     return False
   # 리플레이 방지
-  if abs(time.time() - ts) > tolerance_sec:
+  if abs(time.time() - ts_int) > tolerance_sec:
+    return False
+  # 'v0=<hex>' → 32바이트 다이제스트 (형식이 틀리면 HMAC 계산 없이 실패)
+  if not sig.startswith("v0="):
+    return False
+  try:
+    sig_bytes = bytes.fromhex(sig[3:])
+  except ValueError:
     return False
-  body = req.get_data(as_text=True) or ""
-  basestring = f"v0:{ts}:{body}".encode("utf-8")
-  my_sig = "v0=" + hmac.new(
-    SLACK_SIGNING_SECRET.encode("utf-8"),
-    basestring,
-    hashlib.sha256
-  ).hexdigest()
-  # 안전 비교
-  return hmac.compare_digest(my_sig, sig)
+  mac = _HMAC_PROTOTYPE.copy()
+  mac.update(b"v0:" + ts.encode("ascii", "ignore") + b":")
+  mac.update(raw or b"")
+  # 안전 비교 (바이너리 다이제스트끼리)
+  return hmac.compare_digest(mac.digest(), sig_bytes)
+
+def verify_slack_request(req: Request, tolerance_sec: int = 60 * 5) -> bool:
+  if not SLACK_SIGNING_SECRET:
+    return True  # 개발 단계에서만 패스 (운영은 반드시 검증)
+  # get_data(cache=True): 이후 request.form 파싱도 같은 버퍼를 재사용
+  return verify_slack_signature(
+    req.get_data(cache=True),
+    req.headers.get("X-Slack-Request-Timestamp"),
+    req.headers.get("X-Slack-Signature"),
+    tolerance_sec,
+  )
@@ -1,8 +1,23 @@
 # application/src/service/toss_service.py
-import os, base64, json, uuid, datetime, requests
+import os, base64, json, uuid, datetime, time, threading
 from typing import Tuple, Dict, Any
 from jwcrypto import jwk, jwe
 from jwcrypto.common import json_encode
+from application.src.utils.http_utils import build_session
+
+# Toss API 공용 세션 (keep-alive 커넥션 재사용) + 기본 타임아웃(connect, read)
+_HTTP = build_session(pool_connections=2, pool_maxsize=16)
+_TIMEOUT = (3.05, 30)
+
+# 응답 필드 누락 시 돌려주는 공용 빈 dict (읽기 전용으로만 사용할 것)
+_EMPTY: Dict[str, Any] = {}
+
+def entity_body(resp: Dict[str, Any]) -> Dict[str, Any]:
+  """
+  v2 응답의 entityBody 추출 (없으면 공용 빈 dict)
+  - resp.get("entityBody", {}).get(...) 체인마다 빈 dict 를 새로 만들지 않기 위함
+  """
+  return (resp or _EMPTY).get("entityBody") or _EMPTY
 
 def _basic_auth() -> str:
   secret = os.getenv("TOSS_SECRET_KEY")  # live_sk_**** (시크릿 키)
@@ -50,7 +65,7 @@ def create_seller_encrypted(seller_body: Dict[str, Any]) -> Tuple[int, Dict[str,
     "Content-Type": "text/plain",
     "TossPayments-api-security-mode": "ENCRYPTION",
   }
-  r = requests.post(url, headers=headers, data=jwe_body)
+  r = _HTTP.post(url, headers=headers, data=jwe_body, timeout=_TIMEOUT)
   # 응답이 JSON이면 그대로, JWE면 복호화
   if r.headers.get("Content-Type","").startswith("application/json"):
     # 오류일 때 간혹 JSON으로 떨어질 수도 있으니 그대로 반환
@@ -112,7 +127,8 @@ def create_payouts_encrypted(payouts: Union[Dict[str, Any], List[Dict[str, Any]]
     "Content-Type": "text/plain",
     "TossPayments-api-security-mode": "ENCRYPTION",
   }
-  r = requests.post(url, headers=headers, data=jwe_body)
+  r = _HTTP.post(url, headers=headers, data=jwe_body, timeout=_TIMEOUT)
+  invalidate_payouts_cache()
 
   # 5) 응답 처리 (성공/실패 모두 JWE일 수 있음)
   ctype = r.headers.get("Content-Type", "")
@@ -138,7 +154,7 @@ def get_balance() -> Tuple[int, Dict[str, Any]]:
   headers = {
     "Authorization": _basic_auth(),
   }
-  r = requests.get(url, headers=headers)
+  r = _HTTP.get(url, headers=headers, timeout=_TIMEOUT)
 
   try:
     return r.status_code, r.json()
@@ -176,13 +192,55 @@ def list_payouts(
   if payoutDateLte:
     params["payoutDateLte"] = payoutDateLte
 
-  r = requests.get(url, headers=headers, params=params)
+  r = _HTTP.get(url, headers=headers, params=params, timeout=_TIMEOUT)
 
   try:
     return r.status_code, r.json()
   except Exception:
     return r.status_code, {"raw": r.text}
   
+# 지급 목록 메모리 캐시 (같은 기간 새로고침/재조회 시 Toss 왕복 생략)
+#   (limit, gte, lte) → {status, resp, expires_at}
+#   지급 생성/취소 시 invalidate_payouts_cache() 로 비운다
+PAYOUTS_CACHE_TTL_SEC = int(os.getenv("TOSS_PAYOUTS_CACHE_TTL_SEC", "30"))
+_PAYOUTS_CACHE_MAX = 64
+_payouts_cache: Dict[Tuple[int, Optional[str], Optional[str]], Dict[str, Any]] = {}
+_payouts_lock = threading.Lock()
+
+def list_payouts_cached(
+    limit: int = 10,
+    payoutDateGte: Optional[str] = None,
+    payoutDateLte: Optional[str] = None
+) -> Tuple[int, Dict[str, Any]]:
+  """
+  list_payouts 의 TTL 캐시 버전 (프로세스 로컬, 첫 페이지 전용)
+  - 성공(200) 응답만 캐시
+  - 출력: (status, 응답 dict)
+  """
+  key = (limit, payoutDateGte, payoutDateLte)
+  now = time.time()
+  with _payouts_lock:
+    hit = _payouts_cache.get(key)
+    if hit and hit["expires_at"] > now:
+      return hit["status"], hit["resp"]
+
+  status, resp = list_payouts(limit=limit, payoutDateGte=payoutDateGte, payoutDateLte=payoutDateLte)
+  if status == 200:
+    with _payouts_lock:
+      if len(_payouts_cache) >= _PAYOUTS_CACHE_MAX:
+        # 만료 항목 정리 후에도 가득 차 있으면 가장 오래된 항목 제거
+        for k in [k for k, v in _payouts_cache.items() if v["expires_at"] <= now]:
+          del _payouts_cache[k]
+        if len(_payouts_cache) >= _PAYOUTS_CACHE_MAX:
+          _payouts_cache.pop(next(iter(_payouts_cache)))
+      _payouts_cache[key] = {"status": status, "resp": resp, "expires_at": now + PAYOUTS_CACHE_TTL_SEC}
+  return status, resp
+
+def invalidate_payouts_cache() -> None:
+  """지급 목록 캐시 비우기 (지급 생성/취소 후 호출)"""
+  with _payouts_lock:
+    _payouts_cache.clear()
+
 def get_seller(seller_id: str) -> Tuple[int, Dict[str, Any]]:
   """
   셀러 단건 조회
@@ -195,7 +253,7 @@ def get_seller(seller_id: str) -> Tuple[int, Dict[str, Any]]:
   headers = {
     "Authorization": _basic_auth(),
   }
-  r = requests.get(url, headers=headers)
+  r = _HTTP.get(url, headers=headers, timeout=_TIMEOUT)
 
   try:
     return r.status_code, r.json()
@@ -220,7 +278,7 @@ def update_seller_encrypted(seller_id: str, seller_body: Dict[str, Any]) -> Tupl
     "Content-Type": "text/plain",
     "TossPayments-api-security-mode": "ENCRYPTION",
   }
-  r = requests.post(url, headers=headers, data=jwe_body)
+  r = _HTTP.post(url, headers=headers, data=jwe_body, timeout=_TIMEOUT)
 
   ctype = r.headers.get("Content-Type", "")
   if ctype.startswith("application/json"):
@@ -262,13 +320,116 @@ def list_sellers(
   if startingAfter:
     params["startingAfter"] = startingAfter
 
-  r = requests.get(url, headers=headers, params=params)
+  r = _HTTP.get(url, headers=headers, params=params, timeout=_TIMEOUT)
 
   try:
     return r.status_code, r.json()
   except Exception:
     return r.status_code, {"raw": r.text}
   
+# 셀러 목록 메모리 캐시 (셀러 정보는 자주 바뀌지 않음)
+#   limit → {status, resp, seller_map, ref_map, exact, search, expires_at}
+SELLERS_CACHE_TTL_SEC = int(os.getenv("TOSS_SELLERS_CACHE_TTL_SEC", "60"))
+_sellers_cache: Dict[int, Dict[str, Any]] = {}
+_sellers_lock = threading.Lock()
+
+def _build_sellers_entry(status: int, resp: Dict[str, Any]) -> Dict[str, Any]:
+  items = (entity_body(resp).get("items") or []) if status == 200 else []
+  seller_map = {sid: s for s in items if (sid := s.get("id"))}  # id 누락 항목은 건너뜀
+  ref_map: Dict[str, Dict[str, Any]] = {}  # refSellerId(=supplierCode) 정확 일치, 중복 시 첫 항목
+  for it in items:
+    ref = it.get("refSellerId")
+    if ref and ref not in ref_map:
+      ref_map[ref] = it
+
+  # 검색용 인덱스 (소문자 정규화)
+  #  - exact : id / refSellerId 정확 일치 → O(1)
+  #  - search: (refSellerId, 상호, id) 부분 일치 폴백용 (원본 순서 유지)
+  exact: Dict[str, Dict[str, Any]] = {}
+  search = []
+  for it in items:
+    refid = (it.get("refSellerId") or "").lower()
+    cname = (it.get("company", {}).get("name") or "").lower()
+    sid   = (it.get("id") or "").lower()
+    for key in (sid, refid):
+      if key and key not in exact:
+        exact[key] = it
+    search.append((refid, cname, sid, it))
+
+  return {
+    "status": status,
+    "resp": resp,
+    "seller_map": seller_map,
+    "ref_map": ref_map,
+    "exact": exact,
+    "search": search,
+    "expires_at": time.time() + SELLERS_CACHE_TTL_SEC,
+  }
+
+def _sellers_entry(limit: int, force: bool = False) -> Dict[str, Any]:
+  hit = _sellers_cache.get(limit)
+  if not force and hit and hit["expires_at"] > time.time():
+    return hit
+
+  with _sellers_lock:
+    hit = _sellers_cache.get(limit)
+    if not force and hit and hit["expires_at"] > time.time():
+      return hit
+
+    status, resp = list_sellers(limit=limit)
+    entry = _build_sellers_entry(status, resp)
+    if status == 200:  # 성공 응답만 캐시
+      _sellers_cache[limit] = entry
+    return entry
+
+def list_sellers_cached(limit: int = 1000) -> Tuple[int, Dict[str, Any], Dict[str, Dict[str, Any]]]:
+  """
+  list_sellers 의 TTL 캐시 버전 (프로세스 로컬)
+  - 성공(200) 응답만 캐시
+  - 출력: (status, 응답 dict, seller_map{id: seller})
+  """
+  e = _sellers_entry(limit)
+  return e["status"], e["resp"], e["seller_map"]
+
+def get_seller_cached(seller_id: str, limit: int = 1000) -> Optional[Dict[str, Any]]:
+  """
+  캐시된 셀러 목록에서 id 로 단건 조회 (네트워크 호출 없음, 캐시 만료 시에만 목록 재조회)
+  - 없으면 None → 호출부에서 get_seller 로 실시간 조회
+  """
+  return _sellers_entry(limit)["seller_map"].get(seller_id)
+
+def get_seller_by_ref(ref_seller_id: str, limit: int = 1000) -> Optional[Dict[str, Any]]:
+  """
+  refSellerId(= 공급사 supplierCode) 로 셀러 조회 (캐시된 목록의 인덱스 사용)
+  - 캐시에 없으면 방금 등록된 셀러일 수 있으므로 목록을 1회 새로 받아 재확인
+  - 그래도 없으면 None
+  """
+  if not ref_seller_id:
+    return None
+  found = _sellers_entry(limit)["ref_map"].get(ref_seller_id)
+  if found is None:
+    found = _sellers_entry(limit, force=True)["ref_map"].get(ref_seller_id)
+  return found
+
+def find_seller_cached(q: str, limit: int = 1000) -> Tuple[int, Dict[str, Any], Optional[Dict[str, Any]]]:
+  """
+  캐시된 셀러 목록에서 검색
+  - 우선순위: id/refSellerId 정확 일치 → refSellerId/상호/id 부분 일치(목록 순서상 첫 항목)
+  - 출력: (status, 응답 dict, 찾은 seller 또는 None)
+  """
+  e = _sellers_entry(limit)
+  qlow = (q or "").lower()
+  if not qlow:
+    return e["status"], e["resp"], None
+
+  found = e["exact"].get(qlow)
+  if found is None:
+    found = next(
+      (it for refid, cname, sid, it in e["search"] if qlow in refid or qlow in cname or qlow in sid),
+      None
+    )
+  return e["status"], e["resp"], found
+
 def list_settlements(start_date: str, end_date: str, limit: int = 1000, startingAfter: Optional[str] = None) -> Tuple[int, Dict[str, Any]]:
   """
   정산 내역 조회
@@ -293,7 +454,7 @@ def list_settlements(start_date: str, end_date: str, limit: int = 1000, starting
   if startingAfter:
     params["startingAfter"] = startingAfter
 
-  r = requests.get(url, headers=headers, params=params)
+  r = _HTTP.get(url, headers=headers, params=params, timeout=_TIMEOUT)
 
   try:
     return r.status_code, r.json()
@@ -311,7 +472,8 @@ def cancel_payout(payout_id: str):
     "Authorization": _basic_auth(),
     "Content-Type": "application/json",
   }
-  r = requests.post(url, headers=headers)  # 바디 없음
+  r = _HTTP.post(url, headers=headers, timeout=_TIMEOUT)  # 바디 없음
+  invalidate_payouts_cache()
   try:
     return r.status_code, r.json()
   except Exception:
@@ -0,0 +1,48 @@
+# application/src/utils/date_utils.py
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+import re
+import datetime as dt
+from typing import Optional, Tuple
+
+# '2025-1-5' 같은 비패딩 날짜 (fromisoformat 실패 시 폴백)
+_YMD_RE = re.compile(r"(\d{4})-(\d{1,2})-(\d{1,2})")
+# 'YYYY-MM-DD~YYYY-MM-DD' (앞뒤/물결 주변 공백 허용)
+_PERIOD_RE = re.compile(r"^\s*(\d{4}-\d{2}-\d{2})\s*~\s*(\d{4}-\d{2}-\d{2})\s*$")
+
+def parse_ymd(s: str) -> dt.date:
+  """
+  'YYYY-MM-DD' 문자열 → date.
+  - 앞뒤 공백 무시, 'YYYY-MM-DDTHH:MM:SS' 처럼 뒤가 붙어 있으면 앞 10자리만 사용
+  - C 구현인 date.fromisoformat 우선, 실패 시 '2025-1-5' 같은 비패딩 형식도 허용
+  - 잘못된 값이면 ValueError
+  """
+  s = s.strip()
+  try:
+    return dt.date.fromisoformat(s[:10])
+  except ValueError:
+    m = _YMD_RE.fullmatch(s)
+    if not m:
+      raise
+    return dt.date(int(m[1]), int(m[2]), int(m[3]))
+
+def parse_period(text: str) -> Optional[Tuple[dt.date, dt.date]]:
+  """
+  슬랙 커맨드 기간 텍스트 'YYYY-MM-DD~YYYY-MM-DD' → (start, end).
+  - 정규식 1회 매칭 + date.fromisoformat 이 기본 경로
+  - '2025-1-5' 같은 비패딩 형식은 parse_ymd 로 폴백
+  - '~' 가 없거나 형식이 잘못되면 None
+  """
+  if not text or "~" not in text:
+    return None
+  m = _PERIOD_RE.match(text)
+  if m:
+    try:
+      return dt.date.fromisoformat(m[1]), dt.date.fromisoformat(m[2])
+    except ValueError:
+      return None
+  a, _, b = text.partition("~")
+  try:
+    return parse_ymd(a), parse_ymd(b)
+  except (TypeError, ValueError):
+    return None
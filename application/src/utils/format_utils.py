@@ -0,0 +1,27 @@
+# application/src/utils/format_utils.py
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+import math, numbers
+from decimal import Decimal
+
+def fmt_currency(value) -> str:
+  """
+  금액을 '1,234원' 형태로 포맷. None/빈 값은 '0원', 숫자로 해석할 수 없으면 원문 + '원'.
+  """
+  # 숫자(대부분의 경우)는 문자열 변환 없이 바로 포맷 (bool 은 제외)
+  if type(value) is int:
+    return f"{value:,}원"
+  if isinstance(value, float) and math.isfinite(value):
+    return f"{int(value):,}원"
+  # Decimal / numpy 정수 등도 문자열 왕복 없이 정수 변환
+  if isinstance(value, Decimal) and value.is_finite():
+    return f"{int(value):,}원"
+  if isinstance(value, numbers.Integral) and not isinstance(value, bool):
+    return f"{int(value):,}원"
+  if value is None or value == "" or value == "None":
+    return "0원"
+  try:
+    s = value if isinstance(value, str) else str(value)
+    return f"{int(float(s.replace(',', ''))):,}원"
+  except Exception:
+    return f"{value}원"
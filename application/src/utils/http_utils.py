@@ -0,0 +1,37 @@
+# application/src/utils/http_utils.py
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+from typing import Iterable, Optional
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+def build_session(
+  pool_connections: int = 4,
+  pool_maxsize: int = 16,
+  retries: int = 2,
+  backoff_factor: float = 0.25,
+  status_forcelist: Optional[Iterable[int]] = (502, 503, 504),
+  allowed_methods: Optional[Iterable[str]] = None,
+) -> requests.Session:
+  """
+  커넥션 풀(keep-alive)을 재사용하는 requests.Session 생성.
+  - 모듈 레벨에서 1회 만들어 두고 재사용한다 (매 호출 TCP/TLS 핸드셰이크 방지)
+  - Retry 기본값은 멱등 메서드만 상태코드 재시도 (POST 는 연결 실패 시에만 재시도)
+  - allowed_methods 로 재시도 대상 메서드 지정 가능 (POST 는 중복 전송이 안전할 때만)
+  """
+  retry_kwargs = {}
+  if allowed_methods is not None:
+    retry_kwargs["allowed_methods"] = frozenset(m.upper() for m in allowed_methods)
+  retry = Retry(
+    total=retries,
+    backoff_factor=backoff_factor,
+    status_forcelist=list(status_forcelist or ()),
+    raise_on_status=False,
+    **retry_kwargs,
+  )
+  adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=retry)
+  session = requests.Session()
+  session.mount("https://", adapter)
+  session.mount("http://", adapter)
+  return session